@@ -1,12 +1,13 @@
 """JWT authentication scheme for use with DRF."""
 from django.conf import settings
 from django.contrib.auth import get_user_model
-import requests
 from rest_framework import exceptions
 from rest_framework.authentication import get_authorization_header, BaseAuthentication
 from rest_framework.status import HTTP_200_OK
 from rest_framework_jwt.authentication import JSONWebTokenAuthentication
 
+from ecommerce.outbound.client import client
+
 
 User = get_user_model()
 
@@ -86,7 +87,7 @@ class BearerAuthentication(BaseAuthentication):
 
     def authenticate_credentials(self, provider_url, key):
         try:
-            response = requests.get('{}/access_token/{}/'.format(provider_url, key))
+            response = client.get('{}/access_token/{}/'.format(provider_url, key), endpoint='oauth2_access_token')
             if response.status_code != HTTP_200_OK:
                 raise exceptions.AuthenticationFailed('Invalid token.')
 
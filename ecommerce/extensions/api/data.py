@@ -1,31 +1,45 @@
 """Functions used for data retrieval and manipulation by the API."""
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Prefetch
+from django.utils import timezone
 from oscar.core.loading import get_model, get_class
 
 from ecommerce.extensions.api import errors
+from ecommerce.extensions.api.models import IdempotencyKey
+from ecommerce.extensions.caching import ReferenceCache
+from ecommerce.extensions.catalogue.snapshot import catalog
 
 
 Basket = get_model('basket', 'Basket')
-Product = get_model('catalogue', 'Product')
+Order = get_model('order', 'Order')
+Source = get_model('payment', 'Source')
 ShippingEventType = get_model('order', 'ShippingEventType')
+User = get_user_model()
 
 Selector = get_class('partner.strategy', 'Selector')
 
+shipping_event_types = ReferenceCache(ShippingEventType, 'name')
+
 
 def get_basket(user):
     """Retrieve the basket belonging to the indicated user.
 
-    If no such basket exists, create a new one. If multiple such baskets exist,
-    merge them into one.
+    The user's most recent editable basket is fetched, along with a count of its lines, using a
+    single query. If no such basket exists, a new one is created. Any lines left in the basket
+    (e.g., by an earlier, failed order attempt) are removed, so that the basket starts out empty.
+
+    Other editable baskets belonging to the user are left alone; they are not merged on the request
+    path, so that the cost of acquiring a basket doesn't grow with the number of abandoned baskets.
     """
-    editable_baskets = Basket.objects.filter(owner=user, status__in=Basket.editable_statuses)
-    if len(editable_baskets) == 0:
+    basket = Basket.objects.filter(
+        owner=user, status__in=Basket.editable_statuses
+    ).annotate(line_count=Count('lines')).order_by('-id').first()
+
+    if basket is None:
         basket = Basket.objects.create(owner=user)
-    else:
-        stale_baskets = list(editable_baskets)
-        basket = stale_baskets.pop(0)
-        for stale_basket in stale_baskets:
-            # Don't add line quantities when merging baskets
-            basket.merge(stale_basket, add_quantities=False)
+    elif basket.line_count:
+        basket.flush()
 
     # Assign the appropriate strategy class to the basket
     basket.strategy = Selector().strategy(user=user)
@@ -33,21 +47,117 @@ def get_basket(user):
     return basket
 
 
-def get_product(sku):
-    """Retrieve the product corresponding to the provided SKU."""
-    try:
-        return Product.objects.get(stockrecords__partner_sku=sku)
-    except Product.DoesNotExist:
-        raise errors.ProductNotFoundError(
-            errors.PRODUCT_NOT_FOUND_DEVELOPER_MESSAGE.format(sku=sku)
-        )
+def get_products(skus):
+    """Retrieve the products corresponding to the provided SKUs from the catalog snapshot.
+
+    Returns:
+        dict: Products keyed by SKU. SKUs which do not correspond to a product are omitted.
+    """
+    entries = ((sku, catalog.get(sku)) for sku in skus)
+    return {sku: entry.product for sku, entry in entries if entry is not None}
+
+
+def get_or_create_users(usernames):
+    """Retrieve the users with the provided usernames, creating any which don't exist yet.
+
+    Missing users are created with a single bulk insert, mirroring the way JWT
+    authentication creates users it has not seen before. Should a concurrent request
+    create some of the same users first, the insert fails; the users it has created
+    are read instead, and any still missing are created one at a time.
+
+    Returns:
+        dict: Users keyed by username.
+    """
+    usernames = set(usernames)
+    users = {user.username: user for user in User.objects.filter(username__in=usernames)}
+
+    missing_usernames = usernames - set(users)
+    if missing_usernames:
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create([User(username=username) for username in missing_usernames])
+        except IntegrityError:
+            # A concurrent request has created some of the same users; none of this insert's rows were kept.
+            pass
+
+        # A locking read is used to see rows committed by concurrent requests,
+        # regardless of the snapshot held by this one.
+        created = User.objects.select_for_update().filter(username__in=missing_usernames)
+        users.update({user.username: user for user in created})
+
+        for username in missing_usernames - set(users):
+            users[username], __ = User.objects.get_or_create(username=username)
+
+    return users
 
 
 def get_shipping_event_type(name):
     """Retrieve the shipping event type corresponding to the provided name."""
     try:
-        return ShippingEventType.objects.get(name=name)
+        return shipping_event_types.get(name)
     except ShippingEventType.DoesNotExist:
         raise errors.ShippingEventNotFoundError(
             errors.SHIPPING_EVENT_NOT_FOUND_MESSAGE.format(name=name)
         )
+
+
+def claim_idempotency_key(user, key, request_hash):
+    """Claim an idempotency key for the current request, unless an earlier request has claimed it.
+
+    Keys are claimed by inserting them. While another transaction holding the same key is in
+    flight, the insert blocks on the unique index; once that transaction commits, the insert
+    fails and the key, along with the response recorded for it, is read instead. Concurrent
+    duplicate requests therefore wait for the first to finish rather than executing again. If
+    the first request's transaction is rolled back, the insert succeeds and the key is claimed.
+    A key claimed more than IDEMPOTENCY_KEY_LIFETIME seconds ago has expired, and is claimed again.
+
+    Returns:
+        tuple: The IdempotencyKey, and a boolean indicating whether it was claimed by this request.
+    """
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(user=user, key=key, request_hash=request_hash), True
+    except IntegrityError:
+        # A locking read is used to see the row committed by the other transaction,
+        # regardless of the snapshot held by this one.
+        idempotency_key = IdempotencyKey.objects.select_for_update().get(user=user, key=key)
+
+    if not idempotency_key.is_expired:
+        return idempotency_key, False
+
+    idempotency_key.request_hash = request_hash
+    idempotency_key.response_status = None
+    idempotency_key.response_content = ''
+    idempotency_key.date_created = timezone.now()
+    idempotency_key.save()
+    return idempotency_key, True
+
+
+def get_order_validators(user, number):
+    """Retrieve the values used to determine whether a paid order has changed.
+
+    Only the order's status and modification date are read, using the index on order number,
+    making this far cheaper than loading and serializing the order itself.
+
+    Returns:
+        tuple: The status and modification date of the order, or None if the user has no paid
+            order with the given number.
+    """
+    return Order.objects.filter(
+        number=number, user=user, status__in=Order.PAID_STATUSES
+    ).values_list('status', 'date_modified').first()
+
+
+def prefetch_order_relations(queryset):
+    """Fetch everything needed to serialize the orders in the provided queryset up front.
+
+    Orders are serialized along with their lines (including line attributes, used to build
+    line descriptions), payment sources (including source types and transactions), and
+    billing address (including country). Loading these relations with a fixed number of
+    queries prevents the number of queries issued from growing with the number of orders.
+    """
+    return queryset.select_related('billing_address__country').prefetch_related(
+        'lines__attributes',
+        Prefetch('sources', queryset=Source.objects.select_related('source_type')),
+        'sources__transactions',
+    )
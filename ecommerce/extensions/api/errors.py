@@ -8,6 +8,11 @@ PRODUCT_NOT_FOUND_DEVELOPER_MESSAGE = u"Catalog does not contain the indicated p
 PRODUCT_NOT_FOUND_USER_MESSAGE = _("We couldn't find the product you're looking for.")
 SHIPPING_EVENT_NOT_FOUND_MESSAGE = u"No shipping event [{name}] was found"
 PRODUCT_UNAVAILABLE_USER_MESSAGE = _("The product you're trying to order is unavailable.")
+BULK_ORDER_INVALID_USER_MESSAGE = _("We couldn't process the orders you submitted.")
+PRODUCT_NOT_FREE_DEVELOPER_MESSAGE = u"Bulk orders may only contain free products [SKU: {sku}]"
+IDEMPOTENCY_KEY_INVALID_DEVELOPER_MESSAGE = u"Idempotency keys may not exceed {max_length} characters"
+IDEMPOTENCY_KEY_INVALID_USER_MESSAGE = _("We couldn't process your order.")
+IDEMPOTENCY_KEY_REUSED_DEVELOPER_MESSAGE = u"Idempotency key [{key}] was first used with a different request"
 
 
 class ApiError(Exception):
@@ -32,3 +37,13 @@ class ProductNotFoundError(OrderError):
 class ShippingEventNotFoundError(OrderError):
     """Raised when a shipping event cannot be found by name."""
     pass
+
+
+class ProductUnavailableError(OrderError):
+    """Raised when the requested product cannot be purchased."""
+    pass
+
+
+class ProductNotFreeError(OrderError):
+    """Raised when a product which must be free has a price."""
+    pass
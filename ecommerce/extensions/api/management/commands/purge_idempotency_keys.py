@@ -0,0 +1,48 @@
+"""Delete expired idempotency keys."""
+import logging
+import time
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ecommerce.extensions.api.models import IdempotencyKey
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Delete idempotency keys claimed more than IDEMPOTENCY_KEY_LIFETIME seconds ago.
+
+    Expired keys are no longer honored by the orders endpoint, and only take up space. Keys are
+    deleted in chunks, each in its own short transaction, with a pause after each chunk; the command
+    is therefore safe to run while the site is serving traffic.
+    """
+    help = 'Delete expired idempotency keys.'
+
+    option_list = BaseCommand.option_list + (
+        make_option('--chunk-size', type='int', default=1000,
+                    help='Maximum number of keys to delete in a single transaction.'),
+        make_option('--sleep', type='float', default=1.0,
+                    help='Number of seconds to pause between chunks.'),
+    )
+
+    def handle(self, *args, **options):
+        cutoff = IdempotencyKey.expiry_cutoff()
+        expired = IdempotencyKey.objects.filter(date_created__lt=cutoff)
+
+        purged = 0
+        while True:
+            key_ids = list(expired.order_by('id').values_list('id', flat=True)[:options['chunk_size']])
+            if not key_ids:
+                break
+
+            with transaction.atomic():
+                IdempotencyKey.objects.filter(id__in=key_ids, date_created__lt=cutoff).delete()
+
+            purged += len(key_ids)
+            logger.info("Purged [%d] idempotency keys", purged)
+            time.sleep(options['sleep'])
+
+        logger.info("Purged [%d] idempotency keys created before [%s]", purged, cutoff)
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+from django.conf import settings
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', serialize=False, auto_created=True, primary_key=True)),
+                ('key', models.CharField(max_length=255, verbose_name='Key')),
+                ('response_status', models.PositiveSmallIntegerField(null=True, verbose_name='Response Status', blank=True)),
+                ('response_content', models.TextField(verbose_name='Response Content', blank=True)),
+                ('date_created', models.DateTimeField(auto_now_add=True, verbose_name='Date Created', db_index=True)),
+                ('user', models.ForeignKey(related_name='idempotency_keys', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+            },
+            bases=(models.Model,),
+        ),
+        migrations.AlterUniqueTogether(
+            name='idempotencykey',
+            unique_together=set([('user', 'key')]),
+        ),
+    ]
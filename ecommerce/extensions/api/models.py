@@ -0,0 +1,44 @@
+import datetime
+import json
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class IdempotencyKey(models.Model):
+    """A client-provided key identifying a request, along with the response first returned for it.
+
+    Requests repeating a key, with the same payload, within IDEMPOTENCY_KEY_LIFETIME seconds are
+    answered with the stored response instead of being executed again.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='idempotency_keys')
+    key = models.CharField(_("Key"), max_length=255)
+    request_hash = models.CharField(_("Request Hash"), max_length=64, blank=True)
+    response_status = models.PositiveSmallIntegerField(_("Response Status"), null=True, blank=True)
+    response_content = models.TextField(_("Response Content"), blank=True)
+    date_created = models.DateTimeField(_("Date Created"), auto_now_add=True, db_index=True)
+
+    @classmethod
+    def expiry_cutoff(cls):
+        """Return the time before which keys were created which have expired."""
+        return timezone.now() - datetime.timedelta(seconds=settings.IDEMPOTENCY_KEY_LIFETIME)
+
+    @property
+    def is_expired(self):
+        return self.date_created < self.expiry_cutoff()
+
+    def record_response(self, response):
+        """Store the status and data of the provided response."""
+        self.response_status = response.status_code
+        self.response_content = json.dumps(response.data, cls=JSONEncoder)
+        self.save()
+
+    @property
+    def response_data(self):
+        return json.loads(self.response_content)
+
+    class Meta(object):
+        unique_together = ('user', 'key')
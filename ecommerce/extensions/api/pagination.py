@@ -0,0 +1,110 @@
+"""Pagination classes for API endpoints."""
+import base64
+import binascii
+from collections import OrderedDict
+
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import ugettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class OrderCursorPagination(BasePagination):
+    """Keyset pagination of orders, newest first.
+
+    Rather than skipping a number of rows with OFFSET, each page is located by the position,
+    encoded in an opaque cursor, of the last order on the previous page. Orders are sorted by
+    their (indexed) placement date, with their ID breaking ties between orders placed at the
+    same moment. No count of the total number of orders is computed. The cost of fetching a
+    page therefore doesn't depend on how deep into the list of orders the page lies.
+
+    Only forward traversal is supported; each response includes a link to the next page, if any.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = _('Invalid cursor')
+    ordering = ('-date_placed', '-id')
+    separator = u'|'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        position = self.decode_cursor(request.query_params.get(self.cursor_query_param))
+
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            date_placed, pk = position
+            # Equivalent to (date_placed, id) < (cursor date, cursor ID), expressed in a way
+            # which allows the database to perform a range scan of the date_placed index.
+            queryset = queryset.filter(date_placed__lte=date_placed).exclude(date_placed=date_placed, id__gte=pk)
+
+        # Fetch one extra order to determine whether another page follows this one.
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+
+        last = self.page[-1]
+        return replace_query_param(self.base_url, self.cursor_query_param, self.encode_cursor(last))
+
+    def encode_cursor(self, order):
+        """Encode the position of the provided order as an opaque cursor."""
+        position = self.separator.join([order.date_placed.isoformat(), unicode(order.id)])
+        return base64.urlsafe_b64encode(position.encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, encoded):
+        """Decode a cursor into a (date placed, ID) position.
+
+        Returns:
+            tuple: The decoded position, or None if no position was provided (i.e., the first page was requested).
+
+        Raises:
+            NotFound: If the cursor is invalid.
+        """
+        if not encoded:
+            return None
+
+        try:
+            position = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii')
+            date_placed, pk = position.split(self.separator)
+            date_placed = parse_datetime(date_placed)
+            pk = int(pk)
+        except (TypeError, ValueError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+        if date_placed is None:
+            raise NotFound(self.invalid_cursor_message)
+
+        return date_placed, pk
+
+
+class OrderPagination(BasePagination):
+    """Paginates orders by page number, or by cursor if the client asks for it.
+
+    Page number pagination remains the default for compatibility with existing clients. Clients
+    opt into cursor pagination by including the cursor query parameter in their requests; an
+    empty cursor requests the first page.
+    """
+    def paginate_queryset(self, queryset, request, view=None):
+        if OrderCursorPagination.cursor_query_param in request.query_params:
+            self.paginator = OrderCursorPagination()
+        else:
+            self.paginator = PageNumberPagination()
+
+        return self.paginator.paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
@@ -0,0 +1,24 @@
+"""Renderers for API endpoints."""
+from rest_framework.renderers import JSONRenderer
+
+
+class NDJSONRenderer(JSONRenderer):
+    """Renders data as newline-delimited JSON, with one compact JSON document per line.
+
+    Lists are rendered with one line per item; any other data (e.g., an error) is rendered
+    as a single line. Views able to produce large result sets should stream their output
+    using render_line rather than rendering a complete list.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return bytes()
+
+        items = data if isinstance(data, list) else [data]
+        return b''.join(self.render_line(item) for item in items)
+
+    def render_line(self, item):
+        """Render a single item as a newline-terminated line."""
+        return super(NDJSONRenderer, self).render(item) + b'\n'
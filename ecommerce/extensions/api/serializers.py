@@ -1,9 +1,15 @@
 """Serializers for order and line item data."""
 # pylint: disable=abstract-method
-from decimal import Decimal as D
+from collections import OrderedDict
+from decimal import Context, Decimal as D
+from operator import attrgetter
 
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
+from ecommerce.extensions.fulfillment.status import LINE
 from ecommerce.extensions.payment.serializers import SourceSerializer
 
 
@@ -64,3 +70,179 @@ class OrderSerializer(serializers.Serializer):
     lines = LinesSerializer(many=True)
     billing_address = BillingAddressSerializer(allow_null=True)
     payment_processor = serializers.CharField(max_length=32)
+
+
+# The fast path below mirrors the output of the DRF fields used by the serializers above: CharField
+# (text), IntegerField (int), BooleanField (bool), DateTimeField (ISO 8601, with UTC rendered as 'Z'),
+# and DecimalField with max_digits=12 and decimal_places=2 (a quantized Decimal, or its fixed-point
+# string if coerced to a string).
+PRICE_PLACES = D('.1') ** 2
+PRICE_CONTEXT = Context(prec=12)
+
+
+def _decimal(value):
+    if not isinstance(value, D):
+        value = D(unicode(value).strip())
+    return value.quantize(PRICE_PLACES, context=PRICE_CONTEXT)
+
+
+def _coerced_decimal(value):
+    """Represent a decimal the way a DecimalField using the default COERCE_DECIMAL_TO_STRING setting does."""
+    if api_settings.COERCE_DECIMAL_TO_STRING:
+        return '{0:f}'.format(_decimal(value))
+    return _decimal(value)
+
+
+def _datetime(value):
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def _many(represent):
+    """Build a function representing each object in a related manager (or iterable)."""
+    def represent_many(objects):
+        if hasattr(objects, 'all'):
+            objects = objects.all()
+        return [represent(obj) for obj in objects]
+    return represent_many
+
+
+def _representation(fields):
+    """Build a function representing an object as an OrderedDict, given (field name, formatter) pairs.
+
+    Attribute accessors are created once, here, rather than each time an object is represented.
+    """
+    accessors = [(name, attrgetter(name), formatter) for name, formatter in fields]
+
+    def represent(obj):
+        ret = OrderedDict()
+        for name, accessor, formatter in accessors:
+            try:
+                value = accessor(obj)
+            except ObjectDoesNotExist:
+                value = None
+            ret[name] = None if value is None else formatter(value)
+        return ret
+    return represent
+
+
+_represent_country = _representation([
+    ('printable_name', unicode),
+    ('name', unicode),
+    ('is_shipping_country', bool),
+])
+
+_represent_billing_address = _representation([
+    ('title', unicode),
+    ('first_name', unicode),
+    ('last_name', unicode),
+    ('line1', unicode),
+    ('line2', unicode),
+    ('line3', unicode),
+    ('line4', unicode),
+    ('state', unicode),
+    ('postcode', unicode),
+    ('country', _represent_country),
+])
+
+_represent_line = _representation([
+    ('title', unicode),
+    ('quantity', int),
+    ('description', unicode),
+    ('status', unicode),
+    ('line_price_excl_tax', _decimal),
+    ('unit_price_excl_tax', _decimal),
+])
+
+_represent_transaction = _representation([
+    ('txn_type', unicode),
+    ('amount', _coerced_decimal),
+    ('reference', unicode),
+    ('status', unicode),
+    ('date_created', _datetime),
+])
+
+_represent_source = _representation([
+    ('source_type', _representation([('name', unicode), ('code', unicode)])),
+    ('transactions', _many(_represent_transaction)),
+    ('currency', unicode),
+    ('amount_allocated', _coerced_decimal),
+    ('amount_debited', _coerced_decimal),
+    ('amount_refunded', _coerced_decimal),
+    ('reference', unicode),
+    ('label', unicode),
+])
+
+_represent_order = _representation([
+    ('number', unicode),
+    ('date_placed', _datetime),
+    ('status', unicode),
+    ('sources', _many(_represent_source)),
+    ('currency', unicode),
+    ('total_excl_tax', _decimal),
+    ('lines', _many(_represent_line)),
+    ('billing_address', _represent_billing_address),
+    ('payment_processor', unicode),
+])
+
+
+class FastOrderSerializer(object):
+    """Read-only serializer producing exactly the same representation of orders as OrderSerializer.
+
+    OrderSerializer instantiates and runs DRF fields for every order, line, and payment source
+    it serializes. This serializer instead formats each attribute directly, which is several times
+    faster. It performs no validation, and is meant for use with orders whose related data has been
+    prefetched (see `data.prefetch_order_relations`).
+    """
+    def __init__(self, instance, many=False):
+        self.instance = instance
+        self.many = many
+
+    @property
+    def data(self):
+        if self.many:
+            return [_represent_order(order) for order in self.instance]
+        return _represent_order(self.instance)
+
+
+class BulkOrderItemSerializer(serializers.Serializer):
+    """Serializer for parsing a single (username, SKU) pair included in a bulk order."""
+    username = serializers.CharField(max_length=30)
+    sku = serializers.CharField(max_length=128)
+
+
+class BulkOrderSerializer(serializers.Serializer):
+    """Serializer for parsing bulk order data."""
+    orders = BulkOrderItemSerializer(many=True)
+
+    def validate_orders(self, value):
+        """Ensure that the number of requested orders is within the configured bounds."""
+        if not value:
+            raise serializers.ValidationError(u"At least one order must be provided.")
+
+        max_items = settings.BULK_ORDER_MAX_ITEMS
+        if len(value) > max_items:
+            raise serializers.ValidationError(
+                u"No more than {max_items} orders may be created at once.".format(max_items=max_items)
+            )
+
+        return value
+
+
+class BulkFulfillmentSerializer(serializers.Serializer):
+    """Serializer for parsing the filters selecting orders whose fulfillment should be retried in bulk."""
+    numbers = serializers.ListField(child=serializers.CharField(max_length=128), required=False)
+    start_date = serializers.DateTimeField(required=False)
+    end_date = serializers.DateTimeField(required=False)
+    sku = serializers.CharField(max_length=128, required=False)
+    line_status = serializers.ChoiceField(choices=LINE.FULFILLMENT_ERRORS, required=False)
+
+    def validate(self, attrs):
+        """Ensure that the date range, if any, is not empty."""
+        start_date, end_date = attrs.get('start_date'), attrs.get('end_date')
+        if start_date and end_date and start_date >= end_date:
+            raise serializers.ValidationError(u"The start date must precede the end date.")
+
+        return attrs
@@ -0,0 +1,33 @@
+"""Tests of the API app's management commands."""
+import datetime
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from oscar.test import factories
+
+from ecommerce.extensions.api.models import IdempotencyKey
+
+
+@override_settings(IDEMPOTENCY_KEY_LIFETIME=60 * 60)
+class PurgeIdempotencyKeysTests(TestCase):
+    def setUp(self):
+        super(PurgeIdempotencyKeysTests, self).setUp()
+        self.user = factories.UserFactory()
+
+    def _create_key(self, key, age_in_minutes):
+        idempotency_key = IdempotencyKey.objects.create(user=self.user, key=key)
+        IdempotencyKey.objects.filter(id=idempotency_key.id).update(
+            date_created=timezone.now() - datetime.timedelta(minutes=age_in_minutes)
+        )
+        return idempotency_key
+
+    def test_purge(self):
+        """ Only keys which have expired should be deleted. """
+        for index in xrange(3):
+            self._create_key('expired-{}'.format(index), age_in_minutes=90)
+        current = self._create_key('current', age_in_minutes=30)
+
+        call_command('purge_idempotency_keys', chunk_size=2, sleep=0)
+
+        self.assertEqual(list(IdempotencyKey.objects.all()), [current])
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Unit tests of the order serializers."""
+import logging
+import os
+import timeit
+from decimal import Decimal as D
+from unittest import skipUnless
+
+from django.test import TestCase
+from oscar.core.loading import get_model
+from oscar.test import factories
+from rest_framework.renderers import JSONRenderer
+
+from ecommerce.extensions.api import data
+from ecommerce.extensions.api.serializers import OrderSerializer, FastOrderSerializer
+from ecommerce.extensions.fulfillment.status import ORDER
+
+
+BillingAddress = get_model('order', 'BillingAddress')
+Country = get_model('address', 'Country')
+Order = get_model('order', 'Order')
+SourceType = get_model('payment', 'SourceType')
+
+logger = logging.getLogger(__name__)
+
+
+class OrderFixtureMixin(object):
+    """ Creates orders exercising every field represented by the order serializers. """
+
+    def create_orders(self, num_orders, num_lines=2):
+        country = Country.objects.create(
+            iso_3166_1_a2='US', name=u'United States of America', printable_name=u'United States',
+            is_shipping_country=True
+        )
+        source_type = SourceType.objects.create(name=u'cybersource', code=u'cybersource')
+
+        for index in xrange(num_orders):
+            basket = factories.create_basket(empty=True)
+            for _ in xrange(num_lines):
+                product = factories.create_product(title=u'Ŝéàt ïñ ÐéḿöẊ')
+                factories.create_stockrecord(product, price_excl_tax=D('33.337'), num_in_stock=2)
+                basket.add_product(product)
+
+            order = factories.create_order(basket=basket)
+            order.status = ORDER.PAID
+            order.payment_processor = u'cybersource'
+
+            # Leave one order without a billing address.
+            if index:
+                order.billing_address = BillingAddress.objects.create(
+                    first_name=u'Ŝàûl', last_name=u'Göõðḿàñ', line1=u'9800 Montgomery Blvd NE',
+                    line4=u'Albuquerque', state=u'NM', postcode=u'87111', country=country
+                )
+            order.save()
+
+            line = order.lines.first()
+            line.attributes.create(type=u'çéŕtïfïçàtéṫýṗé', value=u'honor')
+
+            source = order.sources.create(
+                source_type=source_type, currency=order.currency, amount_allocated=order.total_excl_tax,
+                amount_debited=D('1.005'), reference=order.number, label=u'Ṽïšà'
+            )
+            source.transactions.create(
+                txn_type=u'Debit', amount=order.total_excl_tax, reference=order.number, status=u'Complete'
+            )
+
+        return data.prefetch_order_relations(Order.objects.order_by('-date_placed'))
+
+
+class FastOrderSerializerTests(OrderFixtureMixin, TestCase):
+    def test_equivalence(self):
+        """ The fast serializer must produce exactly the same output as OrderSerializer. """
+        orders = list(self.create_orders(num_orders=3))
+        renderer = JSONRenderer()
+
+        self.assertEqual(
+            renderer.render(FastOrderSerializer(orders, many=True).data),
+            renderer.render(OrderSerializer(orders, many=True).data)
+        )
+
+        for order in orders:
+            self.assertEqual(
+                renderer.render(FastOrderSerializer(order).data),
+                renderer.render(OrderSerializer(order).data)
+            )
+
+
+@skipUnless(os.environ.get('RUN_BENCHMARKS'), 'Set RUN_BENCHMARKS to run benchmarks.')
+class OrderSerializerBenchmark(OrderFixtureMixin, TestCase):
+    """ Compares the time taken by each serializer to serialize a page of orders. """
+    NUM_ORDERS = 20
+    REPETITIONS = 50
+
+    def test_serializers(self):
+        orders = list(self.create_orders(num_orders=self.NUM_ORDERS))
+
+        timings = {}
+        for serializer_class in (OrderSerializer, FastOrderSerializer):
+            timings[serializer_class.__name__] = min(timeit.repeat(
+                lambda: serializer_class(orders, many=True).data,  # pylint: disable=cell-var-from-loop
+                number=self.REPETITIONS,
+                repeat=3
+            )) / self.REPETITIONS
+
+        for name, duration in sorted(timings.items()):
+            logger.info(u'%s: %.2f ms per page of %d orders', name, duration * 1000, self.NUM_ORDERS)
+
+        self.assertLess(timings['FastOrderSerializer'], timings['OrderSerializer'])
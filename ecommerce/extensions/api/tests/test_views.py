@@ -14,16 +14,21 @@ from django.core.cache import cache
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.urlresolvers import reverse
+from django.db import IntegrityError, connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from nose.tools import raises
 from oscar.test import factories
 from oscar.core.loading import get_model
 from rest_framework import status
 
 from ecommerce.extensions.api import errors, data
+from ecommerce.extensions.api.pagination import OrderCursorPagination
 from ecommerce.extensions.api.serializers import OrderSerializer
 from ecommerce.extensions.api.tests.test_authentication import AccessTokenMixin, OAUTH2_PROVIDER_URL
-from ecommerce.extensions.api.views import OrdersThrottle, FulfillmentMixin, OrderListCreateAPIView
+from ecommerce.extensions.api.views import (
+    OrdersThrottle, FulfillmentMixin, OrderListCreateAPIView, OrderBulkCreateAPIView
+)
 from ecommerce.extensions.fulfillment.status import LINE, ORDER
 from ecommerce.extensions.order.utils import OrderNumberGenerator
 
@@ -31,6 +36,7 @@ from ecommerce.extensions.order.utils import OrderNumberGenerator
 Order = get_model('order', 'Order')
 Basket = get_model('basket', 'Basket')
 ShippingEventType = get_model('order', 'ShippingEventType')
+SourceType = get_model('payment', 'SourceType')
 
 
 class ThrottlingMixin(object):
@@ -98,6 +104,44 @@ class RetrieveOrderViewTests(ThrottlingMixin, UserMixin, TestCase):
         response = self.client.get(self.url, HTTP_AUTHORIZATION=other_token)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_conditional_get_etag(self):
+        """ If the client's ETag matches the order's, the view should return HTTP status 304 using one query. """
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, HTTP_AUTHORIZATION=self.token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len([query for query in context.captured_queries if 'order_order' in query['sql']]), 1)
+
+        # Changing the order, or any of its lines, should change its ETag.
+        line = self.order.lines.first()
+        line.status = LINE.COMPLETE
+        line.save()
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=self.token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+        self.order.status = ORDER.COMPLETE
+        self.order.save()
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=self.token, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_conditional_get_last_modified(self):
+        """ If the order hasn't changed since the client's copy was modified, the view should return HTTP status 304. """
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=self.token)
+        last_modified = response['Last-Modified']
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=self.token, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        response = self.client.get(
+            self.url, HTTP_AUTHORIZATION=self.token, HTTP_IF_MODIFIED_SINCE='Mon, 02 Mar 2015 00:00:00 GMT'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
 
 class CreateOrderViewTests(TestCase):
     USER_DATA = {
@@ -172,6 +216,105 @@ class CreateOrderViewTests(TestCase):
         # Verify that a new order can be created successfully
         self._create_and_verify_order(self.EXPENSIVE_TRIAL_SKU, self.SHIPPING_EVENT_NAME)
 
+    def test_order_multiple_products(self):
+        """Test that a single order containing several products can be created in one request."""
+        factories.ProductFactory(
+            structure='child',
+            parent=self.courthouse,
+            title=u'𝕋𝕣𝕚𝕒𝕝 𝕨𝕚𝕥𝕙 ℙ𝕦𝕓𝕝𝕚𝕔 𝔻𝕖𝕗𝕖𝕟𝕕𝕖𝕣',
+            product_class=self.product_class,
+            stockrecords__partner_sku=self.FREE_TRIAL_SKU,
+            stockrecords__price_excl_tax=D('0.00'),
+        )
+
+        # Duplicate SKUs should not result in duplicate lines.
+        skus = [self.EXPENSIVE_TRIAL_SKU, self.FREE_TRIAL_SKU, self.EXPENSIVE_TRIAL_SKU]
+        self._create_and_verify_order(skus, self.SHIPPING_EVENT_NAME)
+
+        order = Order.objects.get()
+        self.assertEqual(
+            sorted(order.lines.values_list('partner_sku', flat=True)),
+            sorted([self.EXPENSIVE_TRIAL_SKU, self.FREE_TRIAL_SKU])
+        )
+        self.assertEqual(Basket.objects.filter(owner=order.user).count(), 1)
+
+    def test_order_multiple_products_with_missing_product(self):
+        """Test that no order is created if any of the requested products doesn't exist."""
+        response = self._order(sku=[self.EXPENSIVE_TRIAL_SKU, self.FREE_TRIAL_SKU])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data,
+            self._bad_request_dict(
+                errors.PRODUCT_NOT_FOUND_DEVELOPER_MESSAGE.format(sku=self.FREE_TRIAL_SKU),
+                errors.PRODUCT_NOT_FOUND_USER_MESSAGE
+            )
+        )
+        self.assertFalse(Order.objects.exists())
+
+    def test_idempotency_key(self):
+        """Test that requests repeating an idempotency key receive the first response without creating another order."""
+        ShippingEventType.objects.create(code='shipped', name=self.SHIPPING_EVENT_NAME)
+
+        first = self._order(sku=self.EXPENSIVE_TRIAL_SKU, HTTP_IDEMPOTENCY_KEY='attempt-1')
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Idempotent-Replayed', first)
+
+        replayed = self._order(sku=self.EXPENSIVE_TRIAL_SKU, HTTP_IDEMPOTENCY_KEY='attempt-1')
+        self.assertEqual(replayed.status_code, status.HTTP_200_OK)
+        self.assertEqual(replayed['Idempotent-Replayed'], 'true')
+        self.assertEqual(json.loads(replayed.content), json.loads(first.content))
+        self.assertEqual(Order.objects.count(), 1)
+
+        # A new key should result in a new order.
+        self._order(sku=self.EXPENSIVE_TRIAL_SKU, HTTP_IDEMPOTENCY_KEY='attempt-2')
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_idempotency_key_reused(self):
+        """Test that requests repeating an idempotency key with different SKUs are rejected."""
+        ShippingEventType.objects.create(code='shipped', name=self.SHIPPING_EVENT_NAME)
+        self._order(sku=self.EXPENSIVE_TRIAL_SKU, HTTP_IDEMPOTENCY_KEY='attempt-1')
+
+        response = self._order(sku=[self.EXPENSIVE_TRIAL_SKU, self.FREE_TRIAL_SKU], HTTP_IDEMPOTENCY_KEY='attempt-1')
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(
+            response.data['developer_message'],
+            errors.IDEMPOTENCY_KEY_REUSED_DEVELOPER_MESSAGE.format(key='attempt-1')
+        )
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_idempotency_key_expired(self):
+        """Test that requests repeating an expired idempotency key are processed as new requests."""
+        ShippingEventType.objects.create(code='shipped', name=self.SHIPPING_EVENT_NAME)
+        self._order(sku=self.EXPENSIVE_TRIAL_SKU, HTTP_IDEMPOTENCY_KEY='attempt-1')
+
+        with override_settings(IDEMPOTENCY_KEY_LIFETIME=-1):
+            response = self._order(sku=self.EXPENSIVE_TRIAL_SKU, HTTP_IDEMPOTENCY_KEY='attempt-1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_invalid_idempotency_key(self):
+        """Test that requests with an overly long idempotency key are rejected."""
+        response = self._order(sku=self.EXPENSIVE_TRIAL_SKU, HTTP_IDEMPOTENCY_KEY='x' * 256)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Order.objects.exists())
+
+    def test_get_basket(self):
+        """Test that the user's most recent editable basket is reused, emptied, without merging older baskets."""
+        user = get_user_model().objects.create_user(username=self.USER_DATA['username'])
+        baskets = [Basket.objects.create(owner=user) for _ in xrange(3)]
+
+        with self.assertNumQueries(1):
+            basket = data.get_basket(user)
+        self.assertEqual(basket, baskets[-1])
+
+        basket.add_product(self.expensive_trial)
+        basket = data.get_basket(user)
+        self.assertEqual(basket, baskets[-1])
+        self.assertTrue(basket.is_empty)
+        self.assertEqual(Basket.objects.filter(owner=user).count(), 3)
+
     @raises(errors.ShippingEventNotFoundError)
     def test_create_bad_shipping_event(self):
         """Test that attempts to create a non-existent shipping event fail."""
@@ -258,16 +401,18 @@ class CreateOrderViewTests(TestCase):
         token = jwt.encode(payload, secret)
         return token
 
-    def _order(self, sku=None, auth=True, token=None):
+    def _order(self, sku=None, auth=True, token=None, **headers):
         order_data = {}
         if sku:
             order_data['sku'] = sku
 
         if auth:
             token = token or self._generate_token(self.USER_DATA)
-            response = self.client.post(reverse('orders:create_list'), order_data, HTTP_AUTHORIZATION='JWT ' + token)
+            response = self.client.post(
+                reverse('orders:create_list'), order_data, HTTP_AUTHORIZATION='JWT ' + token, **headers
+            )
         else:
-            response = self.client.post(reverse('orders:create_list'), order_data)
+            response = self.client.post(reverse('orders:create_list'), order_data, **headers)
 
         return response
 
@@ -296,6 +441,123 @@ class CreateOrderViewTests(TestCase):
         return bad_request_dict
 
 
+@mock.patch.object(OrderBulkCreateAPIView, '_fulfill_order', mock.Mock(side_effect=lambda order: order))
+class BulkCreateOrderViewTests(ThrottlingMixin, UserMixin, TestCase):
+    FREE_SKU = u'ḞŔÉÉ-ŚÉÁT'
+    PAID_SKU = u'ṔÁÍḊ-ŚÉÁT'
+    NONEXISTENT_SKU = u'ŃŐ-ŚÉÁT'
+
+    def setUp(self):
+        super(BulkCreateOrderViewTests, self).setUp()
+        # Override all loggers, suppressing logging calls of severity CRITICAL and below
+        logging.disable(logging.CRITICAL)
+        self.addCleanup(logging.disable, logging.NOTSET)
+
+        product_class = factories.ProductClassFactory(requires_shipping=False, track_stock=False)
+        course = factories.ProductFactory(structure='parent', product_class=product_class, stockrecords=None)
+        for sku, price in ((self.FREE_SKU, D('0.00')), (self.PAID_SKU, D('10.00'))):
+            factories.ProductFactory(
+                structure='child',
+                parent=course,
+                product_class=product_class,
+                stockrecords__partner_sku=sku,
+                stockrecords__price_excl_tax=price,
+            )
+
+        self.user = self.create_user(is_superuser=True)
+        self.client.login(username=self.user.username, password=self.password)
+        self.path = reverse('orders:bulk_create')
+
+    def _bulk_order(self, items):
+        return self.client.post(self.path, json.dumps({'orders': items}), content_type='application/json')
+
+    def test_permissions_required(self):
+        """ The view should only allow users with permission to add orders. """
+        self.user.is_superuser = False
+        self.user.save()
+        response = self._bulk_order([{'username': self.user.username, 'sku': self.FREE_SKU}])
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalid_data(self):
+        """ The view should reject empty requests and requests exceeding the maximum number of orders. """
+        response = self._bulk_order([])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        with override_settings(BULK_ORDER_MAX_ITEMS=1):
+            response = self._bulk_order([{'username': 'a', 'sku': self.FREE_SKU}] * 2)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(BULK_ORDER_CHUNK_SIZE=2)
+    def test_bulk_order(self):
+        """ The view should place an order for each valid pair, and report a result for every pair. """
+        existing_user = self.create_user()
+        items = [
+            {'username': existing_user.username, 'sku': self.FREE_SKU},
+            {'username': u'ńéẃ-úśéŕ', 'sku': self.FREE_SKU},
+            {'username': existing_user.username, 'sku': self.PAID_SKU},
+            {'username': existing_user.username, 'sku': self.NONEXISTENT_SKU},
+        ]
+
+        response = self._bulk_order(items)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        results = json.loads(response.content)['results']
+        self.assertEqual([(result['username'], result['sku']) for result in results],
+                         [(item['username'], item['sku']) for item in items])
+
+        orders = Order.objects.order_by('id')
+        self.assertEqual(orders.count(), 2)
+        for result, order in zip(results[:2], orders):
+            self.assertEqual(result['number'], order.number)
+            self.assertEqual(result['status'], ORDER.PAID)
+            self.assertEqual(order.user.username, result['username'])
+
+        self.assertEqual(
+            results[2]['developer_message'],
+            errors.PRODUCT_NOT_FREE_DEVELOPER_MESSAGE.format(sku=self.PAID_SKU)
+        )
+        self.assertEqual(
+            results[3]['developer_message'],
+            errors.PRODUCT_NOT_FOUND_DEVELOPER_MESSAGE.format(sku=self.NONEXISTENT_SKU)
+        )
+
+    def test_fulfillment_failure(self):
+        """ A failure to fulfill one order should be reported, without preventing the fulfillment of the others. """
+        usernames = [u'ńéẃ-úśéŕ', u'ótĥéŕ-úśéŕ']
+        failures = [Exception('Fulfillment failed')]
+
+        def fulfill_order(order):
+            # Only the first order's fulfillment fails.
+            if failures:
+                raise failures.pop()
+            return order
+
+        with mock.patch.object(OrderBulkCreateAPIView, '_fulfill_order', side_effect=fulfill_order):
+            response = self._bulk_order([{'username': username, 'sku': self.FREE_SKU} for username in usernames])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        results = json.loads(response.content)['results']
+        orders = Order.objects.order_by('id')
+        self.assertEqual([result['number'] for result in results], [order.number for order in orders])
+        self.assertEqual(results[0]['developer_message'], 'Fulfillment failed')
+        self.assertNotIn('status', results[0])
+        self.assertEqual(results[1]['status'], ORDER.PAID)
+
+    def test_get_or_create_users_conflict(self):
+        """ Users should still be returned if a concurrent request creates some of them first. """
+        existing_user = self.create_user()
+        usernames = [existing_user.username, u'ńéẃ-úśéŕ', u'ótĥéŕ-úśéŕ']
+        User = get_user_model()
+
+        # Simulate the failure of the bulk insert, due to a user created by a concurrent request.
+        with mock.patch.object(User.objects, 'bulk_create', side_effect=IntegrityError):
+            users = data.get_or_create_users(usernames)
+
+        self.assertEqual(sorted(users), sorted(usernames))
+        self.assertEqual(users[existing_user.username], existing_user)
+        self.assertEqual(User.objects.filter(username__in=usernames).count(), 3)
+
+
 @ddt.ddt
 class FulfillOrderViewTests(UserMixin, TestCase):
     def setUp(self):
@@ -383,6 +645,74 @@ class FulfillOrderViewTests(UserMixin, TestCase):
         response = self._put_to_view()
         self.assertEqual(500, response.status_code)
 
+    @override_settings(FULFILLMENT_ASYNC=True)
+    def test_async_fulfillment(self):
+        """ If fulfillment is asynchronous, the view should enqueue the order and return HTTP 202. """
+        response = self._put_to_view()
+        self.assertEqual(202, response.status_code)
+        self.assertEqual(ORDER.FULFILLMENT_ERROR, response.data['status'])
+        self.assertEqual(self.order.fulfillment_jobs.count(), 1)
+
+        # Repeated requests should not enqueue the order again while it awaits fulfillment.
+        self._put_to_view()
+        self.assertEqual(self.order.fulfillment_jobs.count(), 1)
+
+
+class BulkFulfillOrderViewTests(UserMixin, TestCase):
+    def setUp(self):
+        super(BulkFulfillOrderViewTests, self).setUp()
+        ShippingEventType.objects.create(code='shipped', name=FulfillmentMixin.SHIPPING_EVENT_NAME)
+
+        self.user = self.create_user(is_staff=True)
+        self.client.login(username=self.user.username, password=self.password)
+
+        self.orders = [factories.create_order() for _ in xrange(3)]
+        for order in self.orders:
+            order.status = ORDER.FULFILLMENT_ERROR
+            order.save()
+            order.lines.all().update(status=LINE.FULFILLMENT_NETWORK_ERROR)
+
+        self.url = reverse('orders:bulk_fulfill')
+
+    def _post_to_view(self, filters):
+        return self.client.post(self.url, json.dumps(filters), content_type='application/json')
+
+    def test_staff_required(self):
+        """ The view should return HTTP 403 status if the user is not staff. """
+        self.user.is_staff = False
+        self.user.save()
+        self.assertEqual(403, self._post_to_view({}).status_code)
+
+    def test_invalid_filters(self):
+        """ The view should return HTTP 400 status if the filters are invalid. """
+        self.assertEqual(400, self._post_to_view({'line_status': LINE.COMPLETE}).status_code)
+
+    @override_settings(FULFILLMENT_RETRY_BATCH_SIZE=1, FULFILLMENT_RETRY_CONCURRENCY=1)
+    def test_bulk_fulfillment(self):
+        """ The view should retry the matching orders, streaming the result of each retry and a summary. """
+        numbers = [order.number for order in self.orders[:2]]
+
+        with mock.patch('ecommerce.extensions.order.processing.EventHandler.handle_shipping_event') as mocked:
+            def handle_shipping_event(order, _event_type, _lines, _line_quantities, **_kwargs):
+                order.status = ORDER.COMPLETE if order.number == numbers[0] else ORDER.FULFILLMENT_ERROR
+                order.save()
+                return order
+
+            mocked.side_effect = handle_shipping_event
+            response = self._post_to_view({'numbers': numbers, 'line_status': LINE.FULFILLMENT_NETWORK_ERROR})
+            results = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            [
+                {'number': numbers[0], 'status': ORDER.COMPLETE},
+                {'number': numbers[1], 'status': ORDER.FULFILLMENT_ERROR},
+                {'total': 2, 'complete': 1, 'failed': 1},
+            ],
+            results
+        )
+        self.assertEqual(ORDER.FULFILLMENT_ERROR, Order.objects.get(id=self.orders[2].id).status)
+
 
 class ListOrderViewTests(AccessTokenMixin, ThrottlingMixin, UserMixin, TestCase):
     def setUp(self):
@@ -446,3 +776,107 @@ class ListOrderViewTests(AccessTokenMixin, ThrottlingMixin, UserMixin, TestCase)
         factories.create_order(user=other_user)
         response = self.client.get(self.path, HTTP_AUTHORIZATION=self.token)
         self.assert_empty_result_response(response)
+
+    def _get_results(self, path):
+        """ Retrieve a page of orders, returning the numbers of the orders on the page and the next page's URL. """
+        response = self.client.get(path, HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.status_code, 200)
+        content = json.loads(response.content)
+        return [result['number'] for result in content['results']], content['next']
+
+    @mock.patch.object(OrderCursorPagination, 'page_size', 2)
+    def test_cursor_pagination(self):
+        """ Clients passing a cursor should be able to page through all orders, including orders placed at once. """
+        orders = [factories.create_order(user=self.user) for _ in xrange(5)]
+        # Give several orders the same placement date, leaving their IDs to determine their order.
+        Order.objects.filter(id__in=[order.id for order in orders[1:4]]).update(date_placed=orders[0].date_placed)
+        expected = [unicode(order.number) for order in Order.objects.order_by('-date_placed', '-id')]
+
+        numbers, next_link = self._get_results(self.path + '?cursor=')
+        self.assertEqual(len(numbers), 2)
+        while next_link:
+            page, next_link = self._get_results(next_link)
+            numbers += page
+
+        self.assertEqual(numbers, expected)
+
+    def test_page_number_pagination(self):
+        """ Clients not passing a cursor should receive page number-paginated results, including a count. """
+        factories.create_order(user=self.user)
+        response = self.client.get(self.path, HTTP_AUTHORIZATION=self.token)
+        content = json.loads(response.content)
+        self.assertEqual(content['count'], 1)
+        self.assertIn('previous', content)
+
+    def test_invalid_cursor(self):
+        """ The view should return HTTP status 404 if the cursor cannot be decoded. """
+        response = self.client.get(self.path + '?cursor=garbage', HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.status_code, 404)
+
+    @mock.patch.object(OrderListCreateAPIView, 'export_chunk_size', 2)
+    def test_ndjson_export(self):
+        """ Clients requesting NDJSON should receive a stream of all of their orders, one per line. """
+        orders = [factories.create_order(user=self.user) for _ in xrange(5)]
+        factories.create_order(user=self.create_user())
+
+        response = self.client.get(self.path + '?format=ndjson', HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        lines = ''.join(response.streaming_content).splitlines()
+        expected = OrderSerializer(reversed(orders), many=True).data
+        self.assertEqual([json.loads(line) for line in lines], json.loads(json.dumps(expected)))
+
+
+class OrderQueryCountTests(ThrottlingMixin, UserMixin, TestCase):
+    """ The number of queries made to list or retrieve orders should not depend on the amount of data returned. """
+
+    def setUp(self):
+        super(OrderQueryCountTests, self).setUp()
+        self.user = self.create_user()
+        self.token = self.generate_jwt_token_header(self.user)
+        self.source_type = SourceType.objects.create(name='cybersource')
+
+    def _create_order(self, num_lines):
+        """ Create a paid order with the given number of lines. """
+        basket = factories.create_basket(empty=True)
+        for _ in xrange(num_lines):
+            product = factories.create_product()
+            factories.create_stockrecord(product, num_in_stock=2)
+            basket.add_product(product)
+
+        order = factories.create_order(basket=basket, user=self.user)
+        order.status = ORDER.PAID
+        order.save()
+
+        source = order.sources.create(
+            source_type=self.source_type, currency=order.currency, amount_allocated=order.total_excl_tax
+        )
+        source.transactions.create(txn_type='Debit', amount=order.total_excl_tax, reference=order.number)
+        return order
+
+    def _count_queries(self, path):
+        """ Return the number of queries made to serve a GET request to the given path. """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path, HTTP_AUTHORIZATION=self.token)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def test_list_query_count(self):
+        """ Listing orders should use the same number of queries regardless of the number of orders and lines. """
+        path = reverse('orders:create_list')
+        self._create_order(num_lines=1)
+        expected = self._count_queries(path)
+
+        for num_lines in (1, 2, 3):
+            self._create_order(num_lines=num_lines)
+        self.assertEqual(self._count_queries(path), expected)
+
+    def test_retrieve_query_count(self):
+        """ Retrieving an order should use the same number of queries regardless of the number of lines. """
+        order = self._create_order(num_lines=1)
+        expected = self._count_queries(reverse('orders:retrieve', kwargs={'number': order.number}))
+
+        order = self._create_order(num_lines=3)
+        self.assertEqual(self._count_queries(reverse('orders:retrieve', kwargs={'number': order.number})), expected)
@@ -8,6 +8,8 @@ ORDER_NUMBER_PATTERN = r"(?P<number>[-\w]+)"
 ORDER_URLS = patterns(
     '',
     url(r'^$', views.OrderListCreateAPIView.as_view(), name='create_list'),
+    url(r'^bulk/$', views.OrderBulkCreateAPIView.as_view(), name='bulk_create'),
+    url(r'^fulfill/$', views.BulkFulfillOrderView.as_view(), name='bulk_fulfill'),
     url(
         r'^{number}/$'.format(number=ORDER_NUMBER_PATTERN),
         views.RetrieveOrderView.as_view(),
@@ -1,16 +1,26 @@
 """HTTP endpoints for interacting with Oscar."""
+import hashlib
+import json
 import logging
+from calendar import timegm
+from collections import OrderedDict
 
 from django.conf import settings
-from django.http import Http404
+from django.db import transaction
+from django.http import Http404, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
 from oscar.core.loading import get_class, get_classes, get_model
 from rest_framework import status
-from rest_framework.generics import UpdateAPIView, RetrieveAPIView, ListCreateAPIView
-from rest_framework.permissions import IsAuthenticated, DjangoModelPermissions
+from rest_framework.generics import CreateAPIView, GenericAPIView, UpdateAPIView, RetrieveAPIView, ListCreateAPIView
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, DjangoModelPermissions
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
-from ecommerce.extensions.api import data, errors, serializers
+from ecommerce.extensions.api import data, errors, pagination, renderers, serializers
+from ecommerce.extensions.api.models import IdempotencyKey
 from ecommerce.extensions.api.throttling import OrdersThrottle
+from ecommerce.extensions.fulfillment import retry
 from ecommerce.extensions.fulfillment.status import ORDER
 from ecommerce.extensions.fulfillment.mixins import FulfillmentMixin
 from ecommerce.extensions.payment.helpers import get_processor_class
@@ -68,13 +78,56 @@ class RetrieveOrderView(RetrieveAPIView):
     permission_classes = (IsAuthenticated,)
     serializer_class = serializers.OrderSerializer
     lookup_field = 'number'
-    queryset = Order.objects.all()
+
+    def get_queryset(self):
+        return data.prefetch_order_relations(Order.objects.filter(user=self.request.user))
+
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve the order, unless the client's copy of it is up to date.
+
+        Responses carry ETag and Last-Modified headers derived from the order's status and
+        modification date. Clients polling the order (e.g., while waiting for payment to settle)
+        should send these back in If-None-Match and If-Modified-Since headers. If the order
+        hasn't changed, a 304 response is returned, having cost a single lookup of the order's
+        validators instead of loading and serializing the order.
+        """
+        validators = data.get_order_validators(request.user, kwargs[self.lookup_field])
+        if validators is None:
+            raise Http404
+
+        etag, last_modified = self._get_etag(kwargs[self.lookup_field], *validators)
+
+        if self._is_not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(serializers.FastOrderSerializer(self.get_object()).data)
+
+        response['ETag'] = quote_etag(etag)
+        response['Last-Modified'] = http_date(last_modified)
+        # Clients must revalidate their copy of the order each time they use it.
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def _get_etag(self, number, order_status, date_modified):
+        """Returns the ETag and Last-Modified timestamp for an order."""
+        version = u'{}|{}|{}'.format(number, order_status, date_modified.isoformat())
+        return hashlib.md5(version.encode('utf-8')).hexdigest(), timegm(date_modified.utctimetuple())
+
+    def _is_not_modified(self, request, etag, last_modified):
+        """Determine whether the client's copy of the order is current, per the request's conditional headers."""
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            return etag in etags or '*' in etags
+
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE'))
+        return if_modified_since is not None and last_modified <= if_modified_since
 
     def get_object(self):
         """Retrieve the order for this request.
 
-        Retrieves the associated order, and if it is paid and associated with the request user, returns it. Otherwise,
-        raises an Http404 exception.
+        Retrieves the associated order, and if it is paid, returns it. Only orders associated with the request
+        user are considered. Otherwise, raises an Http404 exception.
 
         Returns:
             Order: The associated order.
@@ -85,29 +138,153 @@ class RetrieveOrderView(RetrieveAPIView):
 
         """
         order = super(RetrieveOrderView, self).get_object()
-        if order and order.is_paid and order.user.username == self.request.user.username:
+        if order and order.is_paid:
             return order
         else:
             raise Http404
 
 
-class OrderListCreateAPIView(FulfillmentMixin, ListCreateAPIView):
+class OrderCreationMixin(object):
+    """ A mixin that provides the ability to turn a basket into an order. """
+    FREE = 0
+
+    def _report_bad_request(self, developer_message, user_message):
+        """Log error and create a response containing conventional error messaging."""
+        logger.error(developer_message)
+        return Response(
+            {
+                'developer_message': developer_message,
+                'user_message': user_message
+            },
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    def _prepare_order(self, basket, products, payment_processor):
+        """Prepare an order for a user consisting of the provided products, keyed by SKU."""
+        # Baskets with a status of 'Frozen' or 'Submitted' are not retrieved at the
+        # start of a new order. To prevent stale items from ending up in the basket
+        # at the start of an order, we want to guarantee that this endpoint creates
+        # new orders iff the basket in use is frozen first. Callers are expected to
+        # run this method within a transaction; for most views, ATOMIC_REQUESTS takes
+        # care of this, making an `atomic()` context manager here redundant.
+        for product in products.values():
+            basket.add_product(product)
+        basket.freeze()
+
+        logger.info(
+            u"Added products [SKUs: %s] to basket [%d]",
+            u", ".join(products.keys()),
+            basket.id,
+        )
+
+        shipping_method = Free()
+        shipping_charge = shipping_method.calculate(basket)
+        total = OrderTotalCalculator().calculate(basket, shipping_charge)
+
+        order = OrderCreator().place_order(
+            basket,
+            total,
+            shipping_method,
+            shipping_charge,
+            user=basket.owner,
+            order_number=OrderNumberGenerator.order_number(basket),
+            status=ORDER.OPEN,
+            payment_processor=payment_processor.NAME
+        )
+
+        logger.info(
+            u"Created order [%s] totaling [%.2f %s] using basket [%d]; payment to be processed by [%s]",
+            order.number,
+            order.total_excl_tax,
+            order.currency,
+            basket.id,
+            payment_processor.NAME
+        )
+
+        # Update the order to BEING_PROCESSED for all orders
+        order.set_status(ORDER.BEING_PROCESSED)
+
+        # If the product constituting the order is free, we mark the order
+        # as paid (as dictated by the order status pipeline) so that the
+        # fulfillment API will agree to fulfill it.
+        if order.total_excl_tax == self.FREE:
+            order.set_status(ORDER.PAID)
+            logger.info(u"Marked order [%s] as [%s]", order.number, ORDER.PAID)
+
+        # Mark the basket as submitted
+        basket.submit()
+
+        return order
+
+
+class OrderListCreateAPIView(FulfillmentMixin, OrderCreationMixin, ListCreateAPIView):
     """
     Endpoint for listing or creating orders.
 
     When listing orders, results are ordered with the newest order being the first in the list of results.
+    Results are paginated by page number by default. Clients paging through long order histories should
+    instead pass the `cursor` query parameter (empty for the first page) and follow the returned `next`
+    links, since the cost of fetching a page by cursor doesn't grow with the page's depth.
+
+    Clients needing a user's full order history should instead request it as newline-delimited
+    JSON (e.g., by passing `format=ndjson`). The complete, unpaginated history is then streamed
+    back with one order per line, loaded from the database a chunk at a time.
     """
+    IDEMPOTENCY_KEY_HEADER = 'HTTP_IDEMPOTENCY_KEY'
+
     throttle_classes = (OrdersThrottle,)
     permission_classes = (IsAuthenticated,)
     serializer_class = serializers.OrderSerializer
-
-    FREE = 0
+    pagination_class = pagination.OrderPagination
+    renderer_classes = tuple(api_settings.DEFAULT_RENDERER_CLASSES) + (renderers.NDJSONRenderer,)
+    export_chunk_size = 100
 
     def get_queryset(self):
-        return self.request.user.orders.order_by('-date_placed')
+        return data.prefetch_order_relations(self.request.user.orders.order_by('-date_placed'))
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if isinstance(request.accepted_renderer, renderers.NDJSONRenderer):
+            return StreamingHttpResponse(
+                self._export(queryset, request.accepted_renderer),
+                content_type=request.accepted_renderer.media_type
+            )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializers.FastOrderSerializer(page, many=True).data)
+
+        return Response(serializers.FastOrderSerializer(queryset, many=True).data)
+
+    def _export(self, queryset, renderer):
+        """Yield the serialized orders in the queryset, one line per order.
+
+        Only order IDs are read up front, using a database iterator. Orders, along with their
+        related objects, are then loaded and serialized a chunk at a time, so that memory use
+        is bounded by the chunk size rather than the length of the order history.
+        """
+        chunk = []
+        for order_id in queryset.values_list('id', flat=True).iterator():
+            chunk.append(order_id)
+            if len(chunk) == self.export_chunk_size:
+                for line in self._export_chunk(queryset, chunk, renderer):
+                    yield line
+                chunk = []
+
+        for line in self._export_chunk(queryset, chunk, renderer):
+            yield line
+
+    def _export_chunk(self, queryset, order_ids, renderer):
+        if not order_ids:
+            return
+
+        orders = queryset.in_bulk(order_ids)
+        for order_id in order_ids:
+            yield renderer.render_line(serializers.FastOrderSerializer(orders[order_id]).data)
 
     def create(self, request, *args, **kwargs):
-        """Add one product to a basket, then prepare an order.
+        """Add one or more products to a basket, then prepare an order.
 
         Protected by JWT authentication. Consuming services (e.g., the LMS)
         must authenticate themselves by passing a JWT in the Authorization
@@ -115,12 +292,22 @@ class OrderListCreateAPIView(FulfillmentMixin, ListCreateAPIView):
         contain user details. At a minimum, these details must include a
         username; providing an email is recommended.
 
-        Expects a SKU to be provided in the POST data, which is then used
-        to populate the user's basket with the corresponding product, freeze
-        that basket, and prepare an order using that basket. If the order
-        total is zero (i.e., the ordered product was free), an attempt to
+        Expects one or more SKUs to be provided in the POST data, which are then
+        used to populate the user's basket with the corresponding products, freeze
+        that basket, and prepare a single order using that basket. Multiple SKUs
+        may be provided as a list, or by repeating the 'sku' parameter. If the
+        order total is zero (i.e., the ordered products were free), an attempt to
         fulfill the order is made.
 
+        Clients may make retries safe by passing a unique key identifying the
+        request in the Idempotency-Key HTTP header. The response to the first
+        request bearing a key is stored, and returned for any later request
+        repeating the key (with the Idempotent-Replayed header set), without
+        creating or fulfilling another order. Duplicate requests made while the
+        first is still being processed wait for it to finish. A key is honored
+        for IDEMPOTENCY_KEY_LIFETIME seconds, and may only be repeated with the
+        same SKUs as the first request bearing it.
+
         Arguments:
             request (HttpRequest)
 
@@ -131,6 +318,8 @@ class OrderListCreateAPIView(FulfillmentMixin, ListCreateAPIView):
                 in JSON format
             HTTP_401_UNAUTHORIZED if an unauthenticated request is denied permission to access
                 the endpoint
+            HTTP_422_UNPROCESSABLE_ENTITY if the client has repeated an idempotency key with
+                different SKUs
             HTTP_429_TOO_MANY_REQUESTS if the client has made requests at a rate exceeding that
                 allowed by the OrdersThrottle
 
@@ -166,31 +355,75 @@ class OrderListCreateAPIView(FulfillmentMixin, ListCreateAPIView):
                 "total_excl_tax": 0.0
             }'
         """
-        sku = request.data.get('sku')
-        if sku:
-            try:
-                product = data.get_product(sku)
-            except errors.ProductNotFoundError as error:
-                return self._report_bad_request(error.message, errors.PRODUCT_NOT_FOUND_USER_MESSAGE)
-        else:
+        key = request.META.get(self.IDEMPOTENCY_KEY_HEADER)
+        if key is None:
+            return self._create_order(request)
+
+        max_length = IdempotencyKey._meta.get_field('key').max_length
+        if not key or len(key) > max_length:
+            return self._report_bad_request(
+                errors.IDEMPOTENCY_KEY_INVALID_DEVELOPER_MESSAGE.format(max_length=max_length),
+                errors.IDEMPOTENCY_KEY_INVALID_USER_MESSAGE
+            )
+
+        # Clients may repeat a request's SKUs in any order.
+        request_hash = hashlib.sha256(json.dumps(sorted(self._get_skus(request)))).hexdigest()
+        idempotency_key, claimed = data.claim_idempotency_key(request.user, key, request_hash)
+        if not claimed:
+            # Keys claimed before request hashes were recorded have none, and match any request.
+            if idempotency_key.request_hash and idempotency_key.request_hash != request_hash:
+                developer_message = errors.IDEMPOTENCY_KEY_REUSED_DEVELOPER_MESSAGE.format(key=key)
+                logger.error(developer_message)
+                return Response(
+                    {
+                        'developer_message': developer_message,
+                        'user_message': errors.IDEMPOTENCY_KEY_INVALID_USER_MESSAGE
+                    },
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY
+                )
+
+            logger.info(u"Replaying response to order creation request [Idempotency-Key: %s]", key)
+            response = Response(idempotency_key.response_data, status=idempotency_key.response_status)
+            response['Idempotent-Replayed'] = 'true'
+            return response
+
+        response = self._create_order(request)
+        idempotency_key.record_response(response)
+        return response
+
+    def _create_order(self, request):
+        """Create, and if possible fulfill, an order for the products indicated by the request."""
+        skus = self._get_skus(request)
+        if not skus:
             return self._report_bad_request(
                 errors.SKU_NOT_FOUND_DEVELOPER_MESSAGE,
                 errors.SKU_NOT_FOUND_USER_MESSAGE
             )
 
+        # Resolve every requested product with a single query.
+        products_by_sku = data.get_products(skus)
+        products = OrderedDict()
+        for sku in skus:
+            if sku not in products_by_sku:
+                return self._report_bad_request(
+                    errors.PRODUCT_NOT_FOUND_DEVELOPER_MESSAGE.format(sku=sku),
+                    errors.PRODUCT_NOT_FOUND_USER_MESSAGE
+                )
+            products[sku] = products_by_sku[sku]
+
         basket = data.get_basket(request.user)
-        availability = basket.strategy.fetch_for_product(product).availability
 
         # If an exception is raised before order creation but after basket creation,
         # an empty basket for the user will be left in the system. However, if this
-        # user attempts to order again, the `get_basket` utility will merge all old
-        # baskets with a new one, returning a fresh basket.
-        if not availability.is_available_to_buy:
-            return self._report_bad_request(availability.message, errors.PRODUCT_UNAVAILABLE_USER_MESSAGE)
+        # user attempts to order again, the `get_basket` utility will reuse it.
+        for product in products.values():
+            availability = basket.strategy.fetch_for_product(product).availability
+            if not availability.is_available_to_buy:
+                return self._report_bad_request(availability.message, errors.PRODUCT_UNAVAILABLE_USER_MESSAGE)
 
         payment_processor = get_processor_class(settings.PAYMENT_PROCESSORS[0])
 
-        order = self._prepare_order(basket, product, sku, payment_processor)
+        order = self._prepare_order(basket, products, payment_processor)
         if order.status == ORDER.PAID:
             logger.info(
                 u"Attempting to immediately fulfill order [%s] totaling [%.2f %s]",
@@ -205,79 +438,162 @@ class OrderListCreateAPIView(FulfillmentMixin, ListCreateAPIView):
 
         return Response(order_data, status=status.HTTP_200_OK)
 
-    def _report_bad_request(self, developer_message, user_message):
-        """Log error and create a response containing conventional error messaging."""
-        logger.error(developer_message)
-        return Response(
-            {
-                'developer_message': developer_message,
-                'user_message': user_message
-            },
-            status=status.HTTP_400_BAD_REQUEST
-        )
+    def _get_skus(self, request):
+        """Return the distinct SKUs provided in the POST data, in the order they were provided.
 
-    def _prepare_order(self, basket, product, sku, payment_processor):
-        """Prepare an order consisting of a single product for a user."""
-        # Baskets with a status of 'Frozen' or 'Submitted' are not retrieved at the
-        # start of a new order. To prevent stale items from ending up in the basket
-        # at the start of an order, we want to guarantee that this endpoint creates
-        # new orders iff the basket in use is frozen first. Since ATOMIC_REQUESTS is
-        # assumed to be enabled, wrapping this block with an `atomic()` context
-        # manager to ensure atomicity would be redundant.
-        basket.add_product(product)
-        basket.freeze()
+        One or more SKUs may be provided, either as a list (when posting JSON) or
+        by repeating the 'sku' parameter (when posting form data).
+        """
+        if hasattr(request.data, 'getlist'):
+            skus = request.data.getlist('sku')
+        else:
+            skus = request.data.get('sku')
+            if not isinstance(skus, list):
+                skus = [skus]
 
-        logger.info(
-            u"Added product [SKU: %s] to basket [%d]",
-            sku,
-            basket.id,
-        )
+        distinct_skus = []
+        for sku in skus:
+            if sku and sku not in distinct_skus:
+                distinct_skus.append(sku)
 
-        shipping_method = Free()
-        shipping_charge = shipping_method.calculate(basket)
-        total = OrderTotalCalculator().calculate(basket, shipping_charge)
+        return distinct_skus
 
-        order = OrderCreator().place_order(
-            basket,
-            total,
-            shipping_method,
-            shipping_charge,
-            user=basket.owner,
-            order_number=OrderNumberGenerator.order_number(basket),
-            status=ORDER.OPEN,
-            payment_processor=payment_processor.NAME
-        )
+    def _assemble_order_data(self, order, payment_processor):
+        """Assemble a dictionary of metadata for the provided order."""
+        order_data = serializers.OrderSerializer(order).data
+        order_data['payment_parameters'] = payment_processor().get_transaction_parameters(order)
 
-        logger.info(
-            u"Created order [%s] totaling [%.2f %s] using basket [%d]; payment to be processed by [%s]",
-            order.number,
-            order.total_excl_tax,
-            order.currency,
-            basket.id,
-            payment_processor.NAME
-        )
+        return order_data
 
-        # Update the order to BEING_PROCESSED for all orders
-        order.set_status(ORDER.BEING_PROCESSED)
 
-        # If the product constituting the order is free, we mark the order
-        # as paid (as dictated by the order status pipeline) so that the
-        # fulfillment API will agree to fulfill it.
-        if order.total_excl_tax == self.FREE:
-            order.set_status(ORDER.PAID)
-            logger.info(u"Marked order [%s] as [%s]", order.number, ORDER.PAID)
+class OrderBulkCreateAPIView(FulfillmentMixin, OrderCreationMixin, CreateAPIView):
+    """Create and fulfill orders for many users at once.
 
-        # Mark the basket as submitted
-        basket.submit()
+    Intended for mass enrollments, this endpoint accepts a list of (username, SKU) pairs and places a single-product
+    order for each pair. Only free products may be ordered in bulk. Users who do not exist yet are created.
 
-        return order
+    Pairs are processed in chunks of BULK_ORDER_CHUNK_SIZE, each of which is placed within its own transaction.
+    Users and products are resolved with one query per chunk and per request, respectively. Once a chunk has been
+    committed, its orders are fulfilled. A failure to place one order does not prevent the others from being placed.
 
-    def _assemble_order_data(self, order, payment_processor):
-        """Assemble a dictionary of metadata for the provided order."""
-        order_data = serializers.OrderSerializer(order).data
-        order_data['payment_parameters'] = payment_processor().get_transaction_parameters(order)
+    Returns:
+        HTTP_200_OK with a list containing the result of each requested order, in the order requested
+        HTTP_400_BAD_REQUEST if the provided data is invalid
+        HTTP_401_UNAUTHORIZED if an unauthenticated request is denied permission to access the endpoint
+        HTTP_403_FORBIDDEN if the authenticated user is not allowed to add orders
 
-        return order_data
+    Example:
+        >>> url = 'http://localhost:8002/api/v1/orders/bulk/'
+        >>> data = {
+            'orders': [
+                {'username': 'Saul', 'sku': 'SEAT-HONOR-EDX-DEMOX-DEMO-COURSE'},
+                {'username': 'Kim', 'sku': 'SEAT-HONOR-EDX-DEMOX-DEMO-COURSE'},
+                {'username': 'Mike', 'sku': 'NOT-A-SKU'},
+            ]
+        }
+        >>> response = requests.post(url, data=json.dumps(data), headers=headers)
+        >>> response.status_code
+        200
+        >>> response.content
+        '{
+            "results": [
+                {"username": "Saul", "sku": "SEAT-HONOR-EDX-DEMOX-DEMO-COURSE", "number": "OSCR-100021",
+                 "status": "Complete"},
+                {"username": "Kim", "sku": "SEAT-HONOR-EDX-DEMOX-DEMO-COURSE", "number": "OSCR-100022",
+                 "status": "Complete"},
+                {"username": "Mike", "sku": "NOT-A-SKU",
+                 "developer_message": "Catalog does not contain the indicated product [SKU: NOT-A-SKU]"}
+            ]
+        }'
+    """
+    throttle_classes = (OrdersThrottle,)
+    permission_classes = (IsAuthenticated, DjangoModelPermissions,)
+    queryset = Order.objects.all()
+    serializer_class = serializers.BulkOrderSerializer
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Each chunk of orders is committed in its own transaction, so this view must
+        # opt out of the request-wide transaction enabled by ATOMIC_REQUESTS.
+        return transaction.non_atomic_requests(super(OrderBulkCreateAPIView, cls).as_view(**initkwargs))
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return self._report_bad_request(serializer.errors, errors.BULK_ORDER_INVALID_USER_MESSAGE)
+
+        items = serializer.validated_data['orders']
+        products = data.get_products(set(item['sku'] for item in items))
+        payment_processor = get_processor_class(settings.PAYMENT_PROCESSORS[0])
+        chunk_size = settings.BULK_ORDER_CHUNK_SIZE
+
+        logger.info(u"Placing [%d] bulk orders in chunks of [%d]", len(items), chunk_size)
+
+        results = []
+        for start in xrange(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            results.extend(self._place_chunk(chunk, products, payment_processor))
+
+        return Response({'results': results}, status=status.HTTP_200_OK)
+
+    def _place_chunk(self, items, products, payment_processor):
+        """Place and fulfill the orders for one chunk of (username, SKU) pairs."""
+        results = []
+        placed = []
+
+        with transaction.atomic():
+            users = data.get_or_create_users(item['username'] for item in items)
+
+            for item in items:
+                username, sku = item['username'], item['sku']
+                result = {'username': username, 'sku': sku}
+                results.append(result)
+
+                try:
+                    # A savepoint per order allows the remainder of the chunk to be committed if one order fails.
+                    with transaction.atomic():
+                        order = self._prepare_bulk_order(users[username], products.get(sku), sku, payment_processor)
+                except errors.OrderError as error:
+                    logger.error(error.message)
+                    result['developer_message'] = error.message
+                except Exception as error:  # pylint: disable=broad-except
+                    logger.exception(u"Failed to place bulk order for user [%s] and SKU [%s]", username, sku)
+                    result['developer_message'] = unicode(error)
+                else:
+                    placed.append((result, order))
+
+        # Fulfillment involves calls to external services. It happens once the chunk has been
+        # committed, so that database locks aren't held while waiting on those services.
+        # The orders have been placed, so each result reports its order's number even if fulfillment fails.
+        for result, order in placed:
+            result['number'] = order.number
+
+            try:
+                with transaction.atomic():
+                    order = self._fulfill_order(order)
+            except Exception as error:  # pylint: disable=broad-except
+                logger.exception(u"Failed to fulfill bulk order [%s]", order.number)
+                result['developer_message'] = unicode(error)
+            else:
+                result['status'] = order.status
+
+        return results
+
+    def _prepare_bulk_order(self, user, product, sku, payment_processor):
+        """Prepare an order consisting of a single free product for a user."""
+        if product is None:
+            raise errors.ProductNotFoundError(errors.PRODUCT_NOT_FOUND_DEVELOPER_MESSAGE.format(sku=sku))
+
+        basket = data.get_basket(user)
+        purchase_info = basket.strategy.fetch_for_product(product)
+
+        if not purchase_info.availability.is_available_to_buy:
+            raise errors.ProductUnavailableError(purchase_info.availability.message)
+
+        if purchase_info.price.excl_tax != self.FREE:
+            raise errors.ProductNotFreeError(errors.PRODUCT_NOT_FREE_DEVELOPER_MESSAGE.format(sku=sku))
+
+        return self._prepare_order(basket, {sku: product}, payment_processor)
 
 
 class FulfillOrderView(FulfillmentMixin, UpdateAPIView):
@@ -295,9 +611,77 @@ class FulfillOrderView(FulfillmentMixin, UpdateAPIView):
         logger.info('Retrying fulfillment of order [%s]...', order.number)
         order = self._fulfill_order(order)
 
+        if settings.FULFILLMENT_ASYNC:
+            # The order has been enqueued for fulfillment, and is returned with its current status.
+            serializer = self.get_serializer(order)
+            return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
         if order.can_retry_fulfillment:
             logger.warning('Fulfillment of order [%s] failed!', order.number)
             return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
         serializer = self.get_serializer(order)
         return Response(serializer.data)
+
+
+class BulkFulfillOrderView(FulfillmentMixin, GenericAPIView):
+    """Retry fulfillment of many orders which have failed fulfillment at once.
+
+    Intended for recovering from outages of the services on which fulfillment depends, this endpoint retries
+    fulfillment of every order in the "Fulfillment Error" state matching the given filters, all of which are
+    optional: order numbers, a range of placement dates, a SKU, and a line status. Only staff may use it.
+
+    Orders are retried in chunks of FULFILLMENT_RETRY_BATCH_SIZE, at most FULFILLMENT_RETRY_CONCURRENCY at once,
+    each within its own transaction. The result of each retry is streamed back as a line of newline-delimited
+    JSON as soon as the retry completes, followed by a summary of all retries.
+
+    Returns:
+        HTTP_200_OK with a stream of results
+        HTTP_400_BAD_REQUEST if the provided filters are invalid
+        HTTP_401_UNAUTHORIZED if an unauthenticated request is denied permission to access the endpoint
+        HTTP_403_FORBIDDEN if the authenticated user is not staff
+
+    Example:
+        >>> url = 'http://localhost:8002/api/v1/orders/fulfill/'
+        >>> data = {
+            'start_date': '2015-04-01T00:00:00Z',
+            'line_status': 'Fulfillment Network Error',
+        }
+        >>> response = requests.post(url, data=json.dumps(data), headers=headers, stream=True)
+        >>> for line in response.iter_lines():
+        ...     print line
+        {"number":"OSCR-100021","status":"Complete"}
+        {"number":"OSCR-100022","status":"Fulfillment Error"}
+        {"total":2,"complete":1,"failed":1}
+    """
+    permission_classes = (IsAuthenticated, IsAdminUser,)
+    renderer_classes = (renderers.NDJSONRenderer,)
+    serializer_class = serializers.BulkFulfillmentSerializer
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Each order is retried in its own transaction, so this view must opt
+        # out of the request-wide transaction enabled by ATOMIC_REQUESTS.
+        return transaction.non_atomic_requests(super(BulkFulfillOrderView, cls).as_view(**initkwargs))
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        orders = retry.get_failed_orders(**serializer.validated_data)
+        logger.info(u"User [%s] is retrying fulfillment of orders in bulk", request.user.username)
+
+        return StreamingHttpResponse(
+            self._retry(orders, request.accepted_renderer), content_type=request.accepted_renderer.media_type
+        )
+
+    def _retry(self, orders, renderer):
+        results = retry.retry_in_bulk(
+            orders,
+            self._fulfill_order_synchronously,
+            settings.FULFILLMENT_RETRY_CONCURRENCY,
+            settings.FULFILLMENT_RETRY_BATCH_SIZE
+        )
+        for result in results:
+            yield renderer.render_line(result)
@@ -0,0 +1,148 @@
+"""Process-local caches of rarely-changing data, kept coherent across processes via the shared cache."""
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import connection
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+# Cache keys of the versions bumped within each thread's open transaction.
+_pending = threading.local()
+
+
+def _get_pending_versions():
+    try:
+        return _pending.cache_keys
+    except AttributeError:
+        _pending.cache_keys = set()
+        return _pending.cache_keys
+
+
+class SharedVersion(object):
+    """A token, stored in the shared cache, identifying the current version of some data.
+
+    Processes holding a local copy of the data record the token they loaded it under. Any process
+    changing the data replaces the token; other processes notice the new token, and reload.
+    """
+    def __init__(self, cache_key):
+        self.cache_key = cache_key
+
+    def get(self):
+        """Return the current token."""
+        version = cache.get(self.cache_key)
+        if version is None:
+            # The token is missing (e.g., the cache has been flushed). Establish a new one,
+            # deferring to any token established concurrently by another process.
+            cache.add(self.cache_key, uuid.uuid4().hex, None)
+            version = cache.get(self.cache_key)
+        return version
+
+    def bump(self):
+        """Replace the token, signalling that the data has changed.
+
+        A change made within a transaction is invisible to other processes until the transaction is committed,
+        yet a process noticing the new token may reload the data before then, and keep its stale copy under the
+        new token. The token is therefore replaced again once the current request has finished, by which time
+        its transaction has been committed or rolled back.
+        """
+        cache.set(self.cache_key, uuid.uuid4().hex, None)
+        if connection.in_atomic_block:
+            _get_pending_versions().add(self.cache_key)
+
+    def is_pending(self):
+        """Return True if the data has been changed within the current thread's open transaction."""
+        return self.cache_key in _get_pending_versions()
+
+
+@receiver(request_finished, dispatch_uid='caching.bump_pending_versions')
+def bump_pending_versions(sender=None, **kwargs):  # pylint: disable=unused-argument
+    """Replace the tokens of the data changed within the finished request's transaction.
+
+    Code changing data outside a request (e.g., a management command) should call this once its
+    transaction has been committed.
+    """
+    pending = _get_pending_versions()
+    while pending:
+        cache.set(pending.pop(), uuid.uuid4().hex, None)
+
+
+class ReferenceCache(object):
+    """Process-local cache of the rows of an enum-like model (e.g., ShippingEventType), keyed by a unique field.
+
+    Rows are fetched the first time they're requested, and served from memory thereafter. Saving or
+    deleting a row of the model empties the cache in every process. Rows read after the model has been
+    changed within the open transaction are not cached, since that transaction may yet be rolled back.
+    Cached instances are shared between requests and threads, and must be treated as read-only.
+
+    Example:
+        >>> shipping_event_types = ReferenceCache(ShippingEventType, 'name')
+        >>> shipping_event_types.get('Shipped')
+        <ShippingEventType: Shipped>
+    """
+    def __init__(self, model, field):
+        self.model = model
+        self.field = field
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._version = None
+        self._checked_at = 0
+        self._shared_version = SharedVersion(
+            'reference.{app_label}.{model_name}.version'.format(
+                app_label=model._meta.app_label, model_name=model._meta.model_name
+            )
+        )
+
+        post_save.connect(self._invalidate, sender=model)
+        post_delete.connect(self._invalidate, sender=model)
+
+    def get(self, value):
+        """Return the row whose field has the given value.
+
+        Raises:
+            DoesNotExist: If no such row exists.
+        """
+        rows = self._get_rows()
+        try:
+            return rows[value]
+        except KeyError:
+            row = self.model.objects.get(**{self.field: value})
+            if not self._shared_version.is_pending():
+                rows[value] = row
+            return row
+
+    def get_or_create(self, value):
+        """Return the row whose field has the given value, creating it if necessary.
+
+        Returns:
+            tuple: The row, and a boolean indicating whether it was created.
+        """
+        try:
+            return self.get(value), False
+        except self.model.DoesNotExist:
+            return self.model.objects.get_or_create(**{self.field: value})
+
+    def invalidate(self):
+        """Empty the cache in this and all other processes."""
+        with self._lock:
+            self._rows = {}
+        self._shared_version.bump()
+
+    def _invalidate(self, sender, **kwargs):  # pylint: disable=unused-argument
+        self.invalidate()
+
+    def _get_rows(self):
+        if time.time() - self._checked_at < settings.REFERENCE_DATA_VERSION_CHECK_INTERVAL:
+            return self._rows
+
+        version = self._shared_version.get()
+        with self._lock:
+            if self._version != version:
+                self._rows = {}
+                self._version = version
+            self._checked_at = time.time()
+            return self._rows
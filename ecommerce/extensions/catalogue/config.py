@@ -1,5 +1,35 @@
+from django.db.models.signals import post_delete, post_save, pre_save
 from oscar.apps.catalogue import config
+from oscar.core.loading import get_model
 
 
 class CatalogueConfig(config.CatalogueConfig):
     name = 'ecommerce.extensions.catalogue'
+
+    def ready(self):
+        super(CatalogueConfig, self).ready()
+
+        from ecommerce.extensions.catalogue.snapshot import (
+            invalidate_catalog, invalidate_catalog_for_stockrecord, record_stockrecord_sku_change
+        )
+
+        # Changes to any of these models alter the contents of the catalog snapshot.
+        models = [
+            get_model('catalogue', 'Product'),
+            get_model('catalogue', 'ProductClass'),
+            get_model('catalogue', 'ProductAttribute'),
+            get_model('catalogue', 'ProductAttributeValue'),
+        ]
+        for model in models:
+            post_save.connect(invalidate_catalog, sender=model, dispatch_uid='catalogue.snapshot.save')
+            post_delete.connect(invalidate_catalog, sender=model, dispatch_uid='catalogue.snapshot.delete')
+
+        # Stock records are saved as orders are placed; only changes to their SKUs alter the snapshot.
+        StockRecord = get_model('partner', 'StockRecord')  # pylint: disable=invalid-name
+        pre_save.connect(
+            record_stockrecord_sku_change, sender=StockRecord, dispatch_uid='catalogue.snapshot.pre_save'
+        )
+        post_save.connect(
+            invalidate_catalog_for_stockrecord, sender=StockRecord, dispatch_uid='catalogue.snapshot.save'
+        )
+        post_delete.connect(invalidate_catalog, sender=StockRecord, dispatch_uid='catalogue.snapshot.delete')
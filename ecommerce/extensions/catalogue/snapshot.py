@@ -0,0 +1,134 @@
+"""In-memory snapshot of the catalog, keyed by SKU.
+
+Resolving a SKU to a product, and reading that product's class and attributes, are on the hot path
+of order creation and fulfillment. The snapshot loads every stock record's product, along with its
+product class and attribute values, with a fixed number of queries, after which these reads are
+dictionary lookups. Stock records themselves, whose stock levels change as orders are placed, are
+not held by the snapshot.
+
+Each process holds its own copy of the snapshot. Saving or deleting a catalog object (other than
+saving a stock record without changing the product its SKU maps to) clears the
+local copy and replaces a version token stored in the shared cache. Other processes compare their
+copy's version against the token, at most once per CATALOGUE_SNAPSHOT_VERSION_CHECK_INTERVAL seconds,
+and reload when it has changed; all processes therefore converge on the current catalog.
+
+Products held by the snapshot are shared between requests and threads, and must be treated as read-only.
+"""
+import logging
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.caching import SharedVersion
+
+
+logger = logging.getLogger(__name__)
+
+ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
+StockRecord = get_model('partner', 'StockRecord')
+
+CatalogEntry = namedtuple('CatalogEntry', ['product', 'product_class', 'attributes'])
+
+
+class CatalogSnapshot(object):
+    """Snapshot of the catalog, mapping SKUs to CatalogEntry tuples."""
+    def __init__(self):
+        self.shared_version = SharedVersion('catalogue.snapshot.version')
+        self._lock = threading.Lock()
+        self._entries = None
+        self._version = None
+        self._checked_at = 0
+
+    def get(self, sku):
+        """Return the CatalogEntry for the given SKU, or None if the catalog contains no such SKU."""
+        return self._get_entries().get(sku)
+
+    def get_line_entry(self, line):
+        """Return the CatalogEntry for the product purchased by an order line, or None if the snapshot lacks it."""
+        # Lines record the SKU of the product purchased. The product may since have been given another SKU.
+        entry = self.get(line.partner_sku)
+        if entry and entry.product.id == line.product_id:
+            return entry
+        return None
+
+    def load(self):
+        """Load the snapshot, replacing any existing copy."""
+        version = self.shared_version.get()
+        with self._lock:
+            self._entries = self._build()
+            self._version = version
+            self._checked_at = time.time()
+
+    def invalidate(self):
+        """Discard this process' copy of the snapshot, and signal other processes to discard theirs."""
+        with self._lock:
+            self._entries = None
+        self.shared_version.bump()
+
+    def _get_entries(self):
+        entries = self._entries
+        if entries is not None and time.time() - self._checked_at < settings.CATALOGUE_SNAPSHOT_VERSION_CHECK_INTERVAL:
+            return entries
+
+        # The version is read before the catalog. If the catalog changes while it's being
+        # loaded, the next check will find a newer version and load the snapshot again.
+        version = self.shared_version.get()
+        with self._lock:
+            if self._entries is None or self._version != version:
+                self._entries = self._build()
+                self._version = version
+            self._checked_at = time.time()
+            return self._entries
+
+    def _build(self):
+        attributes = {}
+        for value in ProductAttributeValue.objects.select_related('attribute'):
+            attributes.setdefault(value.product_id, {})[value.attribute.name] = value.value
+
+        stockrecords = StockRecord.objects.select_related('product__product_class', 'product__parent__product_class')
+        entries = {}
+        for stockrecord in stockrecords:
+            product = stockrecord.product
+            entries[stockrecord.partner_sku] = CatalogEntry(
+                product=product,
+                product_class=product.get_product_class(),
+                attributes=attributes.get(product.id, {}),
+            )
+
+        logger.info("Loaded catalog snapshot containing [%d] SKUs", len(entries))
+        return entries
+
+
+catalog = CatalogSnapshot()
+
+
+def invalidate_catalog(sender, **kwargs):  # pylint: disable=unused-argument
+    """Signal receiver invalidating the catalog snapshot when a catalog object changes."""
+    catalog.invalidate()
+
+
+def record_stockrecord_sku_change(sender, instance, update_fields=None, **kwargs):  # pylint: disable=unused-argument
+    """Signal receiver noting, before a stock record is saved, whether the save changes the product its SKU maps to.
+
+    Stock records are saved whenever stock is allocated, or a price edited, neither of which affects
+    the snapshot. The SKU and product being saved are compared with those stored in the database, so
+    the outcome doesn't depend on whether this process has loaded the snapshot.
+    """
+    if instance.pk is None:
+        changes_catalog = True
+    elif update_fields is not None and not set(update_fields) & {'partner_sku', 'product', 'product_id'}:
+        changes_catalog = False
+    else:
+        stored = sender.objects.filter(pk=instance.pk).values_list('partner_sku', 'product_id').first()
+        changes_catalog = stored != (instance.partner_sku, instance.product_id)
+
+    instance._changes_catalog = changes_catalog  # pylint: disable=protected-access
+
+
+def invalidate_catalog_for_stockrecord(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Signal receiver invalidating the catalog snapshot when a saved stock record's SKU or product has changed."""
+    if getattr(instance, '_changes_catalog', True):
+        catalog.invalidate()
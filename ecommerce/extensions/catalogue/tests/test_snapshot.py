@@ -0,0 +1,83 @@
+"""Tests of the catalog snapshot."""
+from django.core.cache import cache
+from django.test import TestCase
+from oscar.test import factories
+
+from ecommerce.extensions.catalogue.snapshot import catalog
+
+
+class CatalogSnapshotTests(TestCase):
+    def setUp(self):
+        super(CatalogSnapshotTests, self).setUp()
+        self.product_class = factories.ProductClassFactory(name='Seat', requires_shipping=False, track_stock=False)
+        self.course = factories.ProductFactory(
+            structure='parent', title='EdX DemoX Course', product_class=self.product_class, stockrecords=None
+        )
+        self.seat = factories.ProductFactory(
+            structure='child', title='Seat in EdX DemoX Course', product_class=None, parent=self.course
+        )
+        self.sku = self.seat.stockrecords.get().partner_sku
+
+        course_key = factories.ProductAttributeFactory(name='course_key', product_class=self.product_class, type='text')
+        factories.ProductAttributeValueFactory(attribute=course_key, product=self.seat, value_text='edX/DemoX/Demo')
+
+    def test_get(self):
+        """ The snapshot should hold each SKU's product, product class and attributes. """
+        catalog.load()
+
+        with self.assertNumQueries(0):
+            entry = catalog.get(self.sku)
+
+        self.assertEqual(entry.product, self.seat)
+        self.assertEqual(entry.product_class, self.product_class)
+        self.assertEqual(entry.attributes, {'course_key': 'edX/DemoX/Demo'})
+        self.assertIsNone(catalog.get('not-a-sku'))
+
+    def test_invalidation(self):
+        """ Saving a catalog object should cause the snapshot to be reloaded. """
+        catalog.load()
+
+        stockrecord = self.seat.stockrecords.get()
+        stockrecord.partner_sku = 'new-sku'
+        stockrecord.save()
+
+        self.assertIsNone(catalog.get(self.sku))
+        self.assertEqual(catalog.get('new-sku').product, self.seat)
+
+    def test_stock_changes(self):
+        """ Saving a stock record without changing its SKU should not cause the snapshot to be reloaded. """
+        catalog.load()
+        version = catalog.shared_version.get()
+
+        stockrecord = self.seat.stockrecords.get()
+        stockrecord.num_allocated = 1
+        stockrecord.save()
+
+        self.assertEqual(catalog.shared_version.get(), version)
+        with self.assertNumQueries(0):
+            self.assertEqual(catalog.get(self.sku).product, self.seat)
+
+    def test_stock_changes_without_snapshot(self):
+        """ Saving a stock record without changing its SKU should not invalidate snapshots held by other processes,
+        even if this process hasn't loaded the snapshot. """
+        catalog.invalidate()
+        version = catalog.shared_version.get()
+
+        stockrecord = self.seat.stockrecords.get()
+        stockrecord.num_allocated = 1
+        stockrecord.save()
+        stockrecord.save(update_fields=['num_allocated'])
+
+        self.assertEqual(catalog.shared_version.get(), version)
+
+    def test_invalidation_by_other_process(self):
+        """ A change to the version token in the shared cache should cause the snapshot to be reloaded. """
+        with self.settings(CATALOGUE_SNAPSHOT_VERSION_CHECK_INTERVAL=0):
+            catalog.load()
+            with self.assertNumQueries(0):
+                catalog.get(self.sku)
+
+            # Simulate another process changing the catalog.
+            cache.set(catalog.shared_version.cache_key, 'changed-elsewhere')
+            with self.assertNumQueries(2):
+                catalog.get(self.sku)
@@ -7,10 +7,9 @@ can successfully fulfill the product. Success can be reported back based on each
 """
 import logging
 
-from django.conf import settings
-from django.utils import importlib
-
-from ecommerce.extensions.fulfillment import errors
+from ecommerce.extensions.fulfillment import errors, retry
+from ecommerce.extensions.fulfillment.context import FulfillmentContext
+from ecommerce.extensions.fulfillment.registry import registry
 from ecommerce.extensions.fulfillment.status import ORDER, LINE
 
 
@@ -20,10 +19,13 @@ logger = logging.getLogger(__name__)
 def fulfill_order(order, lines):
     """ Fulfills line items in an Order
 
-    Attempts to fulfill the products in the Order. Checks the mapping of fulfillment modules to product types, and
+    Attempts to fulfill the products in the Order. Checks the registry of fulfillment modules by product class, and
     will fulfill the order line items in the specified order. If a line item cannot be fulfilled, either because
     of an error, or no existing fulfillment logic, the Order is marked with "Fulfillment Error" and the status of
-    each line is marked according to its success or failure.
+    each line is marked according to its success or failure. Failed orders are scheduled for an automatic retry.
+
+    When fulfillment of an order which has failed fulfillment is retried, only the lines which failed are fulfilled
+    again. The status of the Order reflects both these lines, and those fulfilled by earlier attempts.
 
     Args:
         order (Order): The Order associated with this line item. The status of the Order may be altered based on
@@ -40,41 +42,52 @@ def fulfill_order(order, lines):
         error_msg = "Order has a current status of [{status}] which cannot be fulfilled.".format(status=order.status)
         logger.error(error_msg)
         raise errors.IncorrectOrderStatusError(error_msg)
-    modules = getattr(settings, 'FULFILLMENT_MODULES', {})
 
-    # Construct a dict of lines by their product type.
-    line_items = list(lines.all())
+    # Lines are read once. Modules update the statuses of these same instances, from which the
+    # status of the Order is then determined.
+    all_lines = list(lines.all())
+    unsupported_statuses = {}
 
     try:
-        # Iterate over the Fulfillment Modules defined in our configuration and determine if they support
-        # any of the lines in the order. Fulfill line items in the order they are designated by the configuration.
-        # Remaining line items should be marked with a fulfillment error since we have no configuration that
-        # allows them to be fulfilled.
-        for cls_path in modules:
-            try:
-                module_path, _, name = cls_path.rpartition('.')
-                module = getattr(importlib.import_module(module_path), name)
-                supported_lines = module().get_supported_lines(order, line_items)
-                line_items = list(set(line_items) - set(supported_lines))
-                module().fulfill_product(order, supported_lines)
-            except (ImportError, ValueError, AttributeError):
-                logger.exception("Could not load module at [%s]", cls_path)
-
-        # Check to see if any line items in the order have not been accounted for by a FulfillmentModule
-        # Any product does not line up with a module, we have to mark a fulfillment error.
+        # Route each line to the Fulfillment Module supporting its product class. Lines are fulfilled by
+        # the modules in the order they are designated by the configuration. Lines no module supports
+        # should be marked with a fulfillment error since we have no configuration that allows them
+        # to be fulfilled.
+        line_items = all_lines
+        if order.status == ORDER.FULFILLMENT_ERROR:
+            line_items = [line for line in line_items if line.status in LINE.FULFILLMENT_ERRORS]
+            logger.info("Retrying fulfillment of [%d] failed lines of order [%s]", len(line_items), order.number)
+
+        context = FulfillmentContext(line_items)
+        lines_by_module = {}
+        unsupported_lines = []
         for line in line_items:
-            product_type = line.product.product_class.name
+            module = registry.get_module(order, line, context)
+            if module is None:
+                unsupported_lines.append(line)
+            else:
+                lines_by_module.setdefault(module, []).append(line)
+
+        for module in registry.modules:
+            if module in lines_by_module:
+                module.fulfill_product(order, lines_by_module[module], context=context)
+
+        # Any product that does not line up with a module is marked with a fulfillment error.
+        for line in unsupported_lines:
+            product_class = context.get_product_class(line)
+            product_type = product_class.name if product_class else None
             logger.error("Product Type [%s] in order does not have an associated Fulfillment Module", product_type)
-            line.set_status(LINE.FULFILLMENT_CONFIGURATION_ERROR)
+            unsupported_statuses[line] = LINE.FULFILLMENT_CONFIGURATION_ERROR
+    except Exception:  # pylint: disable=broad-except
+        # The order is still given a status, below, and returned; the error must not go unnoticed.
+        logger.exception("Unexpected error while fulfilling order [%s]", order.number)
     finally:
         # Check if all lines are successful, or there were errors, and set the status of the Order.
-        order_status = ORDER.COMPLETE
-        for line in lines.all():
-            if line.status != LINE.COMPLETE:
-                logger.error('There was an error while fulfilling order [%s]', order.number)
-                order_status = ORDER.FULFILLMENT_ERROR
-                break
+        order_status = order.set_line_statuses(all_lines, unsupported_statuses)
+        if order_status != ORDER.COMPLETE:
+            logger.error('There was an error while fulfilling order [%s]', order.number)
         order.set_status(order_status)
+        retry.record_attempt(order)
         logger.info("Finished fulfilling order [%s] with status [%s]", order.number, order.status)
         return order  # pylint: disable=lost-exception
 
@@ -0,0 +1,134 @@
+""" Bounded concurrent execution of blocking calls (e.g., HTTP requests) made during fulfillment.
+
+Calls are run on a small pool of threads. When the standard library has been monkey-patched by gevent
+(as under gunicorn's gevent workers), these threads are greenlets, and the calls proceed concurrently
+as they wait on the network.
+
+Functions run concurrently must not access the database within the transaction of the calling thread:
+Django connections are per-thread, and changes made on them would escape that transaction. Callers
+should gather the data required up front, and apply results (e.g., line status updates) on the calling
+thread. Functions which do access the database (e.g., retries of fulfillment, each in a transaction of
+its own) must be passed with on_worker_exit=django.db.connection.close, since Django doesn't close the
+connections opened by threads it didn't start.
+"""
+import sys
+import threading
+
+from django.utils.six.moves import queue
+
+
+def map_concurrently(func, items, max_workers, on_worker_exit=None):
+    """ Apply a function to each of the given items, running at most max_workers calls at once.
+
+    Args:
+        func (callable): The function to apply.
+        items (list): The items to apply the function to.
+        max_workers (int): Maximum number of calls to run at once.
+        on_worker_exit (callable): Function called, with no arguments, on each worker thread once it has no
+            more calls to run. Not called when the calls are run on the calling thread.
+
+    Returns:
+        list: (result, exc_info) tuples, in the order of the items. If a call raised an exception,
+            its result is None and exc_info describes the exception; otherwise, exc_info is None.
+    """
+    items = list(items)
+    results = [None] * len(items)
+
+    # Run the function on the calling thread when there is nothing to gain from concurrency.
+    if len(items) <= 1 or max_workers <= 1:
+        for index, item in enumerate(items):
+            results[index] = _call(func, item)
+        return results
+
+    pending = queue.Queue()
+    for index, item in enumerate(items):
+        pending.put((index, item))
+
+    def work():
+        while True:
+            try:
+                index, item = pending.get_nowait()
+            except queue.Empty:
+                return
+            results[index] = _call(func, item)
+
+    workers = [_start_worker(work, on_worker_exit) for _ in xrange(min(max_workers, len(items)))]
+    for worker in workers:
+        worker.join()
+
+    return results
+
+
+def imap_concurrently(func, items, max_workers, on_worker_exit=None):
+    """ Apply a function to each of the given items, running at most max_workers calls at once, and yield
+    the outcome of each call as soon as it has completed.
+
+    Args:
+        func (callable): The function to apply.
+        items (list): The items to apply the function to.
+        max_workers (int): Maximum number of calls to run at once.
+        on_worker_exit (callable): Function called, with no arguments, on each worker thread once it has no
+            more calls to run. Not called when the calls are run on the calling thread.
+
+    Yields:
+        tuple: (item, result, exc_info) for each item, in the order the calls complete. If a call raised
+            an exception, its result is None and exc_info describes the exception; otherwise, exc_info is None.
+    """
+    items = list(items)
+
+    # Run the function on the calling thread when there is nothing to gain from concurrency.
+    if len(items) <= 1 or max_workers <= 1:
+        for item in items:
+            result, exc_info = _call(func, item)
+            yield item, result, exc_info
+        return
+
+    pending = queue.Queue()
+    for item in items:
+        pending.put(item)
+    completed = queue.Queue()
+
+    def work():
+        while True:
+            try:
+                item = pending.get_nowait()
+            except queue.Empty:
+                return
+            result, exc_info = _call(func, item)
+            completed.put((item, result, exc_info))
+
+    workers = [_start_worker(work, on_worker_exit) for _ in xrange(min(max_workers, len(items)))]
+
+    try:
+        for _ in xrange(len(items)):
+            yield completed.get()
+    finally:
+        # Should the caller stop early (e.g., because a client has disconnected), calls not yet
+        # started are abandoned, while those in progress are allowed to finish.
+        while True:
+            try:
+                pending.get_nowait()
+            except queue.Empty:
+                break
+        for worker in workers:
+            worker.join()
+
+
+def _start_worker(work, on_exit):
+    def run():
+        try:
+            work()
+        finally:
+            if on_exit is not None:
+                on_exit()
+
+    worker = threading.Thread(target=run)
+    worker.start()
+    return worker
+
+
+def _call(func, item):
+    try:
+        return func(item), None
+    except Exception:  # pylint: disable=broad-except
+        return None, sys.exc_info()
@@ -0,0 +1,69 @@
+"""Catalog data needed to fulfill the lines of an order, loaded up front."""
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.catalogue.snapshot import catalog
+
+
+Product = get_model('catalogue', 'Product')
+ProductAttributeValue = get_model('catalogue', 'ProductAttributeValue')
+
+
+class FulfillmentContext(object):
+    """ The product, product class and attribute values of each line being fulfilled.
+
+    Lines are described by the catalog snapshot where possible. The products of any remaining lines (e.g., those
+    whose SKU has since changed) are loaded from the database with a constant number of queries, regardless of
+    the number of lines. Fulfillment modules should read product data through the context, rather than from the
+    lines themselves, which would query the database for each line.
+
+    Example:
+        >>> context = FulfillmentContext(order.lines.all())
+        >>> context.get_attributes(line)['course_key']
+        u'edX/DemoX/Demo_Course'
+
+    """
+    def __init__(self, lines):
+        self._entries = {}
+        self._load(lines)
+
+    def get_product(self, line):
+        """ Return the product purchased by the line. """
+        return self._get_entry(line)[0]
+
+    def get_product_class(self, line):
+        """ Return the product class of the product purchased by the line. """
+        return self._get_entry(line)[1]
+
+    def get_attributes(self, line):
+        """ Return the attribute values, keyed by attribute name, of the product purchased by the line. """
+        return self._get_entry(line)[2]
+
+    def _get_entry(self, line):
+        try:
+            return self._entries[line.id]
+        except KeyError:
+            # The line wasn't among those the context was created for.
+            self._load([line])
+            return self._entries[line.id]
+
+    def _load(self, lines):
+        missing_lines = []
+        for line in lines:
+            entry = catalog.get_line_entry(line)
+            if entry:
+                self._entries[line.id] = (entry.product, entry.product_class, entry.attributes)
+            else:
+                missing_lines.append(line)
+
+        if not missing_lines:
+            return
+
+        product_ids = set(line.product_id for line in missing_lines)
+        products = Product.objects.select_related('product_class', 'parent__product_class').in_bulk(product_ids)
+        attributes = {}
+        for value in ProductAttributeValue.objects.filter(product_id__in=product_ids).select_related('attribute'):
+            attributes.setdefault(value.product_id, {})[value.attribute.name] = value.value
+
+        for line in missing_lines:
+            product = products[line.product_id]
+            self._entries[line.id] = (product, product.get_product_class(), attributes.get(product.id, {}))
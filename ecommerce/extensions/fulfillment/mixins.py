@@ -1,8 +1,9 @@
 """ Mixins to support views that fulfill orders. """
-
+from django.conf import settings
 from oscar.core.loading import get_class
 
 from ecommerce.extensions.api import data
+from ecommerce.extensions.fulfillment import queue
 
 
 EventHandler = get_class('order.processing', 'EventHandler')
@@ -13,7 +14,19 @@ class FulfillmentMixin(object):
     SHIPPING_EVENT_NAME = 'Shipped'
 
     def _fulfill_order(self, order):
-        """Attempt fulfillment for an order."""
+        """Attempt fulfillment for an order.
+
+        If FULFILLMENT_ASYNC is enabled, the order is enqueued for fulfillment by a worker, and
+        returned unchanged. Otherwise, the order is fulfilled immediately.
+        """
+        if settings.FULFILLMENT_ASYNC:
+            queue.enqueue(order)
+            return order
+
+        return self._fulfill_order_synchronously(order)
+
+    def _fulfill_order_synchronously(self, order):
+        """Fulfill an order, recording a shipping event for the fulfilled lines."""
         order_lines = order.lines.all()
         line_quantities = [line.quantity for line in order_lines]
 
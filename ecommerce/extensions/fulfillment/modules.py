@@ -7,13 +7,16 @@ in an Order.
 import json
 import logging
 
-import requests
 from requests.exceptions import ConnectionError, Timeout
 from django.conf import settings
+from django.utils import six
 from rest_framework import status
-from oscar.apps.catalogue.models import ProductAttributeValue
 
+from ecommerce.extensions.fulfillment import concurrency
+from ecommerce.extensions.fulfillment.context import FulfillmentContext
 from ecommerce.extensions.fulfillment.status import LINE
+from ecommerce.outbound.breaker import get_breaker
+from ecommerce.outbound.client import client
 
 
 logger = logging.getLogger(__name__)
@@ -26,7 +29,7 @@ class FulfillmentModule(object):
 
     """
 
-    def get_supported_lines(self, order, lines):
+    def get_supported_lines(self, order, lines, context=None):
         """ Return a list of supported lines in the order
 
         Each Fulfillment Module is capable of fulfillment certain products. This function allows a preliminary
@@ -38,6 +41,7 @@ class FulfillmentModule(object):
         Args:
             order (Order): The Order associated with the lines to be fulfilled
             lines (List of Lines): Order Lines, associated with purchased products in an Order.
+            context (FulfillmentContext): Product data for the lines. Created from the lines if not provided.
 
         Returns:
             A supported list of lines, unmodified.
@@ -45,7 +49,7 @@ class FulfillmentModule(object):
         """
         raise NotImplementedError("Line support method not implemented!")
 
-    def fulfill_product(self, order, lines):
+    def fulfill_product(self, order, lines, context=None):
         """ Fulfills the specified lines in the order.
 
         Iterates over the given lines and fulfills the associated products. Will report success if the product can
@@ -55,6 +59,7 @@ class FulfillmentModule(object):
         Args:
             order (Order): The Order associated with the lines to be fulfilled
             lines (List of Lines): Order Lines, associated with purchased products in an Order.
+            context (FulfillmentContext): Product data for the lines. Created from the lines if not provided.
 
         Returns:
             The original set of lines, with new statuses set based on the success or failure of fulfillment.
@@ -86,8 +91,20 @@ class EnrollmentFulfillmentModule(FulfillmentModule):
 
     """
     REQUEST_TIMEOUT = 5
+    BULK_REQUEST_TIMEOUT = 30
 
-    def get_supported_lines(self, order, lines):
+    # Shared by all enrollment requests, so that once the Enrollment API is found to be degraded, lines are
+    # marked with a network error immediately rather than after waiting out the request timeout.
+    breaker = get_breaker('enrollment')
+
+    # Statuses with which an Enrollment API lacking bulk enrollment responds to bulk enrollment requests.
+    BULK_UNSUPPORTED_STATUSES = (
+        status.HTTP_404_NOT_FOUND,
+        status.HTTP_405_METHOD_NOT_ALLOWED,
+        status.HTTP_501_NOT_IMPLEMENTED,
+    )
+
+    def get_supported_lines(self, order, lines, context=None):
         """ Return a list of lines that can be fulfilled through enrollment.
 
         Check each line in the order to see if it is a "Seat". Seats are fulfilled by enrolling students
@@ -97,29 +114,36 @@ class EnrollmentFulfillmentModule(FulfillmentModule):
         Args:
             order (Order): The Order associated with the lines to be fulfilled
             lines (List of Lines): Order Lines, associated with purchased products in an Order.
+            context (FulfillmentContext): Product data for the lines. Created from the lines if not provided.
 
         Returns:
             A supported list of unmodified lines associated with "Seat" products.
 
         """
+        context = context or FulfillmentContext(lines)
         supported_lines = []
         for line in lines:
-            if line.product.get_product_class().name == 'Seat':
+            if context.get_product_class(line).name == 'Seat':
                 supported_lines.append(line)
         return supported_lines
 
-    def fulfill_product(self, order, lines):
+    def fulfill_product(self, order, lines, context=None):
         """ Fulfills the purchase of a 'seat' by enrolling the associated student.
 
         Uses the order and the lines to determine which courses to enroll a student in, and with certain
         certificate types. May result in an error if the Enrollment API cannot be reached, or if there is
         additional business logic errors when trying to enroll the student.
 
+        If ENROLLMENT_API_BULK_URL is set, all lines are enrolled with a single bulk enrollment request.
+        Otherwise, or if the bulk endpoint is not supported, enrollment requests for the lines are made
+        concurrently, up to ENROLLMENT_FULFILLMENT_CONCURRENCY at a time.
+
         Args:
             order (Order): The Order associated with the lines to be fulfilled. The user associated with the order
                 is presumed to be the student to enroll in a course.
             lines (List of Lines): Order Lines, associated with purchased products in an Order. These should only
                 be "Seat" products.
+            context (FulfillmentContext): Product data for the lines. Created from the lines if not provided.
 
         Returns:
             The original set of lines, with new statuses set based on the success or failure of fulfillment.
@@ -133,17 +157,23 @@ class EnrollmentFulfillmentModule(FulfillmentModule):
             logger.error(
                 "ENROLLMENT_API_URL and EDX_API_KEY must be set to use the EnrollmentFulfillmentModule"
             )
-            for line in lines:
-                line.set_status(LINE.FULFILLMENT_CONFIGURATION_ERROR)
+            order.set_line_statuses(lines, {line: LINE.FULFILLMENT_CONFIGURATION_ERROR for line in lines})
+            return order, lines
 
+        # Everything needed to enroll the student is read from the database up front. Enrollment
+        # requests are then made, and line statuses set on this thread once they all finish.
+        context = context or FulfillmentContext(lines)
         student = order.user.username
+        statuses = {}
+        enrollments = []
         for line in lines:
+            attributes = context.get_attributes(line)
             try:
-                certificate_type = line.product.attribute_values.get(attribute__name="certificate_type").value
-                course_key = line.product.attribute_values.get(attribute__name="course_key").value
-            except ProductAttributeValue.DoesNotExist:
+                certificate_type = attributes["certificate_type"]
+                course_key = attributes["course_key"]
+            except KeyError:
                 logger.error("Supported Seat Product does not have required attributes, [certificate_type, course_key]")
-                line.set_status(LINE.FULFILLMENT_CONFIGURATION_ERROR)
+                statuses[line] = LINE.FULFILLMENT_CONFIGURATION_ERROR
                 continue
 
             data = {
@@ -153,44 +183,127 @@ class EnrollmentFulfillmentModule(FulfillmentModule):
                     'course_id': course_key
                 }
             }
-
-            headers = {
-                'Content-Type': 'application/json',
-                'X-Edx-Api-Key': api_key,
-            }
-
-            try:
-                response = requests.post(
-                    enrollment_api_url,
-                    data=json.dumps(data),
-                    headers=headers,
-                    timeout=self.REQUEST_TIMEOUT
-                )
-
-                if response.status_code == status.HTTP_200_OK:
+            enrollments.append((line, data))
+
+        headers = {
+            'Content-Type': 'application/json',
+            'X-Edx-Api-Key': api_key,
+        }
+
+        outcomes = None
+        enrollment_data = [data for _, data in enrollments]
+        enrollment_api_bulk_url = getattr(settings, 'ENROLLMENT_API_BULK_URL', None)
+        if enrollment_api_bulk_url and len(enrollments) > 1:
+            outcomes = self._enroll_in_bulk(enrollment_api_bulk_url, headers, enrollment_data)
+        if outcomes is None:
+            outcomes = self._enroll_individually(enrollment_api_url, headers, enrollment_data)
+
+        for (line, _), (status_code, reason, exception) in zip(enrollments, outcomes):
+            if exception is None:
+                if status_code == status.HTTP_200_OK:
                     logger.info("Success fulfilling line [%d] of order [%s].", line.id, order.number)
-                    line.set_status(LINE.COMPLETE)
+                    statuses[line] = LINE.COMPLETE
                 else:
-                    try:
-                        data = response.json()
-                        reason = data.get('message')
-                    except Exception:   # pylint: disable=broad-except
-                        reason = '(No detail provided.)'
-
                     logger.error(
                         "Unable to fulfill line [%d] of order [%s] due to a server-side error: %s", line.id,
                         order.number, reason
                     )
-                    line.set_status(LINE.FULFILLMENT_SERVER_ERROR)
-            except ConnectionError:
+                    statuses[line] = LINE.FULFILLMENT_SERVER_ERROR
+            elif issubclass(exception, ConnectionError):
                 logger.error(
                     "Unable to fulfill line [%d] of order [%s] due to a network problem", line.id, order.number
                 )
-                line.set_status(LINE.FULFILLMENT_NETWORK_ERROR)
-            except Timeout:
+                statuses[line] = LINE.FULFILLMENT_NETWORK_ERROR
+            elif issubclass(exception, Timeout):
                 logger.error(
                     "Unable to fulfill line [%d] of order [%s] due to a request time out", line.id, order.number
                 )
-                line.set_status(LINE.FULFILLMENT_TIMEOUT_ERROR)
+                statuses[line] = LINE.FULFILLMENT_TIMEOUT_ERROR
+
+        # Line statuses are applied together, once every enrollment has finished.
+        order.set_line_statuses(lines, statuses)
         logger.info("Finished fulfilling 'Seat' product types for order [%s]", order.number)
         return order, lines
+
+    def _enroll_individually(self, url, headers, enrollments):
+        """ Make an enrollment request for each enrollment, concurrently.
+
+        Returns:
+            A list of (status_code, reason, exception) outcomes, one per enrollment. Exception is the type of
+            the network error or time out preventing the enrollment, if any; otherwise, status_code and reason
+            describe the Enrollment API's response.
+
+        """
+        def enroll(data):
+            return client.post(
+                url,
+                endpoint='enrollment',
+                breaker=self.breaker,
+                data=json.dumps(data),
+                headers=headers,
+                timeout=self.REQUEST_TIMEOUT
+            )
+
+        outcomes = []
+        for response, exc_info in concurrency.map_concurrently(
+                enroll, enrollments, settings.ENROLLMENT_FULFILLMENT_CONCURRENCY
+        ):
+            if exc_info is None:
+                reason = None if response.status_code == status.HTTP_200_OK else self._get_reason(response)
+                outcomes.append((response.status_code, reason, None))
+            elif issubclass(exc_info[0], (ConnectionError, Timeout)):
+                outcomes.append((None, None, exc_info[0]))
+            else:
+                six.reraise(*exc_info)
+        return outcomes
+
+    def _enroll_in_bulk(self, url, headers, enrollments):
+        """ Make all enrollments with a single bulk enrollment request.
+
+        The bulk endpoint accepts a list of enrollments, and responds with a list of results in the same order.
+        Each result carries the status with which the Enrollment API would have responded to a request for the
+        corresponding enrollment alone, and optionally a message, e.g. [{"status": 200}, {"status": 400,
+        "message": "..."}].
+
+        Returns:
+            A list of (status_code, reason, exception) outcomes, one per enrollment, as returned by
+            _enroll_individually; or None if the Enrollment API doesn't support bulk enrollment.
+
+        """
+        try:
+            response = client.post(
+                url,
+                endpoint='bulk_enrollment',
+                breaker=self.breaker,
+                expected_statuses=self.BULK_UNSUPPORTED_STATUSES,
+                data=json.dumps(enrollments),
+                headers=headers,
+                timeout=self.BULK_REQUEST_TIMEOUT
+            )
+        except (ConnectionError, Timeout) as exc:
+            return [(None, None, type(exc))] * len(enrollments)
+
+        if response.status_code in self.BULK_UNSUPPORTED_STATUSES:
+            logger.warning(
+                "Bulk enrollment is not supported by [%s]. Falling back to individual enrollment requests.", url
+            )
+            return None
+
+        if response.status_code != status.HTTP_200_OK:
+            return [(response.status_code, self._get_reason(response), None)] * len(enrollments)
+
+        try:
+            results = response.json()
+            if not isinstance(results, list) or len(results) != len(enrollments):
+                raise ValueError
+            return [(result['status'], result.get('message'), None) for result in results]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            logger.error("Received malformed bulk enrollment response from [%s].", url)
+            return [(response.status_code, '(Malformed bulk enrollment response.)', None)] * len(enrollments)
+
+    def _get_reason(self, response):
+        """ Return the message explaining an Enrollment API response. """
+        try:
+            return response.json().get('message')
+        except Exception:   # pylint: disable=broad-except
+            return '(No detail provided.)'
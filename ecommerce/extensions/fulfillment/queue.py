@@ -0,0 +1,113 @@
+""" Database-backed queue of orders awaiting asynchronous fulfillment.
+
+Orders are enqueued by creating a FulfillmentJob. Workers (see the fulfill_orders management command)
+claim jobs one at a time, using a row lock to ensure that each job is claimed by a single worker, and
+fulfill the associated orders outside of the claiming transaction. While a job runs, its worker renews
+its lease (see heartbeat), so that a long fulfillment is not claimed by another worker.
+"""
+import datetime
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from oscar.core.loading import get_model
+
+
+logger = logging.getLogger(__name__)
+
+FulfillmentJob = get_model('order', 'FulfillmentJob')
+Order = get_model('order', 'Order')
+
+
+def enqueue(order):
+    """ Enqueue an order for fulfillment, unless it is already awaiting fulfillment.
+
+    Args:
+        order (Order): The order to fulfill.
+
+    Returns:
+        FulfillmentJob: The job responsible for fulfilling the order.
+    """
+    with transaction.atomic():
+        # The order is locked, so that concurrent calls (e.g., duplicate payment callbacks) can't
+        # both find no job awaiting fulfillment, and both create one.
+        Order.objects.select_for_update().get(pk=order.pk)
+
+        job = order.fulfillment_jobs.filter(status__in=(FulfillmentJob.PENDING, FulfillmentJob.RUNNING)).first()
+        if job is None:
+            job = FulfillmentJob.objects.create(order=order)
+            logger.info("Enqueued fulfillment of order [%s] as job [%d]", order.number, job.id)
+
+    return job
+
+
+def claim():
+    """ Claim the oldest available job.
+
+    Jobs are available if they are pending, or if the worker running them has held them for longer
+    than FULFILLMENT_JOB_LEASE seconds without finishing them.
+
+    Returns:
+        FulfillmentJob: The claimed job, or None if no job is available.
+    """
+    expired = timezone.now() - datetime.timedelta(seconds=settings.FULFILLMENT_JOB_LEASE)
+    available = Q(status=FulfillmentJob.PENDING) | Q(status=FulfillmentJob.RUNNING, date_updated__lt=expired)
+
+    with transaction.atomic():
+        job = FulfillmentJob.objects.select_for_update().filter(available).order_by('id').first()
+        if job is not None:
+            job.status = FulfillmentJob.RUNNING
+            job.attempts += 1
+            job.save()
+
+    return job
+
+
+def renew(job):
+    """ Renew the lease on a running job, preventing it from being claimed by another worker. """
+    FulfillmentJob.objects.filter(pk=job.pk, status=FulfillmentJob.RUNNING).update(date_updated=timezone.now())
+
+
+@contextmanager
+def heartbeat(job):
+    """ Renew the lease on a running job while the enclosed block runs.
+
+    The job's date_updated is touched every third of FULFILLMENT_JOB_LEASE, from a separate thread, on
+    that thread's own database connection, so that the renewal is committed immediately, rather than
+    with the transaction fulfilling the order.
+    """
+    stopped = threading.Event()
+    interval = settings.FULFILLMENT_JOB_LEASE / 3.0
+
+    def beat():
+        try:
+            while not stopped.wait(interval):
+                renew(job)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Failed to renew the lease on job [%d]", job.id)
+        finally:
+            # Connections opened by threads other than request threads are not closed by Django.
+            connection.close()
+
+    thread = threading.Thread(target=beat)
+    thread.daemon = True
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def finish(job, succeeded):
+    """ Record the outcome of a job.
+
+    A job succeeds if a fulfillment attempt was made, regardless of whether the order was fulfilled;
+    the outcome of the attempt is recorded in the status of the order and its lines.
+    """
+    job.status = FulfillmentJob.COMPLETE if succeeded else FulfillmentJob.FAILED
+    job.save()
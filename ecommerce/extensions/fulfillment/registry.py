@@ -0,0 +1,106 @@
+"""Registry of the fulfillment modules configured by FULFILLMENT_MODULES.
+
+Modules are resolved and instantiated once, when the registry is loaded, rather than for every order fulfilled.
+Each module supports a certain set of product classes; the registry records which module fulfills each product
+class the first time a line of that class is routed, after which routing a line is a dictionary lookup.
+"""
+import logging
+import threading
+from collections import namedtuple
+
+from django.conf import settings
+from django.utils import importlib
+
+from ecommerce.extensions.fulfillment.modules import FulfillmentModule
+
+
+logger = logging.getLogger(__name__)
+
+# The modules loaded from a given value of FULFILLMENT_MODULES, and the index of the product classes they support.
+Generation = namedtuple('Generation', ['source', 'modules', 'index'])
+
+
+class ModuleRegistry(object):
+    """Instances of the configured fulfillment modules, indexed by the product classes they support.
+
+    The modules are loaded again if FULFILLMENT_MODULES changes (e.g., when it's overridden by tests).
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = None
+
+    @property
+    def modules(self):
+        """The configured fulfillment modules, in the order in which they should fulfill lines."""
+        return self._get_generation().modules
+
+    def load(self):
+        """Resolve, validate and instantiate the configured fulfillment modules, replacing any already loaded."""
+        with self._lock:
+            self._generation = self._load_generation()
+
+    def reset(self):
+        """Discard the loaded modules. They're loaded again when next needed."""
+        with self._lock:
+            self._generation = None
+
+    def get_module(self, order, line, context):
+        """Return the module which fulfills the given line, or None if no module supports the line's product class.
+
+        Args:
+            order (Order): The Order associated with the line.
+            line (Line): The line to be fulfilled.
+            context (FulfillmentContext): Product data for the line.
+        """
+        generation = self._get_generation()
+        product_class = context.get_product_class(line)
+        key = product_class.id if product_class else None
+        try:
+            return generation.index[key]
+        except KeyError:
+            pass
+
+        # Modules support lines based on their product class alone, so the module supporting
+        # this line supports every line of the same product class.
+        supporting_module = None
+        for module in generation.modules:
+            if module.get_supported_lines(order, [line], context=context):
+                supporting_module = module
+                break
+
+        with self._lock:
+            # Should the modules have been loaded again meanwhile, this module belongs to the discarded generation.
+            if self._generation is generation:
+                generation.index[key] = supporting_module
+        return supporting_module
+
+    def _get_generation(self):
+        source = getattr(settings, 'FULFILLMENT_MODULES', [])
+        generation = self._generation
+        if generation is None or generation.source != source:
+            with self._lock:
+                if self._generation is None or self._generation.source != source:
+                    self._generation = self._load_generation()
+                generation = self._generation
+        return generation
+
+    def _load_generation(self):
+        source = list(getattr(settings, 'FULFILLMENT_MODULES', []))
+        modules = []
+        for cls_path in source:
+            try:
+                module_path, _, name = cls_path.rpartition('.')
+                module = getattr(importlib.import_module(module_path), name)
+            except (ImportError, ValueError, AttributeError):
+                logger.exception("Could not load module at [%s]", cls_path)
+                continue
+
+            if not isinstance(module, type) or not issubclass(module, FulfillmentModule):
+                logger.error("Fulfillment module at [%s] is not a subclass of FulfillmentModule", cls_path)
+                continue
+
+            modules.append(module())
+        return Generation(source=source, modules=modules, index={})
+
+
+registry = ModuleRegistry()
@@ -0,0 +1,201 @@
+""" Automatic retry of failed fulfillment, with exponential backoff.
+
+Each time an order fails fulfillment, its attempt count is incremented, and its next attempt scheduled
+FULFILLMENT_RETRY_BACKOFF * 2 ** (attempts - 1) seconds later, up to FULFILLMENT_RETRY_MAX_BACKOFF. Once
+FULFILLMENT_RETRY_MAX_ATTEMPTS attempts have failed, no further retry is scheduled; the order may still be
+retried manually. Orders due for a retry are retried by the retry_fulfillment management command.
+
+Operations may also retry failed orders in bulk, selected by filters or by number, via the bulk fulfillment
+endpoint or the bulk_retry_fulfillment management command.
+"""
+import datetime
+import logging
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.fulfillment import concurrency
+from ecommerce.extensions.fulfillment.status import ORDER
+
+
+logger = logging.getLogger(__name__)
+
+Line = get_model('order', 'Line')
+Order = get_model('order', 'Order')
+
+
+def record_attempt(order):
+    """ Record the outcome of an attempt to fulfill an order, scheduling a retry if it failed.
+
+    Args:
+        order (Order): The order, with the status resulting from the attempt.
+    """
+    # Most orders are fulfilled at the first attempt, and have no attempts or retry to record.
+    if order.status != ORDER.FULFILLMENT_ERROR and order.next_fulfillment_attempt is None:
+        return
+
+    next_attempt = None
+    if order.status == ORDER.FULFILLMENT_ERROR:
+        order.fulfillment_attempts += 1
+        if order.fulfillment_attempts < settings.FULFILLMENT_RETRY_MAX_ATTEMPTS:
+            next_attempt = timezone.now() + datetime.timedelta(seconds=get_backoff(order.fulfillment_attempts))
+            logger.info(
+                "Scheduled retry of fulfillment of order [%s] for [%s], after [%d] attempts",
+                order.number, next_attempt, order.fulfillment_attempts
+            )
+        else:
+            logger.error(
+                "Giving up on fulfillment of order [%s] after [%d] attempts", order.number, order.fulfillment_attempts
+            )
+
+    order.next_fulfillment_attempt = next_attempt
+    Order.objects.filter(pk=order.pk).update(
+        fulfillment_attempts=order.fulfillment_attempts, next_fulfillment_attempt=next_attempt
+    )
+
+
+def get_backoff(attempts):
+    """ Return the number of seconds to wait before retrying an order which has failed the given number of attempts. """
+    return min(settings.FULFILLMENT_RETRY_MAX_BACKOFF, settings.FULFILLMENT_RETRY_BACKOFF * 2 ** (attempts - 1))
+
+
+def claim_due(limit):
+    """ Claim up to limit orders due for a retry, longest overdue first.
+
+    Claimed orders have their next attempt postponed by FULFILLMENT_JOB_LEASE seconds, so that they're not
+    claimed by another scheduler while being retried. Should the retry not be recorded (e.g., because the
+    scheduler has died), the order is claimed again once the lease expires.
+
+    Returns:
+        list: The claimed orders.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        orders = list(
+            Order.objects.select_for_update().filter(
+                next_fulfillment_attempt__lte=now, status=ORDER.FULFILLMENT_ERROR
+            ).order_by('next_fulfillment_attempt')[:limit]
+        )
+        if orders:
+            lease = now + datetime.timedelta(seconds=settings.FULFILLMENT_JOB_LEASE)
+            Order.objects.filter(pk__in=[order.pk for order in orders]).update(next_fulfillment_attempt=lease)
+
+    return orders
+
+
+def retry_orders(orders, fulfill, max_workers):
+    """ Retry fulfillment of the given orders, at most max_workers at once.
+
+    Unlike calls made concurrently while fulfilling a single order, each retry runs in its own transaction.
+    When retried on more than one worker, each worker uses its own database connection, closed once the
+    worker has no more orders to retry. (Tests, run against an in-memory SQLite database which isn't
+    shared between connections, can only exercise this with max_workers=1.)
+
+    Args:
+        orders (list): The orders to retry.
+        fulfill (callable): Function fulfilling an order, returning the order with its new status.
+        max_workers (int): Maximum number of orders to retry at once.
+
+    Returns:
+        list: (order, exc_info) tuples, as returned by concurrency.map_concurrently.
+    """
+    return concurrency.map_concurrently(_get_retrier(fulfill), orders, max_workers, on_worker_exit=connection.close)
+
+
+def _get_retrier(fulfill):
+    """ Return a function retrying fulfillment of a single order, within its own transaction. """
+    def retry(order):
+        try:
+            with transaction.atomic():
+                # The order may have been retried elsewhere (e.g., by another scheduler) since it was selected.
+                order = Order.objects.select_for_update().get(pk=order.pk)
+                if order.status != ORDER.FULFILLMENT_ERROR:
+                    return order
+                return fulfill(order)
+        except Exception:
+            # The attempt, rolled back along with the rest of its transaction, must still be counted,
+            # so that the order is backed off, and eventually given up on.
+            record_attempt(Order.objects.get(pk=order.pk))
+            raise
+
+    return retry
+
+
+def get_failed_orders(numbers=None, start_date=None, end_date=None, sku=None, line_status=None):
+    """ Return the orders which have failed fulfillment, optionally filtered.
+
+    Args:
+        numbers (list): Numbers of the orders to return.
+        start_date (datetime): Return orders placed at or after this time.
+        end_date (datetime): Return orders placed before this time.
+        sku (str): Return orders containing a line for the product with this SKU.
+        line_status (str): Return orders containing a line with this status (e.g., LINE.FULFILLMENT_NETWORK_ERROR).
+
+    Returns:
+        QuerySet: The matching orders, oldest first.
+    """
+    orders = Order.objects.filter(status=ORDER.FULFILLMENT_ERROR)
+    if numbers:
+        orders = orders.filter(number__in=numbers)
+    if start_date:
+        orders = orders.filter(date_placed__gte=start_date)
+    if end_date:
+        orders = orders.filter(date_placed__lt=end_date)
+
+    lines = {}
+    if sku:
+        lines['partner_sku'] = sku
+    if line_status:
+        lines['status'] = line_status
+    if lines:
+        # Lines are filtered by a subquery, rather than a join, so that each order is returned once.
+        orders = orders.filter(id__in=Line.objects.filter(**lines).values('order_id'))
+
+    return orders.order_by('id')
+
+
+def retry_in_bulk(orders, fulfill, max_workers, chunk_size):
+    """ Retry fulfillment of the given orders, yielding the result for each order as soon as it has been retried.
+
+    Orders are loaded in chunks of chunk_size, and retried at most max_workers at once. Results are yielded in
+    the order in which the retries complete, followed by a summary of all retries.
+
+    Args:
+        orders (QuerySet): The orders to retry.
+        fulfill (callable): Function fulfilling an order, returning the order with its new status.
+        max_workers (int): Maximum number of orders to retry at once.
+        chunk_size (int): Number of orders loaded at once.
+
+    Yields:
+        dict: The number of each order, and either its new status, or a message describing the error preventing
+            it from being retried. Finally, the total number of orders retried, and how many of these are now
+            complete, or have failed.
+    """
+    summary = OrderedDict([('total', 0), ('complete', 0), ('failed', 0)])
+    retry = _get_retrier(fulfill)
+
+    order_ids = list(orders.values_list('id', flat=True))
+    for start in xrange(0, len(order_ids), chunk_size):
+        chunk = order_ids[start:start + chunk_size]
+        chunk_orders = Order.objects.in_bulk(chunk)
+        chunk_orders = [chunk_orders[order_id] for order_id in chunk if order_id in chunk_orders]
+
+        outcomes = concurrency.imap_concurrently(retry, chunk_orders, max_workers, on_worker_exit=connection.close)
+        for order, fulfilled_order, exc_info in outcomes:
+            if exc_info is None:
+                result = {'number': order.number, 'status': fulfilled_order.status}
+            else:
+                logger.error("Failed to retry fulfillment of order [%s]", order.number, exc_info=exc_info)
+                result = {'number': order.number, 'developer_message': unicode(exc_info[1])}
+
+            summary['total'] += 1
+            summary['complete' if result.get('status') == ORDER.COMPLETE else 'failed'] += 1
+            yield result
+
+    logger.info(
+        "Retried fulfillment of [%d] orders in bulk, of which [%d] failed", summary['total'], summary['failed']
+    )
+    yield summary
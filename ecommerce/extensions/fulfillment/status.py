@@ -31,3 +31,11 @@ class LINE(object):
     REVOKE_NETWORK_ERROR = 'Revoke Network Error'
     REVOKE_TIMEOUT_ERROR = 'Revoke Timeout Error'
     REVOKE_SERVER_ERROR = 'Revoke Server Error'
+
+    # Statuses of lines whose fulfillment has failed, and may be retried.
+    FULFILLMENT_ERRORS = (
+        FULFILLMENT_CONFIGURATION_ERROR,
+        FULFILLMENT_NETWORK_ERROR,
+        FULFILLMENT_TIMEOUT_ERROR,
+        FULFILLMENT_SERVER_ERROR,
+    )
@@ -16,20 +16,39 @@ from ecommerce.extensions.fulfillment.status import ORDER, LINE
 class FakeFulfillmentModule(FulfillmentModule):
     """Fake Fulfillment Module used to test the API without specific implementations."""
 
-    def get_supported_lines(self, order, lines):
+    def get_supported_lines(self, order, lines, context=None):
         """Returns a list of lines this Fake module supposedly supports."""
         return lines
 
-    def fulfill_product(self, order, lines):
+    def fulfill_product(self, order, lines, context=None):
         """Fulfill product. Mark all lines success."""
         for line in lines:
             line.set_status(LINE.COMPLETE)
 
 
+class RecordingFulfillmentModule(FakeFulfillmentModule):
+    """Fake Fulfillment Module recording the lines it's asked to fulfill."""
+    fulfilled_lines = []
+
+    def fulfill_product(self, order, lines, context=None):
+        """Fulfill product. Mark all lines success, and record them."""
+        self.fulfilled_lines.extend(lines)
+        super(RecordingFulfillmentModule, self).fulfill_product(order, lines, context=context)
+
+
+class TimeoutFulfillmentModule(FakeFulfillmentModule):
+    """Fake Fulfillment Module whose requests always time out."""
+
+    def fulfill_product(self, order, lines, context=None):
+        """Fulfill product. Mark all lines with a timeout error."""
+        for line in lines:
+            line.set_status(LINE.FULFILLMENT_TIMEOUT_ERROR)
+
+
 class FulfillmentNothingModule(FulfillmentModule):
     """Fake Fulfillment Module that refuses to fulfill anything."""
 
-    def get_supported_lines(self, order, lines):
+    def get_supported_lines(self, order, lines, context=None):
         """Returns an empty list, because this module supports nothing."""
         return []
 
@@ -99,3 +118,54 @@ class FulfillmentTest(TestCase):
         fulfillment_api.fulfill_order(self.order, self.order.lines)
         self.assertEquals(ORDER.FULFILLMENT_ERROR, self.order.status)
         self.assertEquals(LINE.FULFILLMENT_CONFIGURATION_ERROR, self.order.lines.all()[0].status)
+
+    @override_settings(
+        FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.test_api.RecordingFulfillmentModule', ]
+    )
+    def test_retry_failed_lines(self):
+        """Test that retrying fulfillment of an order only fulfills the lines which failed."""
+        verified_seat = factories.ProductFactory(
+            structure='child',
+            upc='003',
+            title='Seat in EdX DemoX Course with Verified Certificate',
+            product_class=self.product_class,
+            parent=self.course
+        )
+        for stock_record in verified_seat.stockrecords.all():
+            stock_record.price_currency = 'USD'
+            stock_record.save()
+
+        basket = factories.create_basket(empty=True)
+        basket.add_product(self.seat, 1)
+        basket.add_product(verified_seat, 1)
+        order = factories.create_order(number=2, basket=basket, user=self.user)
+        order.set_status(ORDER.BEING_PROCESSED)
+        order.set_status(ORDER.PAID)
+
+        # Simulate an attempt which fulfilled one line, but not the other.
+        complete_line, failed_line = order.lines.order_by('id')
+        complete_line.set_status(LINE.COMPLETE)
+        failed_line.set_status(LINE.FULFILLMENT_SERVER_ERROR)
+        order.set_status(ORDER.FULFILLMENT_ERROR)
+
+        RecordingFulfillmentModule.fulfilled_lines = []
+        fulfillment_api.fulfill_order(order, order.lines)
+
+        self.assertEqual([failed_line], RecordingFulfillmentModule.fulfilled_lines)
+        self.assertEqual(ORDER.COMPLETE, order.status)
+        self.assertEqual([LINE.COMPLETE] * 2, [line.status for line in order.lines.all()])
+
+    @override_settings(
+        FULFILLMENT_MODULES=['ecommerce.extensions.fulfillment.tests.test_api.TimeoutFulfillmentModule', ]
+    )
+    def test_retry_failed_line_with_different_error(self):
+        """Test that a failed line may fail again, with a different error, when fulfillment is retried."""
+        line = self.order.lines.get()
+        line.set_status(LINE.FULFILLMENT_NETWORK_ERROR)
+        self.order.set_status(ORDER.FULFILLMENT_ERROR)
+
+        fulfillment_api.fulfill_order(self.order, self.order.lines)
+
+        self.assertEqual(ORDER.FULFILLMENT_ERROR, self.order.status)
+        self.assertEqual(LINE.FULFILLMENT_TIMEOUT_ERROR, self.order.lines.get().status)
+        self.assertEqual(1, self.order.fulfillment_attempts)
@@ -0,0 +1,88 @@
+"""Tests of concurrent execution of fulfillment calls."""
+import threading
+import time
+
+from django.test import TestCase
+
+from ecommerce.extensions.fulfillment.concurrency import imap_concurrently, map_concurrently
+
+
+class MapConcurrentlyTests(TestCase):
+    def test_results(self):
+        """ Results should be returned in the order of the items, with exceptions captured. """
+        def func(item):
+            if item == 2:
+                raise ValueError(item)
+            return item * 10
+
+        results = map_concurrently(func, [1, 2, 3], max_workers=2)
+
+        self.assertEqual([result for result, _ in results], [10, None, 30])
+        self.assertIsNone(results[0][1])
+        self.assertIs(results[1][1][0], ValueError)
+
+    def test_bounded_concurrency(self):
+        """ No more than max_workers calls should run at once. """
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+
+        def func(item):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+            time.sleep(0.05)
+            with lock:
+                state['running'] -= 1
+            return item
+
+        results = map_concurrently(func, range(6), max_workers=3)
+
+        self.assertEqual([result for result, _ in results], range(6))
+        self.assertEqual(state['peak'], 3)
+
+    def test_on_worker_exit(self):
+        """ on_worker_exit should be called once per worker thread, but not when calls run on the calling thread. """
+        exits = []
+
+        def on_worker_exit():
+            exits.append(threading.current_thread())
+
+        map_concurrently(lambda item: item, range(6), max_workers=3, on_worker_exit=on_worker_exit)
+        self.assertEqual(len(exits), 3)
+        self.assertEqual(len(set(exits)), 3)
+        self.assertNotIn(threading.current_thread(), exits)
+
+        del exits[:]
+        map_concurrently(lambda item: item, range(6), max_workers=1, on_worker_exit=on_worker_exit)
+        self.assertEqual(exits, [])
+
+
+class ImapConcurrentlyTests(TestCase):
+    def test_completion_order(self):
+        """ Outcomes should be yielded as calls complete, with exceptions captured. """
+        def func(item):
+            time.sleep(item * 0.05)
+            if item == 2:
+                raise ValueError(item)
+            return item * 10
+
+        outcomes = list(imap_concurrently(func, [3, 1, 2], max_workers=3))
+
+        self.assertEqual([(item, result) for item, result, _ in outcomes], [(1, 10), (2, None), (3, 30)])
+        self.assertIsNone(outcomes[0][2])
+        self.assertIs(outcomes[1][2][0], ValueError)
+
+    def test_stop_early(self):
+        """ Calls not yet started should be abandoned if the caller stops early. """
+        calls = []
+
+        def func(item):
+            time.sleep(0.05)
+            calls.append(item)
+
+        outcomes = imap_concurrently(func, range(10), max_workers=2)
+
+        next(outcomes)
+        outcomes.close()
+
+        self.assertLess(len(calls), 10)
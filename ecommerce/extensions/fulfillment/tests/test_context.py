@@ -0,0 +1,56 @@
+"""Tests of the fulfillment context."""
+from django.test import TestCase
+from oscar.test import factories
+
+from ecommerce.extensions.catalogue.snapshot import catalog
+from ecommerce.extensions.fulfillment.context import FulfillmentContext
+
+
+class FulfillmentContextTests(TestCase):
+    def setUp(self):
+        super(FulfillmentContextTests, self).setUp()
+        self.product_class = factories.ProductClassFactory(name='Seat', requires_shipping=False, track_stock=False)
+        course = factories.ProductFactory(
+            structure='parent', title='EdX DemoX Course', product_class=self.product_class, stockrecords=None
+        )
+        course_key = factories.ProductAttributeFactory(name='course_key', product_class=self.product_class, type='text')
+
+        basket = factories.create_basket(empty=True)
+        for index in xrange(3):
+            seat = factories.ProductFactory(
+                structure='child', title='Seat in EdX DemoX Course', product_class=None, parent=course
+            )
+            factories.ProductAttributeValueFactory(
+                attribute=course_key, product=seat, value_text='edX/DemoX/Demo_{}'.format(index)
+            )
+            basket.add_product(seat, 1)
+        self.order = factories.create_order(basket=basket)
+
+    def assert_context_describes_lines(self, context, lines):
+        for line in lines:
+            attributes = {value.attribute.name: value.value for value in line.product.attribute_values.all()}
+            self.assertEqual(context.get_product(line).id, line.product_id)
+            self.assertEqual(context.get_product_class(line), self.product_class)
+            self.assertEqual(context.get_attributes(line), attributes)
+
+    def test_snapshot(self):
+        """ Lines described by the catalog snapshot should require no queries. """
+        lines = list(self.order.lines.all())
+        catalog.load()
+
+        with self.assertNumQueries(0):
+            context = FulfillmentContext(lines)
+
+        self.assert_context_describes_lines(context, lines)
+
+    def test_constant_queries(self):
+        """ Lines not described by the snapshot should be loaded with a constant number of queries. """
+        lines = list(self.order.lines.all())
+        for line in lines:
+            line.partner_sku = 'not-a-sku'
+        catalog.load()
+
+        with self.assertNumQueries(2):
+            context = FulfillmentContext(lines)
+
+        self.assert_context_describes_lines(context, lines)
@@ -70,7 +70,7 @@ class FulfillmentModuleTest(TestCase):
         supported_lines = EnrollmentFulfillmentModule().get_supported_lines(self.order, list(self.order.lines.all()))
         self.assertEqual(1, len(supported_lines))
 
-    @mock.patch('requests.post')
+    @mock.patch('ecommerce.outbound.client.client.post')
     def test_enrollment_module_fulfill(self, mock_post_request):
         """Happy path test to ensure we can properly fulfill enrollments."""
         fake_enrollment_api_response = Response()
@@ -95,14 +95,14 @@ class FulfillmentModuleTest(TestCase):
         EnrollmentFulfillmentModule().fulfill_product(self.order, list(self.order.lines.all()))
         self.assertEqual(LINE.FULFILLMENT_CONFIGURATION_ERROR, self.order.lines.all()[0].status)
 
-    @mock.patch('requests.post', mock.Mock(side_effect=ConnectionError))
+    @mock.patch('ecommerce.outbound.client.client.post', mock.Mock(side_effect=ConnectionError))
     def test_enrollment_module_network_error(self):
         """Test that lines receive a network error status if a fulfillment request experiences a network error."""
         self._create_attributes()
         EnrollmentFulfillmentModule().fulfill_product(self.order, list(self.order.lines.all()))
         self.assertEqual(LINE.FULFILLMENT_NETWORK_ERROR, self.order.lines.all()[0].status)
 
-    @mock.patch('requests.post', mock.Mock(side_effect=Timeout))
+    @mock.patch('ecommerce.outbound.client.client.post', mock.Mock(side_effect=Timeout))
     def test_enrollment_module_request_timeout(self):
         """Test that lines receive a timeout error status if a fulfillment request times out."""
         self._create_attributes()
@@ -118,13 +118,64 @@ class FulfillmentModuleTest(TestCase):
         fake_error_response._content = response_content  # pylint: disable=protected-access
         fake_error_response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
 
-        with mock.patch('requests.post', return_value=fake_error_response):
+        with mock.patch('ecommerce.outbound.client.client.post', return_value=fake_error_response):
             self._create_attributes()
 
             # Attempt to enroll
             EnrollmentFulfillmentModule().fulfill_product(self.order, list(self.order.lines.all()))
             self.assertEqual(LINE.FULFILLMENT_SERVER_ERROR, self.order.lines.all()[0].status)
 
+    @override_settings(ENROLLMENT_API_BULK_URL='http://lms.example.com/api/enrollment/v1/bulk_enrollment')
+    def test_enrollment_module_bulk_fulfill(self):
+        """Test that all lines are enrolled with a single bulk request, and per-item results mapped to their lines."""
+        order = self._create_multiple_seat_order()
+        fake_bulk_response = Response()
+        # pylint: disable=protected-access
+        fake_bulk_response._content = '[{"status": 200}, {"status": 400, "message": "Oops!"}]'
+        fake_bulk_response.status_code = status.HTTP_200_OK
+
+        with mock.patch('ecommerce.outbound.client.client.post', return_value=fake_bulk_response) as mock_post:
+            EnrollmentFulfillmentModule().fulfill_product(order, list(order.lines.order_by('id')))
+
+        self.assertEqual(1, mock_post.call_count)
+        self.assertEqual('http://lms.example.com/api/enrollment/v1/bulk_enrollment', mock_post.call_args[0][0])
+        self.assertEqual(
+            [LINE.COMPLETE, LINE.FULFILLMENT_SERVER_ERROR],
+            [line.status for line in order.lines.order_by('id')]
+        )
+
+    @ddt.data(status.HTTP_404_NOT_FOUND, status.HTTP_405_METHOD_NOT_ALLOWED)
+    @override_settings(ENROLLMENT_API_BULK_URL='http://lms.example.com/api/enrollment/v1/bulk_enrollment')
+    def test_enrollment_module_bulk_unsupported(self, status_code):
+        """Test that lines are enrolled individually if the Enrollment API doesn't support bulk enrollment."""
+        order = self._create_multiple_seat_order()
+        fake_unsupported_response = Response()
+        fake_unsupported_response.status_code = status_code
+        fake_enrollment_api_response = Response()
+        fake_enrollment_api_response.status_code = status.HTTP_200_OK
+
+        with mock.patch('ecommerce.outbound.client.client.post') as mock_post:
+            mock_post.side_effect = [fake_unsupported_response] + [fake_enrollment_api_response] * 2
+            EnrollmentFulfillmentModule().fulfill_product(order, list(order.lines.all()))
+
+        self.assertEqual(3, mock_post.call_count)
+        self.assertEqual([LINE.COMPLETE] * 2, [line.status for line in order.lines.all()])
+
+    @ddt.data(
+        (ConnectionError, LINE.FULFILLMENT_NETWORK_ERROR),
+        (Timeout, LINE.FULFILLMENT_TIMEOUT_ERROR),
+    )
+    @ddt.unpack
+    @override_settings(ENROLLMENT_API_BULK_URL='http://lms.example.com/api/enrollment/v1/bulk_enrollment')
+    def test_enrollment_module_bulk_request_error(self, exception, line_status):
+        """Test that all lines receive the corresponding error status if the bulk request fails."""
+        order = self._create_multiple_seat_order()
+
+        with mock.patch('ecommerce.outbound.client.client.post', side_effect=exception):
+            EnrollmentFulfillmentModule().fulfill_product(order, list(order.lines.all()))
+
+        self.assertEqual([line_status] * 2, [line.status for line in order.lines.all()])
+
     @raises(NotImplementedError)
     def test_enrollment_module_revoke(self):
         """Test that use of this method due to "not implemented" error."""
@@ -151,3 +202,32 @@ class FulfillmentModuleTest(TestCase):
             attribute=course_key, product=self.seat, value_text='edX/DemoX/Demo_Course'
         )
         key_value.save()
+
+    def _create_multiple_seat_order(self):
+        """Create a paid order for the Honor Seat in DemoX Course, and a Verified Seat in another course."""
+        self._create_attributes()
+
+        course = factories.ProductFactory(
+            structure='parent', upc='003', title='EdX OtherX Course', product_class=self.product_class
+        )
+        seat = factories.ProductFactory(
+            structure='child',
+            upc='004',
+            title='Seat in EdX OtherX Course with Verified Certificate',
+            product_class=None,
+            parent=course
+        )
+        for stock_record in seat.stockrecords.all():
+            stock_record.price_currency = 'USD'
+            stock_record.save()
+        seat.attr.certificate_type = 'verified'
+        seat.attr.course_key = 'edX/OtherX/Other_Course'
+        seat.save()
+
+        basket = factories.create_basket(empty=True)
+        basket.add_product(self.seat, 1)
+        basket.add_product(seat, 1)
+        order = factories.create_order(number=2, basket=basket, user=self.user)
+        order.set_status(ORDER.BEING_PROCESSED)
+        order.set_status(ORDER.PAID)
+        return order
@@ -0,0 +1,69 @@
+"""Tests of the fulfillment module registry."""
+import mock
+from django.test import TestCase
+from django.test.utils import override_settings
+from oscar.test import factories
+
+from ecommerce.extensions.fulfillment.context import FulfillmentContext
+from ecommerce.extensions.fulfillment.registry import registry
+from ecommerce.extensions.fulfillment.tests.test_api import FakeFulfillmentModule
+
+
+class NotAFulfillmentModule(object):
+    """Class which doesn't extend FulfillmentModule."""
+    pass
+
+
+@override_settings(FULFILLMENT_MODULES=[
+    'ecommerce.extensions.fulfillment.tests.test_api.NotARealModule',
+    'ecommerce.extensions.fulfillment.tests.test_registry.NotAFulfillmentModule',
+    'ecommerce.extensions.fulfillment.tests.test_api.FakeFulfillmentModule',
+])
+class ModuleRegistryTests(TestCase):
+    def setUp(self):
+        basket = factories.create_basket(empty=True)
+        basket.add_product(factories.create_product(), 1)
+        basket.add_product(factories.create_product(), 1)
+        self.order = factories.create_order(basket=basket)
+
+    def test_modules(self):
+        """Only valid modules are loaded, and each is instantiated once."""
+        modules = registry.modules
+        self.assertEqual(1, len(modules))
+        self.assertIsInstance(modules[0], FakeFulfillmentModule)
+        self.assertIs(modules[0], registry.modules[0])
+
+    def test_get_module(self):
+        """The module supporting a product class is looked up once, and indexed."""
+        module = registry.modules[0]
+        lines = list(self.order.lines.all())
+        context = FulfillmentContext(lines)
+
+        with mock.patch.object(module, 'get_supported_lines', wraps=module.get_supported_lines) as mock_supported:
+            self.assertIs(module, registry.get_module(self.order, lines[0], context))
+            self.assertIs(module, registry.get_module(self.order, lines[1], context))
+
+        # Both products are of the same product class.
+        self.assertEqual(1, mock_supported.call_count)
+
+    def test_reset(self):
+        """Modules are loaded again when the setting changes."""
+        module = registry.modules[0]
+        with override_settings(FULFILLMENT_MODULES=[]):
+            self.assertEqual([], registry.modules)
+        self.assertIsNot(module, registry.modules[0])
+
+    def test_get_module_during_reload(self):
+        """A module looked up while the modules are loaded again is not indexed by the new generation."""
+        module = registry.modules[0]
+        lines = list(self.order.lines.all())
+        context = FulfillmentContext(lines)
+
+        def get_supported_lines(order, lines, context=None):  # pylint: disable=unused-argument
+            registry.load()
+            return lines
+
+        with mock.patch.object(module, 'get_supported_lines', side_effect=get_supported_lines):
+            self.assertIs(module, registry.get_module(self.order, lines[0], context))
+
+        self.assertIsNot(module, registry.get_module(self.order, lines[0], context))
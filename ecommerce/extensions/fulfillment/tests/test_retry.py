@@ -0,0 +1,88 @@
+"""Tests of automatic fulfillment retry."""
+import datetime
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from ecommerce.extensions.fulfillment import retry
+from ecommerce.extensions.fulfillment.status import ORDER
+
+
+Order = get_model('order', 'Order')
+
+
+@override_settings(
+    FULFILLMENT_RETRY_MAX_ATTEMPTS=3, FULFILLMENT_RETRY_BACKOFF=60, FULFILLMENT_RETRY_MAX_BACKOFF=90,
+    FULFILLMENT_JOB_LEASE=300
+)
+class FulfillmentRetryTests(TestCase):
+    def setUp(self):
+        super(FulfillmentRetryTests, self).setUp()
+        self.order = factories.create_order()
+        self.order.status = ORDER.FULFILLMENT_ERROR
+        self.order.save()
+
+    def assert_next_attempt_in(self, seconds):
+        order = Order.objects.get(pk=self.order.pk)
+        expected = timezone.now() + datetime.timedelta(seconds=seconds)
+        self.assertAlmostEqual(order.next_fulfillment_attempt, expected, delta=datetime.timedelta(seconds=5))
+
+    def test_backoff(self):
+        """ Retries should be scheduled with exponential backoff, bounded by the maximum backoff. """
+        self.assertEqual([retry.get_backoff(attempts) for attempts in (1, 2, 3)], [60, 90, 90])
+
+    def test_record_attempt(self):
+        """ Failed attempts should be counted and retries scheduled, until the maximum number of attempts. """
+        retry.record_attempt(self.order)
+        self.assertEqual(Order.objects.get(pk=self.order.pk).fulfillment_attempts, 1)
+        self.assert_next_attempt_in(60)
+
+        retry.record_attempt(self.order)
+        self.assert_next_attempt_in(90)
+
+        retry.record_attempt(self.order)
+        order = Order.objects.get(pk=self.order.pk)
+        self.assertEqual(order.fulfillment_attempts, 3)
+        self.assertIsNone(order.next_fulfillment_attempt)
+
+    def test_record_successful_attempt(self):
+        """ Successful attempts should clear any scheduled retry. """
+        retry.record_attempt(self.order)
+        self.order.status = ORDER.COMPLETE
+        retry.record_attempt(self.order)
+
+        order = Order.objects.get(pk=self.order.pk)
+        self.assertEqual(order.fulfillment_attempts, 1)
+        self.assertIsNone(order.next_fulfillment_attempt)
+
+    def test_record_first_successful_attempt(self):
+        """ Recording a successful attempt should not write to the database if there is no retry to clear. """
+        self.order.status = ORDER.COMPLETE
+        with self.assertNumQueries(0):
+            retry.record_attempt(self.order)
+
+    def test_claim_due(self):
+        """ Only orders due for a retry should be claimed, and claiming them should postpone their next attempt. """
+        not_due = factories.create_order()
+        Order.objects.filter(pk=not_due.pk).update(
+            status=ORDER.FULFILLMENT_ERROR, next_fulfillment_attempt=timezone.now() + datetime.timedelta(hours=1)
+        )
+        Order.objects.filter(pk=self.order.pk).update(next_fulfillment_attempt=timezone.now())
+
+        self.assertEqual(retry.claim_due(10), [self.order])
+        self.assert_next_attempt_in(300)
+        self.assertEqual(retry.claim_due(10), [])
+
+    def test_retry_raising(self):
+        """ Attempts raising an exception should be counted, and a retry scheduled. """
+        def fulfill(order):
+            raise ValueError(order.number)
+
+        [(result, exc_info)] = retry.retry_orders([self.order], fulfill, max_workers=1)
+
+        self.assertIsNone(result)
+        self.assertIs(exc_info[0], ValueError)
+        self.assertEqual(Order.objects.get(pk=self.order.pk).fulfillment_attempts, 1)
+        self.assert_next_attempt_in(60)
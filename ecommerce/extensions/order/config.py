@@ -3,3 +3,11 @@ from oscar.apps.order import config
 
 class OrderConfig(config.OrderConfig):
     name = 'ecommerce.extensions.order'
+
+    def ready(self):
+        super(OrderConfig, self).ready()
+
+        from ecommerce.extensions.fulfillment.registry import registry
+
+        # Resolve the configured fulfillment modules once, at startup, rather than for every order fulfilled.
+        registry.load()
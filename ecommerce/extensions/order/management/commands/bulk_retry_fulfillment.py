@@ -0,0 +1,75 @@
+"""Retry fulfillment of many orders which have failed fulfillment at once."""
+import json
+import logging
+from optparse import make_option
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ecommerce.extensions.fulfillment import retry
+from ecommerce.extensions.fulfillment.mixins import FulfillmentMixin
+from ecommerce.extensions.fulfillment.status import LINE
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(FulfillmentMixin, BaseCommand):
+    """Retry fulfillment of the orders in the "Fulfillment Error" state matching the given filters.
+
+    All filters are optional; without any, every order which has failed fulfillment is retried. Orders
+    are retried in chunks, with a bounded number of concurrent workers, each order within its own
+    transaction. The result of each retry is written as a line of JSON as soon as the retry completes,
+    followed by a summary of all retries.
+    """
+    help = 'Retry fulfillment of orders which have failed fulfillment, selected by number or by filters.'
+
+    option_list = BaseCommand.option_list + (
+        make_option('--numbers', default=None,
+                    help='Comma-separated numbers of the orders to retry.'),
+        make_option('--start-date', default=None,
+                    help='Only retry orders placed at or after this time (e.g., 2015-04-01T00:00:00Z).'),
+        make_option('--end-date', default=None,
+                    help='Only retry orders placed before this time.'),
+        make_option('--sku', default=None,
+                    help='Only retry orders containing a line for the product with this SKU.'),
+        make_option('--line-status', default=None, choices=LINE.FULFILLMENT_ERRORS,
+                    help='Only retry orders containing a line with this status.'),
+        make_option('--batch-size', type='int', default=None,
+                    help='Number of orders to load at once. Defaults to FULFILLMENT_RETRY_BATCH_SIZE.'),
+        make_option('--concurrency', type='int', default=None,
+                    help='Number of orders to retry at once. Defaults to FULFILLMENT_RETRY_CONCURRENCY.'),
+    )
+
+    def handle(self, *args, **options):
+        numbers = options['numbers']
+        orders = retry.get_failed_orders(
+            numbers=numbers.split(',') if numbers else None,
+            start_date=self._parse_date(options['start_date']),
+            end_date=self._parse_date(options['end_date']),
+            sku=options['sku'],
+            line_status=options['line_status'],
+        )
+
+        results = retry.retry_in_bulk(
+            orders,
+            self._fulfill_order_synchronously,
+            options['concurrency'] or settings.FULFILLMENT_RETRY_CONCURRENCY,
+            options['batch_size'] or settings.FULFILLMENT_RETRY_BATCH_SIZE
+        )
+
+        for result in results:
+            self.stdout.write(json.dumps(result))
+
+    def _parse_date(self, value):
+        if not value:
+            return None
+
+        date = parse_datetime(value)
+        if date is None:
+            raise CommandError("[{}] is not a valid date and time.".format(value))
+        if timezone.is_naive(date):
+            date = timezone.make_aware(date, timezone.utc)
+        return date
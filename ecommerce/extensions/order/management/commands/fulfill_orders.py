@@ -0,0 +1,56 @@
+"""Fulfill orders enqueued for asynchronous fulfillment."""
+import logging
+import time
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ecommerce.extensions.fulfillment import queue
+from ecommerce.extensions.fulfillment.mixins import FulfillmentMixin
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(FulfillmentMixin, BaseCommand):
+    """Worker fulfilling orders enqueued while FULFILLMENT_ASYNC is enabled.
+
+    Jobs are claimed one at a time, oldest first. Any number of workers may be run concurrently;
+    each job is claimed by a single worker. When no jobs are available, the worker polls for new
+    jobs, unless --once is passed, in which case it exits.
+    """
+    help = 'Fulfill orders enqueued for asynchronous fulfillment.'
+
+    option_list = BaseCommand.option_list + (
+        make_option('--once', action='store_true', default=False,
+                    help='Exit once no jobs are available, rather than waiting for more.'),
+        make_option('--sleep', type='float', default=1.0,
+                    help='Number of seconds to wait before polling again when no jobs are available.'),
+    )
+
+    def handle(self, *args, **options):
+        while True:
+            job = queue.claim()
+            if job is None:
+                if options['once']:
+                    return
+                time.sleep(options['sleep'])
+                continue
+
+            self._run(job)
+
+    def _run(self, job):
+        order = job.order
+        logger.info("Fulfilling order [%s] for job [%d], attempt [%d]", order.number, job.id, job.attempts)
+
+        try:
+            with queue.heartbeat(job), transaction.atomic():
+                order = self._fulfill_order_synchronously(order)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Job [%d] failed to fulfill order [%s]", job.id, order.number)
+            queue.finish(job, succeeded=False)
+            return
+
+        logger.info("Job [%d] finished fulfilling order [%s] with status [%s]", job.id, order.number, order.status)
+        queue.finish(job, succeeded=True)
@@ -0,0 +1,95 @@
+"""Delete abandoned and submitted baskets."""
+import datetime
+import logging
+import time
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from oscar.core.loading import get_model
+
+
+logger = logging.getLogger(__name__)
+
+Basket = get_model('basket', 'Basket')
+
+
+class Command(BaseCommand):
+    """Delete baskets, along with their lines, which will never be used again.
+
+    Baskets are reaped if they were created more than the given number of days ago and are frozen
+    (i.e., abandoned during checkout), merged, submitted (i.e., an order has been placed), or open
+    and abandoned. Orders do not depend on their baskets; an order's reference to a reaped basket is
+    cleared. Saved baskets are never reaped.
+
+    Order creation reuses each user's most recent editable basket. An open basket is only considered
+    abandoned if its owner has since created another editable basket (or if it has no owner), so that
+    baskets which may be in use are never reaped.
+
+    Baskets are visited in order of ID, and deleted in chunks, each in its own short transaction, with
+    a pause after each chunk; the command is therefore safe to run while the site is serving traffic.
+    Progress is logged after every chunk. An interrupted run can be resumed by passing the last ID
+    logged as --start-id.
+    """
+    help = 'Delete abandoned and submitted baskets, along with their lines.'
+    REAPED_STATUSES = (Basket.FROZEN, Basket.MERGED, Basket.SUBMITTED)
+
+    option_list = BaseCommand.option_list + (
+        make_option('--days', type='int', default=14,
+                    help='Only reap baskets created more than this many days ago.'),
+        make_option('--chunk-size', type='int', default=500,
+                    help='Maximum number of baskets to delete in a single transaction.'),
+        make_option('--sleep', type='float', default=1.0,
+                    help='Number of seconds to pause between chunks.'),
+        make_option('--start-id', type='int', default=0,
+                    help='Only reap baskets with an ID greater than this one.'),
+        make_option('--dry-run', action='store_true', default=False,
+                    help='Count the baskets which would be reaped, without deleting them.'),
+    )
+
+    @property
+    def reapable(self):
+        """Condition matching baskets which will never be used again."""
+        return (
+            Q(status__in=self.REAPED_STATUSES) |
+            Q(status=Basket.OPEN, owner__isnull=True) |
+            Q(status=Basket.OPEN, owner__baskets__id__gt=F('id'), owner__baskets__status__in=Basket.editable_statuses)
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        cutoff = timezone.now() - datetime.timedelta(days=options['days'])
+
+        # Baskets are created in order of ID. Only the range of IDs preceding the cutoff needs to be scanned.
+        max_id = Basket.objects.filter(date_created__lt=cutoff).order_by('-id').values_list('id', flat=True).first()
+        if max_id is None:
+            logger.info("No baskets were created before [%s]", cutoff)
+            return
+
+        last_id = options['start_id']
+        reaped = 0
+        while last_id < max_id:
+            basket_ids = list(
+                Basket.objects.filter(
+                    self.reapable, id__gt=last_id, id__lte=max_id, date_created__lt=cutoff
+                ).distinct().order_by('id').values_list('id', flat=True)[:chunk_size]
+            )
+            if not basket_ids:
+                break
+
+            if not options['dry_run']:
+                with transaction.atomic():
+                    Basket.objects.filter(id__in=basket_ids).delete()
+
+            reaped += len(basket_ids)
+            last_id = basket_ids[-1]
+            logger.info("Reaped [%d] baskets, through basket [%d] of [%d]", reaped, last_id, max_id)
+
+            time.sleep(options['sleep'])
+
+        logger.info(
+            "%s [%d] baskets created before [%s]", 'Would have reaped' if options['dry_run'] else 'Reaped',
+            reaped, cutoff
+        )
@@ -0,0 +1,57 @@
+"""Retry fulfillment of orders which have failed fulfillment."""
+import logging
+import time
+from optparse import make_option
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ecommerce.extensions.fulfillment import retry
+from ecommerce.extensions.fulfillment.mixins import FulfillmentMixin
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(FulfillmentMixin, BaseCommand):
+    """Scheduler retrying fulfillment of orders once their next attempt is due.
+
+    Orders due for a retry are claimed in batches, and retried with a bounded number of concurrent
+    workers. Any number of schedulers may be run concurrently; each order is claimed by a single
+    scheduler. When no orders are due, the scheduler polls for more, unless --once is passed, in
+    which case it exits.
+    """
+    help = 'Retry fulfillment of orders which have failed fulfillment.'
+
+    option_list = BaseCommand.option_list + (
+        make_option('--batch-size', type='int', default=None,
+                    help='Number of orders to claim at once. Defaults to FULFILLMENT_RETRY_BATCH_SIZE.'),
+        make_option('--concurrency', type='int', default=None,
+                    help='Number of orders to retry at once. Defaults to FULFILLMENT_RETRY_CONCURRENCY.'),
+        make_option('--once', action='store_true', default=False,
+                    help='Exit once no orders are due, rather than waiting for more.'),
+        make_option('--sleep', type='float', default=10.0,
+                    help='Number of seconds to wait before polling again when no orders are due.'),
+    )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size'] or settings.FULFILLMENT_RETRY_BATCH_SIZE
+        concurrency = options['concurrency'] or settings.FULFILLMENT_RETRY_CONCURRENCY
+
+        while True:
+            orders = retry.claim_due(batch_size)
+            if not orders:
+                if options['once']:
+                    return
+                time.sleep(options['sleep'])
+                continue
+
+            logger.info("Retrying fulfillment of [%d] orders", len(orders))
+            results = retry.retry_orders(orders, self._fulfill_order_synchronously, concurrency)
+            for order, (fulfilled_order, exc_info) in zip(orders, results):
+                if exc_info is None:
+                    logger.info(
+                        "Retried fulfillment of order [%s], with status [%s]", order.number, fulfilled_order.status
+                    )
+                else:
+                    logger.error("Failed to retry fulfillment of order [%s]", order.number, exc_info=exc_info)
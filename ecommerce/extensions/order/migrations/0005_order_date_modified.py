@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0004_order_payment_processor'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='date_modified',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Date Modified', auto_now=True),
+            preserve_default=False,
+        ),
+    ]
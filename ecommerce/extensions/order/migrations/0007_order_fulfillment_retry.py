@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+from django.utils import timezone
+
+
+def schedule_failed_orders(apps, schema_editor):
+    """Schedule orders which have already failed fulfillment for an immediate retry."""
+    Order = apps.get_model('order', 'Order')
+    Order.objects.filter(status='Fulfillment Error').update(next_fulfillment_attempt=timezone.now())
+
+
+def unschedule_failed_orders(apps, schema_editor):
+    """Nothing to do; the fields are removed."""
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0006_fulfillmentjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='fulfillment_attempts',
+            field=models.PositiveSmallIntegerField(default=0, verbose_name='Fulfillment Attempts'),
+            preserve_default=True,
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='next_fulfillment_attempt',
+            field=models.DateTimeField(db_index=True, null=True, verbose_name='Next Fulfillment Attempt', blank=True),
+            preserve_default=True,
+        ),
+        migrations.RunPython(schedule_failed_orders, unschedule_failed_orders),
+    ]
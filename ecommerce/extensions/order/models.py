@@ -1,22 +1,82 @@
+import logging
+from collections import defaultdict
+
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
-from oscar.apps.order.abstract_models import AbstractOrder
+from oscar.apps.order.abstract_models import AbstractLine, AbstractOrder
+
+from ecommerce.extensions.fulfillment.status import LINE, ORDER
+
 
-from ecommerce.extensions.fulfillment.status import ORDER
+logger = logging.getLogger(__name__)
 
 
 class Order(AbstractOrder):
+    PAID_STATUSES = (ORDER.PAID, ORDER.REFUNDED, ORDER.COMPLETE, ORDER.FULFILLMENT_ERROR)
+
     payment_processor = models.CharField(_("Payment Processor"), max_length=32, blank=True)
+    date_modified = models.DateTimeField(_("Date Modified"), auto_now=True)
+
+    # Number of failed attempts to fulfill the order, and the time at which fulfillment should next be retried.
+    # The latter is only set while the order awaits a retry, so that orders due for a retry can be found by
+    # the index alone.
+    fulfillment_attempts = models.PositiveSmallIntegerField(_("Fulfillment Attempts"), default=0)
+    next_fulfillment_attempt = models.DateTimeField(_("Next Fulfillment Attempt"), null=True, blank=True, db_index=True)
 
     @property
     def is_paid(self):
-        return self.status in [ORDER.PAID, ORDER.REFUNDED, ORDER.COMPLETE, ORDER.FULFILLMENT_ERROR]
+        return self.status in self.PAID_STATUSES
 
     @property
     def can_retry_fulfillment(self):
         """ Returns a boolean indicating if order is eligible to retry fulfillment. """
         return self.status == ORDER.FULFILLMENT_ERROR
 
+    def set_line_statuses(self, lines, statuses):
+        """ Change the statuses of several of the order's lines at once.
+
+        Transitions are validated against OSCAR_LINE_STATUS_PIPELINE. Lines are updated with one UPDATE statement
+        per distinct new status, rather than one per line. A transition which is not permitted is logged, and its
+        line left unchanged; the other lines are still updated, so that, e.g., lines which have been fulfilled are
+        recorded as such, whatever the outcome for their siblings.
+
+        Args:
+            lines (list of Lines): The order's lines, whose statuses determine the aggregate status returned.
+            statuses (dict): New statuses, keyed by the Lines to change. Lines already in their new status are
+                left unchanged.
+
+        Returns:
+            str: ORDER.COMPLETE if every one of the given lines is complete, or ORDER.FULFILLMENT_ERROR otherwise.
+        """
+        pipeline = settings.OSCAR_LINE_STATUS_PIPELINE
+        changes = defaultdict(list)
+        for line, new_status in statuses.items():
+            if new_status == line.status:
+                continue
+            if new_status not in pipeline.get(line.status, ()):
+                logger.error(
+                    "Cannot change the status of line [%d] of order [%s] from [%s] to [%s]",
+                    line.id, self.number, line.status, new_status
+                )
+                continue
+            changes[new_status].append(line)
+
+        for new_status, changed_lines in changes.items():
+            Line.objects.filter(pk__in=[line.pk for line in changed_lines]).update(status=new_status)
+            for line in changed_lines:
+                line.status = new_status
+
+        if changes:
+            # Changes to the order's lines are changes to the order (see Line.save).
+            self.date_modified = timezone.now()
+            Order.objects.filter(pk=self.pk).update(date_modified=self.date_modified)
+
+        if all(line.status == LINE.COMPLETE for line in lines):
+            return ORDER.COMPLETE
+        return ORDER.FULFILLMENT_ERROR
+
     @classmethod
     def check_order_total(cls, order_num, auth_amount, auth_currency):
         """
@@ -46,5 +106,35 @@ class Order(AbstractOrder):
             return False
 
 
+class Line(AbstractLine):
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super(Line, self).save(*args, **kwargs)
+
+        # Changes to an existing line (e.g., of its status) are changes to its order.
+        if not adding:
+            Order.objects.filter(pk=self.order_id).update(date_modified=timezone.now())
+
+
+class FulfillmentJob(models.Model):
+    """A request for an order to be fulfilled asynchronously, by a worker."""
+    PENDING = 'Pending'
+    RUNNING = 'Running'
+    COMPLETE = 'Complete'
+    FAILED = 'Failed'
+    STATUS_CHOICES = (
+        (PENDING, _("Pending")),
+        (RUNNING, _("Running")),
+        (COMPLETE, _("Complete")),
+        (FAILED, _("Failed")),
+    )
+
+    order = models.ForeignKey('order.Order', related_name='fulfillment_jobs')
+    status = models.CharField(_("Status"), max_length=32, choices=STATUS_CHOICES, default=PENDING, db_index=True)
+    attempts = models.PositiveSmallIntegerField(_("Attempts"), default=0)
+    date_created = models.DateTimeField(_("Date Created"), auto_now_add=True)
+    date_updated = models.DateTimeField(_("Date Updated"), auto_now=True)
+
+
 # If two models with the same name are declared within an app, Django will only use the first one.
 from oscar.apps.order.models import *  # noqa pylint: disable=wildcard-import,unused-wildcard-import
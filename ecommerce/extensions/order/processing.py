@@ -6,12 +6,17 @@ errors explaining why fulfillment may fail.
 
 """
 
+from django.db.models import Sum
 from oscar.apps.order import processing, exceptions
+from oscar.core.loading import get_model
 
 from ecommerce.extensions.fulfillment import api as fulfillment_api
 from ecommerce.extensions.fulfillment.status import LINE
 
 
+ShippingEventQuantity = get_model('order', 'ShippingEventQuantity')
+
+
 class EventHandler(processing.EventHandler):
     """ Handles Order Processing
 
@@ -34,26 +39,44 @@ class EventHandler(processing.EventHandler):
 
         The ShippingEvent will only contain related LineQuantity objects for items that have been successfully
         fulfilled/shipped (e.g. status is Complete). If no items have been fulfilled, the value None will be returned.
+
+        Whether each line has already been shipped is determined with a single query, and the line quantities are
+        inserted together. The event itself is only written if at least one line qualifies.
         """
         reference = kwargs.get('reference', '')
-        event = order.shipping_events.create(event_type=event_type, notes=reference)
-        event_has_lines = False
-
-        try:
-            for line, quantity in zip(lines, line_quantities):
-                # The line should only be added to the ShippingEvent if the line is complete and was
-                # not previously shipped.
-                if line.status == LINE.COMPLETE and not line.has_shipping_event_occurred(event_type):
-                    event.line_quantities.create(line=line, quantity=quantity)
-                    event_has_lines = True
-        except exceptions.InvalidShippingEvent:  # pragma: no cover
-            # CCB: It is practically impossible to mock event.line_quantities.create() and force an error. If the
-            # implementation changes in the future, please remove the pragma and test this branch.
-            event.delete()
-            raise
-
-        if not event_has_lines:
-            event.delete()
+        complete = [(line, quantity) for line, quantity in zip(lines, line_quantities) if line.status == LINE.COMPLETE]
+        if not complete:
             return None
 
+        # Quantities of each line already covered by events of this type, as in Line.shipping_event_breakdown.
+        shipped_quantities = dict(
+            ShippingEventQuantity.objects.filter(
+                line__in=[line for line, _ in complete], event__event_type__name=event_type.name
+            ).order_by().values_list('line').annotate(total=Sum('quantity'))
+        )
+
+        qualifying = []
+        for line, quantity in complete:
+            shipped_quantity = shipped_quantities.get(line.id, 0)
+
+            # The line should only be added to the ShippingEvent if it was not previously shipped
+            # (see Line.has_shipping_event_occurred).
+            if shipped_quantity == line.quantity:
+                continue
+
+            # The checks made by ShippingEventQuantity.save(), which bulk insertion bypasses.
+            quantity = quantity or line.quantity
+            if shipped_quantity + quantity > line.quantity:
+                raise exceptions.InvalidShippingEvent(
+                    "This shipping event is not permitted for line [{line_id}]".format(line_id=line.id)
+                )
+            qualifying.append((line, quantity))
+
+        if not qualifying:
+            return None
+
+        event = order.shipping_events.create(event_type=event_type, notes=reference)
+        ShippingEventQuantity.objects.bulk_create(
+            [ShippingEventQuantity(event=event, line=line, quantity=quantity) for line, quantity in qualifying]
+        )
         return event
@@ -0,0 +1,216 @@
+"""Tests of the order app's management commands."""
+import datetime
+import json
+import time
+
+import mock
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.utils.six import StringIO
+from oscar.core.loading import get_model
+from oscar.test import factories
+
+from ecommerce.extensions.fulfillment import queue
+from ecommerce.extensions.fulfillment.status import ORDER
+
+
+Basket = get_model('basket', 'Basket')
+FulfillmentJob = get_model('order', 'FulfillmentJob')
+Order = get_model('order', 'Order')
+
+SYNCHRONOUS_FULFILLMENT = 'ecommerce.extensions.order.management.commands.fulfill_orders.Command' \
+                          '._fulfill_order_synchronously'
+RETRIED_FULFILLMENT = 'ecommerce.extensions.order.management.commands.retry_fulfillment.Command' \
+                      '._fulfill_order_synchronously'
+BULK_RETRIED_FULFILLMENT = 'ecommerce.extensions.order.management.commands.bulk_retry_fulfillment.Command' \
+                           '._fulfill_order_synchronously'
+
+
+def complete_order(order):
+    """ Stand-in for fulfillment, completing the order. """
+    order.status = ORDER.COMPLETE
+    order.save()
+    return order
+
+
+class FulfillOrdersTests(TestCase):
+    def setUp(self):
+        super(FulfillOrdersTests, self).setUp()
+        self.order = factories.create_order()
+        self.order.status = ORDER.PAID
+        self.order.save()
+
+    def test_fulfill_orders(self):
+        """ Enqueued orders should be fulfilled, and their jobs marked complete. """
+        job = queue.enqueue(self.order)
+
+        with mock.patch(SYNCHRONOUS_FULFILLMENT, side_effect=complete_order) as mocked:
+            call_command('fulfill_orders', once=True)
+            self.assertEqual(mocked.call_count, 1)
+
+        job = FulfillmentJob.objects.get(id=job.id)
+        self.assertEqual(job.status, FulfillmentJob.COMPLETE)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(Order.objects.get(id=self.order.id).status, ORDER.COMPLETE)
+
+    def test_fulfillment_failure(self):
+        """ Jobs whose fulfillment attempt raises an exception should be marked failed. """
+        job = queue.enqueue(self.order)
+
+        with mock.patch(SYNCHRONOUS_FULFILLMENT, side_effect=Exception):
+            call_command('fulfill_orders', once=True)
+
+        self.assertEqual(FulfillmentJob.objects.get(id=job.id).status, FulfillmentJob.FAILED)
+
+    def test_expired_lease(self):
+        """ Jobs held by a worker for longer than the lease should be claimable by another worker. """
+        job = queue.enqueue(self.order)
+        self.assertEqual(queue.claim(), job)
+        self.assertIsNone(queue.claim())
+
+        expired = timezone.now() - datetime.timedelta(hours=1)
+        FulfillmentJob.objects.filter(id=job.id).update(date_updated=expired)
+        self.assertEqual(queue.claim(), job)
+        self.assertEqual(FulfillmentJob.objects.get(id=job.id).attempts, 2)
+
+    def test_renew(self):
+        """ Renewing the lease on a job should prevent other workers from claiming it. """
+        job = queue.enqueue(self.order)
+        self.assertEqual(queue.claim(), job)
+
+        expired = timezone.now() - datetime.timedelta(hours=1)
+        FulfillmentJob.objects.filter(id=job.id).update(date_updated=expired)
+        queue.renew(job)
+        self.assertIsNone(queue.claim())
+
+    @override_settings(FULFILLMENT_JOB_LEASE=0.3)
+    def test_heartbeat(self):
+        """ The lease on a job should be renewed while the job runs. """
+        job = queue.enqueue(self.order)
+
+        with mock.patch('ecommerce.extensions.fulfillment.queue.renew') as renew:
+            with queue.heartbeat(job):
+                time.sleep(0.25)
+            self.assertTrue(renew.called)
+
+
+class RetryFulfillmentTests(TestCase):
+    def setUp(self):
+        super(RetryFulfillmentTests, self).setUp()
+        self.order = factories.create_order()
+        self.order.status = ORDER.FULFILLMENT_ERROR
+        self.order.next_fulfillment_attempt = timezone.now()
+        self.order.save()
+
+    def test_retry_fulfillment(self):
+        """ Orders due for a retry should be retried, and orders not yet due left alone. """
+        not_due = factories.create_order()
+        not_due.status = ORDER.FULFILLMENT_ERROR
+        not_due.next_fulfillment_attempt = timezone.now() + datetime.timedelta(hours=1)
+        not_due.save()
+
+        with mock.patch(RETRIED_FULFILLMENT, side_effect=complete_order) as mocked:
+            call_command('retry_fulfillment', once=True, concurrency=1)
+            self.assertEqual(mocked.call_count, 1)
+
+        self.assertEqual(Order.objects.get(id=self.order.id).status, ORDER.COMPLETE)
+        self.assertEqual(Order.objects.get(id=not_due.id).status, ORDER.FULFILLMENT_ERROR)
+
+    @override_settings(FULFILLMENT_RETRY_BACKOFF=60, FULFILLMENT_RETRY_MAX_ATTEMPTS=3)
+    def test_retry_failure(self):
+        """ Orders whose retry raises an exception should have the attempt counted, and their next retry backed off. """
+        with mock.patch(RETRIED_FULFILLMENT, side_effect=Exception):
+            call_command('retry_fulfillment', once=True, concurrency=1)
+
+        order = Order.objects.get(id=self.order.id)
+        self.assertEqual(order.status, ORDER.FULFILLMENT_ERROR)
+        self.assertEqual(order.fulfillment_attempts, 1)
+        expected = timezone.now() + datetime.timedelta(seconds=60)
+        self.assertAlmostEqual(order.next_fulfillment_attempt, expected, delta=datetime.timedelta(seconds=5))
+
+
+class BulkRetryFulfillmentTests(TestCase):
+    def setUp(self):
+        super(BulkRetryFulfillmentTests, self).setUp()
+        self.orders = [factories.create_order() for _ in xrange(2)]
+        for order in self.orders:
+            order.status = ORDER.FULFILLMENT_ERROR
+            order.save()
+
+    def test_bulk_retry_fulfillment(self):
+        """ The selected orders should be retried, and the result of each retry written, followed by a summary. """
+        out = StringIO()
+        with mock.patch(BULK_RETRIED_FULFILLMENT, side_effect=complete_order):
+            call_command('bulk_retry_fulfillment', numbers=self.orders[0].number, concurrency=1, stdout=out)
+
+        self.assertEqual(
+            [json.loads(line) for line in out.getvalue().splitlines()],
+            [
+                {'number': self.orders[0].number, 'status': ORDER.COMPLETE},
+                {'total': 1, 'complete': 1, 'failed': 0},
+            ]
+        )
+        self.assertEqual(Order.objects.get(id=self.orders[1].id).status, ORDER.FULFILLMENT_ERROR)
+
+
+class ReapBasketsTests(TestCase):
+    def setUp(self):
+        super(ReapBasketsTests, self).setUp()
+        self.user = factories.UserFactory()
+
+    def _create_basket(self, status, age_in_days=30, owner=None):
+        basket = Basket.objects.create(owner=owner or self.user, status=status)
+        Basket.objects.filter(id=basket.id).update(date_created=timezone.now() - datetime.timedelta(days=age_in_days))
+        return basket
+
+    def _reap(self, **options):
+        options.setdefault('sleep', 0)
+        call_command('reap_baskets', **options)
+
+    def test_reap(self):
+        """ Old frozen, merged, submitted and abandoned open baskets should be deleted, along with their lines. """
+        order = factories.create_order()
+        submitted = order.basket
+        Basket.objects.filter(id=submitted.id).update(
+            owner=self.user, status=Basket.SUBMITTED, date_created=timezone.now() - datetime.timedelta(days=30)
+        )
+        self.assertTrue(submitted.lines.exists())
+        abandoned = self._create_basket(Basket.OPEN)
+        reaped = [self._create_basket(status) for status in (Basket.FROZEN, Basket.MERGED)] + [submitted, abandoned]
+
+        kept = [
+            self._create_basket(Basket.SAVED),
+            self._create_basket(Basket.SUBMITTED, age_in_days=1),
+            # The user's most recent editable basket may yet be used.
+            self._create_basket(Basket.OPEN),
+        ]
+
+        self._reap(chunk_size=2)
+
+        self.assertEqual(set(Basket.objects.all()), set(kept))
+        self.assertFalse(Basket.objects.filter(id__in=[basket.id for basket in reaped]).exists())
+        self.assertIsNone(Order.objects.get(id=order.id).basket)
+
+    def test_newer_uneditable_basket(self):
+        """ An old open basket should be kept if its owner's newer baskets are not editable. """
+        kept = self._create_basket(Basket.OPEN)
+        self._create_basket(Basket.SUBMITTED, age_in_days=1)
+        self._create_basket(Basket.FROZEN, age_in_days=1)
+
+        self._reap()
+        self.assertIn(kept, Basket.objects.all())
+
+    def test_start_id(self):
+        """ Baskets preceding the start ID should not be deleted. """
+        skipped = self._create_basket(Basket.SUBMITTED)
+        self._create_basket(Basket.SUBMITTED)
+
+        self._reap(start_id=skipped.id)
+        self.assertEqual(list(Basket.objects.all()), [skipped])
+
+    def test_dry_run(self):
+        """ No baskets should be deleted during a dry run. """
+        basket = self._create_basket(Basket.SUBMITTED)
+        self._reap(dry_run=True)
+        self.assertEqual(list(Basket.objects.all()), [basket])
@@ -2,7 +2,7 @@ import ddt
 from django.test import TestCase
 from oscar.test import factories
 
-from ecommerce.extensions.fulfillment.status import ORDER
+from ecommerce.extensions.fulfillment.status import LINE, ORDER
 
 
 @ddt.ddt
@@ -24,3 +24,48 @@ class OrderTests(TestCase):
         self.order.status = status
         self.order.save()
         self.assertFalse(self.order.can_retry_fulfillment)
+
+
+class SetLineStatusesTests(TestCase):
+    def setUp(self):
+        super(SetLineStatusesTests, self).setUp()
+        basket = factories.create_basket(empty=True)
+        for _ in xrange(3):
+            product = factories.create_product()
+            factories.create_stockrecord(product, num_in_stock=2)
+            basket.add_product(product)
+
+        self.order = factories.create_order(basket=basket)
+        self.order.lines.update(status=LINE.PAID)
+        self.lines = list(self.order.lines.all())
+
+    def test_set_line_statuses(self):
+        """ Lines should be updated with one query per distinct status, and the aggregate status returned. """
+        statuses = {
+            self.lines[0]: LINE.COMPLETE,
+            self.lines[1]: LINE.COMPLETE,
+            self.lines[2]: LINE.FULFILLMENT_NETWORK_ERROR,
+        }
+
+        # One UPDATE per distinct status, and one recording the change to the order.
+        with self.assertNumQueries(3):
+            order_status = self.order.set_line_statuses(self.lines, statuses)
+
+        self.assertEqual(order_status, ORDER.FULFILLMENT_ERROR)
+        self.assertEqual([line.status for line in self.lines], [statuses[line] for line in self.lines])
+        self.assertEqual([line.status for line in self.order.lines.all()], [statuses[line] for line in self.lines])
+
+        with self.assertNumQueries(2):
+            order_status = self.order.set_line_statuses(self.lines, {self.lines[2]: LINE.COMPLETE})
+        self.assertEqual(order_status, ORDER.COMPLETE)
+
+    def test_invalid_transition(self):
+        """ Lines whose transitions are not permitted should be left unchanged, and the others changed. """
+        order_status = self.order.set_line_statuses(
+            self.lines, {self.lines[0]: LINE.COMPLETE, self.lines[1]: LINE.REFUNDED, self.lines[2]: LINE.COMPLETE}
+        )
+
+        self.assertEqual(order_status, ORDER.FULFILLMENT_ERROR)
+        self.assertEqual(
+            [line.status for line in self.order.lines.all()], [LINE.COMPLETE, LINE.PAID, LINE.COMPLETE]
+        )
@@ -87,3 +87,27 @@ class EventHandlerTests(TestCase):
         self.assertEqual(shipping_event.order.id, order.id)
         self.assertEqual(shipping_event.lines.count(), 1)
         self.assertEqual(shipping_event.lines.first().id, lines[1].id)
+
+    def test_create_shipping_event_queries(self):
+        """ Shipping events should be created with a constant number of queries, regardless of the number of lines. """
+        basket = factories.create_basket(empty=True)
+        for _ in xrange(3):
+            product = factories.create_product()
+            factories.create_stockrecord(product, num_in_stock=2)
+            basket.add_product(product)
+
+        order = factories.create_order(basket=basket)
+        order.lines.update(status=LINE.COMPLETE)
+        lines = list(order.lines.all())
+
+        # One query determines which lines have already been shipped, one inserts the event, and one its lines.
+        with self.assertNumQueries(3):
+            EventHandler().create_shipping_event(order, self.shipping_event_type, lines, [1, 1, 1])
+        self.assertEqual(order.shipping_events.get().lines.count(), 3)
+
+        # None of the lines qualifies once they have all been shipped, so no event should be written.
+        with self.assertNumQueries(1):
+            self.assertIsNone(
+                EventHandler().create_shipping_event(order, self.shipping_event_type, lines, [1, 1, 1])
+            )
+        self.assertEqual(order.shipping_events.count(), 1)
@@ -1,5 +1,22 @@
+from django.db.models.signals import post_delete, post_save
 from oscar.apps.partner import config
+from oscar.core.loading import get_model
 
 
 class PartnerConfig(config.PartnerConfig):
     name = 'ecommerce.extensions.partner'
+
+    def ready(self):
+        super(PartnerConfig, self).ready()
+
+        from ecommerce.extensions.partner.strategy import invalidate_purchase_info
+
+        # Changes to any of these models may alter the purchase info of a product.
+        models = [
+            get_model('catalogue', 'Product'),
+            get_model('catalogue', 'ProductClass'),
+            get_model('partner', 'StockRecord'),
+        ]
+        for model in models:
+            post_save.connect(invalidate_purchase_info, sender=model, dispatch_uid='partner.purchase_info.save')
+            post_delete.connect(invalidate_purchase_info, sender=model, dispatch_uid='partner.purchase_info.delete')
@@ -0,0 +1,98 @@
+"""Pricing and availability strategies."""
+import time
+
+from django.conf import settings
+from django.db.models import Q
+from oscar.apps.partner import strategy
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.caching import SharedVersion
+
+
+Product = get_model('catalogue', 'Product')
+ProductClass = get_model('catalogue', 'ProductClass')
+
+
+class PurchaseInfoCache(object):
+    """Process-local cache of purchase info (price, availability and stock record), keyed by product ID.
+
+    Each product's purchase info has a version, a token stored in the shared cache. Entries record the
+    version under which they were computed, and are only served while it's current. Saving or deleting a
+    product, product class or stock record replaces the versions of the products affected, so that every
+    process computes their purchase info afresh. Entries also expire after PURCHASE_INFO_CACHE_TTL seconds.
+    """
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, product_id):
+        """Return the cached purchase info for a product, if any, and the current version of its purchase info.
+
+        Purchase info computed in place of a missing entry should be cached under the version returned, which
+        is read before the purchase info is computed, rather than after.
+
+        Returns:
+            tuple: The purchase info, or None if not cached, and the version.
+        """
+        version = self._get_version(product_id).get()
+        entry = self._entries.get(product_id)
+        if entry is not None:
+            expires_at, entry_version, purchase_info = entry
+            if entry_version == version and time.time() < expires_at:
+                return purchase_info, version
+        return None, version
+
+    def set(self, product_id, version, purchase_info):
+        """Cache purchase info for a product, computed under the given version."""
+        self._entries[product_id] = (time.time() + settings.PURCHASE_INFO_CACHE_TTL, version, purchase_info)
+
+    def invalidate(self, product_ids):
+        """Discard the purchase info of the given products, in this and all other processes."""
+        for product_id in product_ids:
+            self._entries.pop(product_id, None)
+            self._get_version(product_id).bump()
+
+    def _get_version(self, product_id):
+        return SharedVersion('partner.purchase_info.{}.version'.format(product_id))
+
+
+purchase_info_cache = PurchaseInfoCache()
+
+
+def invalidate_purchase_info(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """Signal receiver discarding the purchase info of the products affected by a change to a catalog object."""
+    if isinstance(instance, ProductClass):
+        # Child products take their product class from their parents.
+        products = Product.objects.filter(Q(product_class=instance) | Q(parent__product_class=instance))
+        product_ids = products.values_list('id', flat=True)
+    elif isinstance(instance, Product):
+        product_ids = [instance.id] + list(Product.objects.filter(parent_id=instance.id).values_list('id', flat=True))
+    else:
+        product_ids = [instance.product_id]
+
+    purchase_info_cache.invalidate(product_ids)
+
+
+class Default(strategy.Default):
+    """Oscar's default strategy, with purchase info for products which don't track stock cached.
+
+    The default strategy charges no tax and doesn't depend on the user, so purchase info can be shared
+    between requests. Availability of products tracking stock changes as orders are placed; purchase
+    info for these products is always computed afresh.
+    """
+    def fetch_for_product(self, product, stockrecord=None):
+        product_class = product.get_product_class()
+        if stockrecord is not None or product_class is None or product_class.track_stock:
+            return super(Default, self).fetch_for_product(product, stockrecord=stockrecord)
+
+        purchase_info, version = purchase_info_cache.get(product.id)
+        if purchase_info is None:
+            purchase_info = super(Default, self).fetch_for_product(product)
+            purchase_info_cache.set(product.id, version, purchase_info)
+
+        return purchase_info
+
+
+class Selector(object):
+    """Selects the strategy used to price products and determine their availability."""
+    def strategy(self, request=None, user=None, **kwargs):  # pylint: disable=unused-argument
+        return Default(request)
@@ -0,0 +1,51 @@
+"""Tests of the pricing and availability strategies."""
+from decimal import Decimal as D
+
+from django.core.cache import cache
+from django.test import TestCase
+from oscar.test import factories
+
+from ecommerce.extensions.partner.strategy import Selector
+
+
+class DefaultStrategyTests(TestCase):
+    def setUp(self):
+        super(DefaultStrategyTests, self).setUp()
+        self.strategy = Selector().strategy()
+        product_class = factories.ProductClassFactory(name='Seat', track_stock=False)
+        self.product = factories.ProductFactory(product_class=product_class, stockrecords__price_excl_tax=D('10.00'))
+
+    def test_purchase_info_cached(self):
+        """ Purchase info for products not tracking stock should be computed once. """
+        purchase_info = self.strategy.fetch_for_product(self.product)
+        self.assertTrue(purchase_info.availability.is_available_to_buy)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(Selector().strategy().fetch_for_product(self.product), purchase_info)
+
+    def test_purchase_info_invalidated(self):
+        """ Saving a stock record should cause purchase info to be computed afresh. """
+        self.strategy.fetch_for_product(self.product)
+
+        stockrecord = self.product.stockrecords.get()
+        stockrecord.price_excl_tax = D('20.00')
+        stockrecord.save()
+
+        self.assertEqual(self.strategy.fetch_for_product(self.product).price.excl_tax, D('20.00'))
+
+    def test_purchase_info_invalidated_by_other_process(self):
+        """ A change to the product's version in the shared cache should cause purchase info to be computed afresh. """
+        purchase_info = self.strategy.fetch_for_product(self.product)
+
+        # Simulate another process changing the product.
+        cache.set('partner.purchase_info.{}.version'.format(self.product.id), 'changed-elsewhere')
+
+        self.assertIsNot(self.strategy.fetch_for_product(self.product), purchase_info)
+
+    def test_stock_tracked(self):
+        """ Purchase info for products tracking stock should not be cached. """
+        product = factories.ProductFactory(product_class=factories.ProductClassFactory(name='Book', track_stock=True))
+        self.strategy.fetch_for_product(product)
+
+        with self.assertNumQueries(1):
+            self.strategy.fetch_for_product(product)
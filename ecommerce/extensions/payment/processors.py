@@ -16,6 +16,7 @@ from ecommerce.extensions.payment.errors import (
 )
 from ecommerce.extensions.payment.constants import CybersourceConstants as CS
 from ecommerce.extensions.payment.constants import ProcessorConstants as PC
+from ecommerce.extensions.fulfillment.context import FulfillmentContext
 from ecommerce.extensions.fulfillment.status import ORDER
 
 
@@ -435,16 +436,26 @@ class SingleSeatCybersource(Cybersource):
         # receipt page supports donations, cohorts, and other products, we will need a generic URL that can be
         # constructed simply from the order number.
         # This issue should be resolved by completing JIRA Ticket XCOM-202
-        line = order.lines.all()[0]
-        if line and line.product.get_product_class().name == 'Seat':
-            course_key = line.product.attribute_values.get(attribute__name="course_key").value
-            return "{base_url}{course_key}/?payment-order-num={order_number}".format(
-                base_url=self.receipt_page_url, course_key=course_key, order_number=order.number
-            )
-        else:
-            msg = (
-                u'Cannot construct a receipt URL for order [{order_number}]. Receipt page only supports Seat products.'
-                .format(order_number=order.number)
-            )
-            logger.error(msg)
-            raise UnsupportedProductError(msg)
+        line = order.lines.first()
+        if line:
+            context = FulfillmentContext([line])
+            product_class = context.get_product_class(line)
+            if product_class and product_class.name == 'Seat':
+                course_key = context.get_attributes(line).get('course_key')
+                if course_key:
+                    return "{base_url}{course_key}/?payment-order-num={order_number}".format(
+                        base_url=self.receipt_page_url, course_key=course_key, order_number=order.number
+                    )
+
+                msg = u'Cannot construct a receipt URL for order [{order_number}]. Its seat has no course key.'.format(
+                    order_number=order.number
+                )
+                logger.error(msg)
+                raise UnsupportedProductError(msg)
+
+        msg = (
+            u'Cannot construct a receipt URL for order [{order_number}]. Receipt page only supports Seat products.'
+            .format(order_number=order.number)
+        )
+        logger.error(msg)
+        raise UnsupportedProductError(msg)
@@ -172,6 +172,14 @@ class CybersourceParameterGenerationTests(CybersourceTests):
             self.order
         )
 
+    @raises(UnsupportedProductError)
+    def test_receipt_error_without_course_key(self):
+        """Test that a single seat CyberSource processor won't construct a receipt for a seat without a course key. """
+        self.attribute_value.delete()
+        self._assert_order_parameters(
+            self.order
+        )
+
     @raises(ExcessiveMerchantDefinedData)
     def test_excessive_merchant_defined_data(self):
         """Test that excessive merchant-defined data is not accepted."""
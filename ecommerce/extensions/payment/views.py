@@ -5,6 +5,7 @@ from django.views.generic import View
 from oscar.apps.checkout.mixins import OrderPlacementMixin
 from oscar.apps.payment.models import SourceType
 
+from ecommerce.extensions.caching import ReferenceCache
 from ecommerce.extensions.order.models import Order
 from ecommerce.extensions.fulfillment.status import ORDER
 from ecommerce.extensions.fulfillment.mixins import FulfillmentMixin
@@ -12,6 +13,9 @@ from ecommerce.extensions.payment.constants import ProcessorConstants as PC
 from ecommerce.extensions.payment.helpers import get_processor_class
 
 
+source_types = ReferenceCache(SourceType, 'name')
+
+
 class CybersourceResponseView(View, OrderPlacementMixin, FulfillmentMixin):
     """
     Accept response from the processor and fulfill the request
@@ -47,7 +51,7 @@ class CybersourceResponseView(View, OrderPlacementMixin, FulfillmentMixin):
         """
 
         # get the source
-        source_type, _ = SourceType.objects.get_or_create(name=processor_name)
+        source_type, _ = source_types.get_or_create(processor_name)
         source = source_type.sources.model(
             source_type=source_type, amount_allocated=order.total_excl_tax, currency=order.currency
         )
@@ -0,0 +1,77 @@
+"""Tests of the reference data cache."""
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.test import TestCase, override_settings
+from oscar.core.loading import get_model
+
+from ecommerce.extensions.caching import ReferenceCache
+
+
+ShippingEventType = get_model('order', 'ShippingEventType')
+
+
+@override_settings(REFERENCE_DATA_VERSION_CHECK_INTERVAL=0)
+class ReferenceCacheTests(TestCase):
+    def setUp(self):
+        super(ReferenceCacheTests, self).setUp()
+        self.shipping_event_types = ReferenceCache(ShippingEventType, 'name')
+        self.shipped = ShippingEventType.objects.create(code='shipped', name='Shipped')
+        # Treat the row as created by an earlier, committed request.
+        request_finished.send(sender=self.__class__)
+
+    def test_get(self):
+        """ Rows should be fetched once, then served from memory. """
+        self.assertEqual(self.shipping_event_types.get('Shipped'), self.shipped)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.shipping_event_types.get('Shipped'), self.shipped)
+
+        with self.assertRaises(ShippingEventType.DoesNotExist):
+            self.shipping_event_types.get('Returned')
+
+    def test_get_or_create(self):
+        """ Missing rows should be created. """
+        self.assertEqual(self.shipping_event_types.get_or_create('Shipped'), (self.shipped, False))
+
+        returned, created = self.shipping_event_types.get_or_create('Returned')
+        self.assertTrue(created)
+        self.assertEqual(self.shipping_event_types.get('Returned'), returned)
+
+    def test_changed_within_transaction(self):
+        """ Rows should not be cached while the model has been changed within the open transaction. """
+        returned, _ = self.shipping_event_types.get_or_create('Returned')
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.shipping_event_types.get('Returned'), returned)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.shipping_event_types.get('Returned'), returned)
+
+        # The version should be replaced again once the request has finished.
+        version = cache.get('reference.order.shippingeventtype.version')
+        request_finished.send(sender=self.__class__)
+        self.assertNotEqual(cache.get('reference.order.shippingeventtype.version'), version)
+
+        self.shipping_event_types.get('Returned')
+        with self.assertNumQueries(0):
+            self.shipping_event_types.get('Returned')
+
+    def test_invalidation(self):
+        """ Saving a row should empty the cache. """
+        self.shipping_event_types.get('Shipped')
+
+        self.shipped.name = 'Sent'
+        self.shipped.save()
+
+        self.assertEqual(self.shipping_event_types.get('Sent'), self.shipped)
+        with self.assertRaises(ShippingEventType.DoesNotExist):
+            self.shipping_event_types.get('Shipped')
+
+    def test_invalidation_by_other_process(self):
+        """ A change to the version token in the shared cache should empty the cache. """
+        self.shipping_event_types.get('Shipped')
+
+        # Simulate another process changing the data.
+        cache.set('reference.order.shippingeventtype.version', 'changed-elsewhere')
+
+        with self.assertNumQueries(1):
+            self.shipping_event_types.get('Shipped')
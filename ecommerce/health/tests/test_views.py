@@ -6,18 +6,23 @@ import mock
 from requests import Response
 from requests.exceptions import RequestException
 from rest_framework import status
+from django.core.cache import cache
 from django.test import TestCase
 from django.db import DatabaseError
 from django.core.urlresolvers import reverse
 
 from ecommerce.health.constants import Status
+from ecommerce.outbound.breaker import get_breaker
+from ecommerce.outbound.client import client
 
 
-@mock.patch('requests.get')
+@mock.patch('ecommerce.outbound.client.client.get')
 class HealthTests(TestCase):
     """Tests of the health endpoint."""
     def setUp(self):
         self.fake_lms_response = Response()
+        cache.clear()
+        client.endpoint_stats.reset()
 
         # Override all loggers, suppressing logging calls of severity CRITICAL and below
         logging.disable(logging.CRITICAL)
@@ -68,7 +73,33 @@ class HealthTests(TestCase):
             Status.UNAVAILABLE
         )
 
-    def _assert_health(self, status_code, overall_status, database_status, lms_status):
+    def test_open_circuit_breaker(self, mock_lms_request):
+        """Test that the endpoint reports open circuit breakers, without reporting the front-end as unavailable."""
+        self.fake_lms_response.status_code = status.HTTP_200_OK
+        mock_lms_request.return_value = self.fake_lms_response
+
+        breaker = get_breaker('enrollment')
+        with self.settings(OUTBOUND_BREAKER_FAILURE_THRESHOLD=1):
+            breaker.record_failure()
+
+        self._assert_health(status.HTTP_200_OK, Status.OK, Status.OK, Status.OK, breaker_state='open')
+
+    def test_outbound_call_stats(self, mock_lms_request):
+        """Test that the endpoint reports the counters recorded for calls to other services."""
+        self.fake_lms_response.status_code = status.HTTP_200_OK
+        mock_lms_request.return_value = self.fake_lms_response
+
+        client.endpoint_stats.record('enrollment', 0.5, error=True)
+        outbound_calls = {
+            'enrollment': {
+                'calls': 1, 'errors': 1, 'retries': 0, 'rejected': 0, 'total_latency': 0.5, 'max_latency': 0.5
+            }
+        }
+
+        self._assert_health(status.HTTP_200_OK, Status.OK, Status.OK, Status.OK, outbound_calls=outbound_calls)
+
+    def _assert_health(self, status_code, overall_status, database_status, lms_status, breaker_state='closed',
+                       outbound_calls=None):
         """Verify that the response matches expectations."""
         response = self.client.get(reverse('health'))
         self.assertEqual(response.status_code, status_code)
@@ -79,6 +110,10 @@ class HealthTests(TestCase):
             'detailed_status': {
                 'database_status': database_status,
                 'lms_status': lms_status
-            }
+            },
+            'circuit_breakers': {
+                'enrollment': breaker_state
+            },
+            'outbound_calls': outbound_calls or {},
         }
         self.assertDictEqual(json.loads(response.content), expected_data)
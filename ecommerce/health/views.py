@@ -1,7 +1,6 @@
 """HTTP endpoint for verifying the health of the ecommerce front-end."""
 import logging
 
-import requests
 from requests.exceptions import RequestException
 from rest_framework import status
 from django.conf import settings
@@ -9,6 +8,8 @@ from django.db import transaction, connection, DatabaseError
 from django.http import JsonResponse
 
 from ecommerce.health.constants import Status, UnavailabilityMessage
+from ecommerce.outbound.breaker import breakers
+from ecommerce.outbound.client import client
 
 
 logger = logging.getLogger(__name__)
@@ -21,7 +22,10 @@ def health(_):
     """Allows a load balancer to verify that the ecommerce front-end service is up.
 
     Checks the status of the database connection and the LMS, the two services
-    on which the ecommerce front-end currently depends.
+    on which the ecommerce front-end currently depends. Also reports the state of
+    each circuit breaker guarding calls to other services, and this process' call,
+    error and latency counters for each endpoint of those services; neither an open
+    breaker nor failing calls make the front-end unavailable.
 
     Returns:
         HttpResponse: 200 if the ecommerce front-end is available, with JSON data
@@ -34,7 +38,10 @@ def health(_):
         >>> response.status_code
         200
         >>> response.content
-        '{"overall_status": "OK", "detailed_status": {"database_status": "OK", "lms_status": "OK"}}'
+        '{"overall_status": "OK", "detailed_status": {"database_status": "OK", "lms_status": "OK"},
+          "circuit_breakers": {"enrollment": "closed"},
+          "outbound_calls": {"enrollment": {"calls": 12, "errors": 1, "retries": 0, "rejected": 0,
+                                            "total_latency": 1.73, "max_latency": 0.41}}}'
     """
     overall_status = database_status = lms_status = Status.UNAVAILABLE
 
@@ -48,7 +55,8 @@ def health(_):
         database_status = Status.UNAVAILABLE
 
     try:
-        response = requests.get(LMS_HEALTH_PAGE)
+        # Health checks are not retried, so that they reflect the LMS' current state, and finish promptly.
+        response = client.get(LMS_HEALTH_PAGE, endpoint='lms_health', idempotent=False)
 
         if response.status_code == status.HTTP_200_OK:
             lms_status = Status.OK
@@ -67,6 +75,8 @@ def health(_):
             'database_status': database_status,
             'lms_status': lms_status,
         },
+        'circuit_breakers': {name: breaker.state() for name, breaker in breakers.items()},
+        'outbound_calls': client.stats(),
     }
 
     if overall_status == Status.OK:
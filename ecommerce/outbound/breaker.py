@@ -0,0 +1,109 @@
+"""Circuit breakers for calls made to other services, with state shared by all processes via the cache.
+
+While a service is degraded, calls to it fail slowly, each waiting out its timeout. A breaker counts the
+failures of calls to a service. Once OUTBOUND_BREAKER_FAILURE_THRESHOLD consecutive calls have failed (within
+OUTBOUND_BREAKER_FAILURE_WINDOW seconds), the breaker opens, and calls made through it fail immediately, raising
+CircuitOpenError. After OUTBOUND_BREAKER_RESET_TIMEOUT seconds, the breaker is half-open: a single call, made by
+any process, is let through to probe the service. The breaker closes if the probe succeeds, and opens again if
+it fails.
+
+Example:
+    >>> from ecommerce.outbound.breaker import get_breaker
+    >>> breaker = get_breaker('enrollment')
+    >>> response = client.post(url, endpoint='enrollment', breaker=breaker, data=data)
+    >>> breaker.state()
+    'closed'
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from requests.exceptions import ConnectionError
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised in place of making a call through an open circuit breaker."""
+    pass
+
+
+class CircuitBreaker(object):
+    """Circuit breaker guarding calls to a single service."""
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, name):
+        self.name = name
+        self._failures_key = 'outbound.breaker.{}.failures'.format(name)
+        self._opened_at_key = 'outbound.breaker.{}.opened_at'.format(name)
+        self._probe_key = 'outbound.breaker.{}.probe'.format(name)
+
+    def allow_request(self):
+        """Return True if a call may be made through the breaker."""
+        opened_at = cache.get(self._opened_at_key)
+        if opened_at is None:
+            return True
+        if time.time() - opened_at < settings.OUTBOUND_BREAKER_RESET_TIMEOUT:
+            return False
+
+        # The breaker is half-open. Only the first process to ask is allowed to probe the service. Should
+        # that process die before finishing its call, another is allowed to probe once the key expires.
+        return cache.add(self._probe_key, True, settings.OUTBOUND_BREAKER_RESET_TIMEOUT)
+
+    def record_success(self):
+        """Record a successful call, closing the breaker."""
+        state = cache.get_many([self._failures_key, self._opened_at_key])
+        if not state:
+            # The breaker is closed, with no failures to forget; nothing needs to be written.
+            return
+
+        if self._opened_at_key in state:
+            logger.info("Closing circuit breaker [%s]", self.name)
+        cache.delete_many([self._failures_key, self._opened_at_key, self._probe_key])
+
+    def record_failure(self):
+        """Record a failed call, opening the breaker if too many calls have failed."""
+        cache.add(self._failures_key, 0, settings.OUTBOUND_BREAKER_FAILURE_WINDOW)
+        try:
+            failures = cache.incr(self._failures_key)
+        except ValueError:
+            # The count expired after being added.
+            failures = 1
+            cache.set(self._failures_key, failures, settings.OUTBOUND_BREAKER_FAILURE_WINDOW)
+
+        # A failed probe opens the breaker again, regardless of the number of failures.
+        if failures >= settings.OUTBOUND_BREAKER_FAILURE_THRESHOLD or cache.get(self._opened_at_key) is not None:
+            logger.warning("Opening circuit breaker [%s] after [%d] consecutive failures", self.name, failures)
+            cache.set(self._opened_at_key, time.time(), None)
+            cache.delete(self._probe_key)
+
+    def state(self):
+        """Return the state of the breaker: CLOSED, OPEN or HALF_OPEN."""
+        opened_at = cache.get(self._opened_at_key)
+        if opened_at is None:
+            return self.CLOSED
+        elif time.time() - opened_at < settings.OUTBOUND_BREAKER_RESET_TIMEOUT:
+            return self.OPEN
+        else:
+            return self.HALF_OPEN
+
+    def reset(self):
+        """Close the breaker, and forget any failures."""
+        cache.delete_many([self._failures_key, self._opened_at_key, self._probe_key])
+
+
+_lock = threading.Lock()
+breakers = {}
+
+
+def get_breaker(name):
+    """Return the circuit breaker with the given name, creating it if necessary."""
+    with _lock:
+        if name not in breakers:
+            breakers[name] = CircuitBreaker(name)
+        return breakers[name]
@@ -0,0 +1,186 @@
+"""Shared HTTP client for calls made to other services (e.g., the LMS and the OAuth2 provider).
+
+All outbound calls should be made through the module-level client, which:
+
+    * reuses keep-alive connections, pooled per host, rather than opening a connection per call;
+    * applies default connect and read timeouts to every call;
+    * retries idempotent calls failing due to connection errors, timeouts, or 502, 503 or 504 responses,
+      waiting a random (jittered), exponentially growing interval between attempts;
+    * optionally fails calls fast, through a circuit breaker, while the service called is degraded; and
+    * counts calls, errors and calls rejected by circuit breakers, and records latency, per named endpoint,
+      reporting these counters through the health endpoint.
+
+Example:
+    >>> from ecommerce.outbound.client import client
+    >>> response = client.get('https://lms.example.com/heartbeat', endpoint='lms_health')
+    >>> client.stats()['lms_health']
+    {'calls': 1, 'errors': 0, 'retries': 0, 'rejected': 0, 'total_latency': 0.042, 'max_latency': 0.042}
+"""
+import logging
+import random
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, Timeout
+
+from ecommerce.outbound.breaker import CircuitOpenError
+
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+RETRIED_STATUS_CODES = frozenset([502, 503, 504])
+
+
+class EndpointStats(object):
+    """Thread-safe, process-local call, error and latency counters, per endpoint."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, endpoint, latency, error=False, retry=False):
+        with self._lock:
+            stats = self._get(endpoint)
+            stats['calls'] += 1
+            stats['errors'] += int(error)
+            stats['retries'] += int(retry)
+            stats['total_latency'] += latency
+            stats['max_latency'] = max(stats['max_latency'], latency)
+
+    def record_rejection(self, endpoint):
+        with self._lock:
+            self._get(endpoint)['rejected'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {endpoint: dict(stats) for endpoint, stats in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    def _get(self, endpoint):
+        return self._stats.setdefault(
+            endpoint, {'calls': 0, 'errors': 0, 'retries': 0, 'rejected': 0, 'total_latency': 0.0, 'max_latency': 0.0}
+        )
+
+
+class OutboundClient(object):
+    """HTTP client backed by a single requests Session with pooled connections."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._session = None
+        self.endpoint_stats = EndpointStats()
+
+    @property
+    def session(self):
+        # The session is created on first use, so that settings may be overridden before then (e.g., by tests).
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=settings.OUTBOUND_HTTP_POOL_CONNECTIONS,
+                        pool_maxsize=settings.OUTBOUND_HTTP_POOL_MAXSIZE,
+                    )
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+
+    def get(self, url, endpoint, **kwargs):
+        return self.request('GET', url, endpoint, **kwargs)
+
+    def post(self, url, endpoint, **kwargs):
+        return self.request('POST', url, endpoint, **kwargs)
+
+    def request(self, method, url, endpoint, idempotent=None, breaker=None, expected_statuses=(), **kwargs):
+        """Make a request, retrying it if it is idempotent and fails transiently.
+
+        Args:
+            method (str): HTTP method.
+            url (str): URL to request.
+            endpoint (str): Name under which the call is counted (e.g., 'enrollment').
+            idempotent (bool): Whether the request may safely be retried. Defaults to True for
+                GET, HEAD, OPTIONS, PUT and DELETE requests, and False otherwise.
+            breaker (CircuitBreaker): If given, the call is rejected while the breaker is open, and its
+                outcome recorded by the breaker. Connection errors, timeouts and 5xx responses are failures.
+            expected_statuses (tuple): Statuses which the caller handles as a normal outcome (e.g., a 501 response
+                indicating that an optional feature is not supported), and which are therefore neither counted as
+                errors nor recorded as failures, whatever their value.
+            **kwargs: Passed on to requests. If no timeout is given, OUTBOUND_HTTP_TIMEOUT is used.
+
+        Returns:
+            Response: The response to the final attempt.
+
+        Raises:
+            CircuitOpenError: If the breaker is open.
+            RequestException: If the final attempt fails.
+        """
+        if breaker is not None and not breaker.allow_request():
+            self.endpoint_stats.record_rejection(endpoint)
+            raise CircuitOpenError("Circuit breaker [{}] is open".format(breaker.name))
+
+        try:
+            response = self._request(method, url, endpoint, idempotent, expected_statuses, **kwargs)
+        except (ConnectionError, Timeout):
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+
+        if breaker is not None:
+            if response.status_code >= 500 and response.status_code not in expected_statuses:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        return response
+
+    def _request(self, method, url, endpoint, idempotent, expected_statuses, **kwargs):
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        max_retries = settings.OUTBOUND_HTTP_MAX_RETRIES if idempotent else 0
+        kwargs.setdefault('timeout', settings.OUTBOUND_HTTP_TIMEOUT)
+
+        attempt = 0
+        while True:
+            start = time.time()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (ConnectionError, Timeout):
+                retry = attempt < max_retries
+                self._record(endpoint, method, url, start, error=True, retry=retry)
+                if not retry:
+                    raise
+            else:
+                error = response.status_code >= 500 and response.status_code not in expected_statuses
+                retry = attempt < max_retries and response.status_code in RETRIED_STATUS_CODES
+                self._record(endpoint, method, url, start, error=error, retry=retry, status_code=response.status_code)
+                if not retry:
+                    return response
+
+            attempt += 1
+            time.sleep(self._backoff(attempt))
+
+    def stats(self):
+        """Return the counters recorded for each endpoint, keyed by endpoint name."""
+        return self.endpoint_stats.snapshot()
+
+    def _backoff(self, attempt):
+        # "Full jitter": a uniformly random delay, bounded by an exponentially growing ceiling.
+        ceiling = min(settings.OUTBOUND_HTTP_MAX_BACKOFF, settings.OUTBOUND_HTTP_BACKOFF * 2 ** attempt)
+        return random.uniform(0, ceiling)
+
+    def _record(self, endpoint, method, url, start, error, retry, status_code=None):
+        latency = time.time() - start
+        self.endpoint_stats.record(endpoint, latency, error=error, retry=retry)
+        logger.debug(
+            "Outbound call to [%s] (%s %s) finished with status [%s] in [%.3f] seconds%s",
+            endpoint, method, url, status_code, latency, ', retrying' if retry else ''
+        )
+
+
+client = OutboundClient()
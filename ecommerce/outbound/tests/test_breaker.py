@@ -0,0 +1,108 @@
+"""Tests of the outbound circuit breakers."""
+import httpretty
+import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from ecommerce.outbound.breaker import CircuitBreaker, CircuitOpenError
+from ecommerce.outbound.client import OutboundClient
+
+
+URL = 'http://service.example.com/resource/'
+
+
+@override_settings(
+    OUTBOUND_BREAKER_FAILURE_THRESHOLD=2, OUTBOUND_BREAKER_FAILURE_WINDOW=60, OUTBOUND_BREAKER_RESET_TIMEOUT=30
+)
+class CircuitBreakerTests(TestCase):
+    def setUp(self):
+        super(CircuitBreakerTests, self).setUp()
+        cache.clear()
+        self.breaker = CircuitBreaker('service')
+
+    def test_opens_after_consecutive_failures(self):
+        """ The breaker should open once the failure threshold is reached, and not before. """
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state(), CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow_request())
+
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state(), CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_success_resets_failures(self):
+        """ Failures separated by a success should not open the breaker. """
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state(), CircuitBreaker.CLOSED)
+
+    def test_state_shared(self):
+        """ Breakers of the same name, e.g. in other processes, should share state. """
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(CircuitBreaker('service').state(), CircuitBreaker.OPEN)
+        self.assertEqual(CircuitBreaker('other').state(), CircuitBreaker.CLOSED)
+
+    def test_half_open_probe(self):
+        """ After the reset timeout, a single probe should be let through, closing or reopening the breaker. """
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+        with mock.patch('time.time', return_value=self._reset_time()):
+            self.assertEqual(self.breaker.state(), CircuitBreaker.HALF_OPEN)
+            self.assertTrue(self.breaker.allow_request())
+            self.assertFalse(self.breaker.allow_request())
+
+            # A failed probe opens the breaker again.
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state(), CircuitBreaker.OPEN)
+
+        with mock.patch('time.time', return_value=self._reset_time()):
+            self.assertTrue(self.breaker.allow_request())
+            self.breaker.record_success()
+        self.assertEqual(self.breaker.state(), CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow_request())
+
+    def _reset_time(self):
+        """ Return the time at which the breaker becomes half-open. """
+        return cache.get(self.breaker._opened_at_key) + 30  # pylint: disable=protected-access
+
+    @httpretty.activate
+    def test_client_fails_fast(self):
+        """ The client should record failures with the breaker, and reject calls while it's open. """
+        httpretty.register_uri(httpretty.POST, URL, status=500)
+        client = OutboundClient()
+
+        for _ in xrange(2):
+            self.assertEqual(client.post(URL, endpoint='resource', breaker=self.breaker).status_code, 500)
+
+        with self.assertRaises(CircuitOpenError):
+            client.post(URL, endpoint='resource', breaker=self.breaker)
+
+        stats = client.stats()['resource']
+        self.assertEqual((stats['calls'], stats['rejected']), (2, 1))
+
+    @httpretty.activate
+    def test_expected_statuses(self):
+        """ Expected statuses should not be recorded as failures, even if they are 5xx statuses. """
+        httpretty.register_uri(httpretty.POST, URL, status=501)
+        client = OutboundClient()
+
+        for _ in xrange(3):
+            response = client.post(URL, endpoint='resource', breaker=self.breaker, expected_statuses=(501,))
+            self.assertEqual(response.status_code, 501)
+
+        self.assertEqual(self.breaker.state(), CircuitBreaker.CLOSED)
+        self.assertEqual(client.stats()['resource']['errors'], 0)
+
+    def test_success_while_closed(self):
+        """ Successes recorded while the breaker is closed, without failures, should write nothing to the cache. """
+        with mock.patch('django.core.cache.cache.delete_many') as delete_many:
+            self.breaker.record_success()
+        self.assertFalse(delete_many.called)
+
+        self.breaker.record_failure()
+        with mock.patch('django.core.cache.cache.delete_many') as delete_many:
+            self.breaker.record_success()
+        self.assertTrue(delete_many.called)
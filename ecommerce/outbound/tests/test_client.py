@@ -0,0 +1,65 @@
+"""Tests of the shared outbound HTTP client."""
+import httpretty
+import mock
+from django.test import TestCase, override_settings
+from requests.exceptions import ConnectionError
+
+from ecommerce.outbound.client import OutboundClient
+
+
+URL = 'http://service.example.com/resource/'
+
+
+@override_settings(OUTBOUND_HTTP_MAX_RETRIES=2, OUTBOUND_HTTP_BACKOFF=0, OUTBOUND_HTTP_MAX_BACKOFF=0)
+class OutboundClientTests(TestCase):
+    def setUp(self):
+        super(OutboundClientTests, self).setUp()
+        self.client = OutboundClient()
+
+    def _register_responses(self, method, *statuses):
+        httpretty.register_uri(method, URL, responses=[httpretty.Response(body='{}', status=code) for code in statuses])
+
+    @httpretty.activate
+    def test_idempotent_retry(self):
+        """ Idempotent requests should be retried after a 502, 503 or 504 response. """
+        self._register_responses(httpretty.GET, 503, 502, 200)
+
+        response = self.client.get(URL, endpoint='resource')
+
+        self.assertEqual(response.status_code, 200)
+        stats = self.client.stats()['resource']
+        self.assertEqual((stats['calls'], stats['errors'], stats['retries']), (3, 2, 2))
+
+    @httpretty.activate
+    def test_retries_bounded(self):
+        """ The response to the final attempt should be returned once retries are exhausted. """
+        self._register_responses(httpretty.GET, 503, 503, 503, 200)
+        self.assertEqual(self.client.get(URL, endpoint='resource').status_code, 503)
+
+    @httpretty.activate
+    def test_non_idempotent_not_retried(self):
+        """ Non-idempotent requests should not be retried, unless the caller declares them idempotent. """
+        self._register_responses(httpretty.POST, 503, 200, 503, 200)
+
+        self.assertEqual(self.client.post(URL, endpoint='resource').status_code, 503)
+        self.assertEqual(self.client.post(URL, endpoint='resource', idempotent=True).status_code, 200)
+
+    def test_connection_error(self):
+        """ Connection errors should be retried, then raised. """
+        with mock.patch('requests.Session.request', side_effect=ConnectionError) as mocked:
+            with self.assertRaises(ConnectionError):
+                self.client.get(URL, endpoint='resource')
+
+        self.assertEqual(mocked.call_count, 3)
+        self.assertEqual(self.client.stats()['resource']['errors'], 3)
+
+    @override_settings(OUTBOUND_HTTP_TIMEOUT=(1, 2))
+    def test_default_timeout(self):
+        """ Requests should be made with the default timeout, unless another is given, over a shared session. """
+        with mock.patch('requests.Session.request') as mocked:
+            mocked.return_value.status_code = 200
+            self.client.get(URL, endpoint='resource')
+            self.client.get(URL, endpoint='resource', timeout=5)
+
+        self.assertEqual([call[1]['timeout'] for call in mocked.call_args_list], [(1, 2), 5])
+        self.assertIs(self.client.session, self.client.session)
@@ -61,10 +61,35 @@ OSCAR_LINE_STATUS_PIPELINE = {
         LINE.FULFILLMENT_TIMEOUT_ERROR,
         LINE.FULFILLMENT_SERVER_ERROR,
     ),
-    LINE.FULFILLMENT_CONFIGURATION_ERROR: (LINE.COMPLETE, LINE.REFUNDED,),
-    LINE.FULFILLMENT_NETWORK_ERROR: (LINE.COMPLETE, LINE.REFUNDED,),
-    LINE.FULFILLMENT_TIMEOUT_ERROR: (LINE.COMPLETE, LINE.REFUNDED,),
-    LINE.FULFILLMENT_SERVER_ERROR: (LINE.COMPLETE, LINE.REFUNDED,),
+    # A line whose fulfillment is retried may fail again, with a different error.
+    LINE.FULFILLMENT_CONFIGURATION_ERROR: (
+        LINE.COMPLETE,
+        LINE.REFUNDED,
+        LINE.FULFILLMENT_NETWORK_ERROR,
+        LINE.FULFILLMENT_TIMEOUT_ERROR,
+        LINE.FULFILLMENT_SERVER_ERROR,
+    ),
+    LINE.FULFILLMENT_NETWORK_ERROR: (
+        LINE.COMPLETE,
+        LINE.REFUNDED,
+        LINE.FULFILLMENT_CONFIGURATION_ERROR,
+        LINE.FULFILLMENT_TIMEOUT_ERROR,
+        LINE.FULFILLMENT_SERVER_ERROR,
+    ),
+    LINE.FULFILLMENT_TIMEOUT_ERROR: (
+        LINE.COMPLETE,
+        LINE.REFUNDED,
+        LINE.FULFILLMENT_CONFIGURATION_ERROR,
+        LINE.FULFILLMENT_NETWORK_ERROR,
+        LINE.FULFILLMENT_SERVER_ERROR,
+    ),
+    LINE.FULFILLMENT_SERVER_ERROR: (
+        LINE.COMPLETE,
+        LINE.REFUNDED,
+        LINE.FULFILLMENT_CONFIGURATION_ERROR,
+        LINE.FULFILLMENT_NETWORK_ERROR,
+        LINE.FULFILLMENT_TIMEOUT_ERROR,
+    ),
     LINE.COMPLETE: (LINE.REFUNDED,),
     LINE.REFUNDED: (
         LINE.REVOKE_CONFIGURATION_ERROR,
@@ -95,6 +120,29 @@ FULFILLMENT_MODULES = [
     'ecommerce.extensions.fulfillment.modules.EnrollmentFulfillmentModule',
 ]
 
+# Maximum number of enrollment requests made at once while fulfilling a single order.
+ENROLLMENT_FULFILLMENT_CONCURRENCY = 4
+
+# If True, orders are fulfilled asynchronously. Rather than being fulfilled while the request
+# placing (or paying for) them is served, orders are enqueued, and fulfilled by workers started
+# with the fulfill_orders management command.
+FULFILLMENT_ASYNC = False
+
+# Number of seconds after which a fulfillment job claimed by a worker which has not finished it
+# (e.g., because the worker has died) may be claimed by another worker.
+FULFILLMENT_JOB_LEASE = 300
+
+# Orders failing fulfillment are retried automatically by the retry_fulfillment management command, up to
+# FULFILLMENT_RETRY_MAX_ATTEMPTS attempts in all. The delay before each retry doubles, starting from
+# FULFILLMENT_RETRY_BACKOFF seconds, up to FULFILLMENT_RETRY_MAX_BACKOFF seconds.
+FULFILLMENT_RETRY_MAX_ATTEMPTS = 8
+FULFILLMENT_RETRY_BACKOFF = 60
+FULFILLMENT_RETRY_MAX_BACKOFF = 6 * 60 * 60
+
+# Number of orders claimed at once by the retry_fulfillment command, and the number retried concurrently.
+FULFILLMENT_RETRY_BATCH_SIZE = 50
+FULFILLMENT_RETRY_CONCURRENCY = 4
+
 HAYSTACK_CONNECTIONS = {
     'default': {
         'ENGINE': 'haystack.backends.simple_backend.SimpleEngine',
@@ -107,6 +155,16 @@ AUTHENTICATION_BACKENDS = (
 )
 
 OSCAR_DEFAULT_CURRENCY = 'USD'
+
+# Number of (username, SKU) pairs placed within a single transaction by the bulk orders endpoint.
+BULK_ORDER_CHUNK_SIZE = 100
+
+# Maximum number of (username, SKU) pairs the bulk orders endpoint accepts in a single request.
+BULK_ORDER_MAX_ITEMS = 10000
+
+# Number of seconds for which an idempotency key passed to the orders endpoint is honored. Requests repeating
+# an older key are processed as new requests. Expired keys are deleted by the purge_idempotency_keys command.
+IDEMPOTENCY_KEY_LIFETIME = 24 * 60 * 60
 # END ORDER PROCESSING
 
 
@@ -115,6 +173,26 @@ ORDERS_ENDPOINT_RATE_LIMIT = '40/minute'
 # END RATE LIMITING
 
 
+# CATALOGUE
+# Maximum number of seconds for which a process may use its in-memory catalog snapshot
+# without checking whether another process has changed the catalog.
+CATALOGUE_SNAPSHOT_VERSION_CHECK_INTERVAL = 1
+# END CATALOGUE
+
+
+# PARTNER
+# Number of seconds for which the price and availability of a product not tracking stock may be cached.
+PURCHASE_INFO_CACHE_TTL = 60
+# END PARTNER
+
+
+# REFERENCE DATA
+# Maximum number of seconds for which a process may use its in-memory copies of reference
+# data (e.g., shipping event types) without checking whether another process has changed them.
+REFERENCE_DATA_VERSION_CHECK_INTERVAL = 1
+# END REFERENCE DATA
+
+
 # PAYMENT PROCESSING
 PAYMENT_PROCESSORS = (
     'ecommerce.extensions.payment.processors.SingleSeatCybersource',
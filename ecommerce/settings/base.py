@@ -216,6 +216,10 @@ LMS_DASHBOARD_URL = None
 # URL to which enrollment requests should be made
 ENROLLMENT_API_URL = None
 
+# URL to which bulk enrollment requests, each enrolling students in several courses, should be made.
+# If not set, a separate request is made to ENROLLMENT_API_URL for each enrollment.
+ENROLLMENT_API_BULK_URL = None
+
 # OAuth2 provider URL used for OAuth2 transactions (e.g. validating access tokens)
 OAUTH2_PROVIDER_URL = None
 # END URL CONFIGURATION
@@ -391,3 +395,26 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 20
 }
 # END DJANGO REST FRAMEWORK
+
+
+# OUTBOUND HTTP
+# Default (connect, read) timeouts, in seconds, for requests made to other services.
+OUTBOUND_HTTP_TIMEOUT = (3.05, 10)
+
+# Number of hosts for which keep-alive connections are pooled, and the number of connections pooled per host.
+OUTBOUND_HTTP_POOL_CONNECTIONS = 10
+OUTBOUND_HTTP_POOL_MAXSIZE = 10
+
+# Number of times idempotent requests are retried after a connection error, timeout, or 502, 503 or 504
+# response. Retries are delayed by a random interval, bounded by an exponentially growing backoff (in seconds).
+OUTBOUND_HTTP_MAX_RETRIES = 2
+OUTBOUND_HTTP_BACKOFF = 0.1
+OUTBOUND_HTTP_MAX_BACKOFF = 2
+
+# Number of consecutive failures, within a window of seconds, after which a circuit breaker opens, failing calls
+# made through it immediately; and the number of seconds after which an open breaker lets a call through to probe
+# whether the service has recovered.
+OUTBOUND_BREAKER_FAILURE_THRESHOLD = 5
+OUTBOUND_BREAKER_FAILURE_WINDOW = 60
+OUTBOUND_BREAKER_RESET_TIMEOUT = 30
+# END OUTBOUND HTTP
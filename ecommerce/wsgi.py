@@ -12,6 +12,7 @@ that later delegates to the Django one. For example, you could introduce WSGI
 middleware here, or combine a Django application with an application of another
 framework.
 """
+import logging
 import os
 from os.path import abspath, dirname
 from sys import path
@@ -29,6 +30,23 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "settings.local")
 # setting points here.
 application = get_wsgi_application()
 
+
+def load_catalog_snapshot():
+    """Load the catalog snapshot before serving requests, rather than while serving the first order.
+
+    If this fails, the snapshot is loaded on first use instead.
+    """
+    # The snapshot can only be imported once the application, and therefore Django, has been set up.
+    from ecommerce.extensions.catalogue.snapshot import catalog
+
+    try:
+        catalog.load()
+    except Exception:  # pylint: disable=broad-except
+        logging.getLogger(__name__).exception("Failed to load the catalog snapshot at startup")
+
+
+load_catalog_snapshot()
+
 # Apply WSGI middleware here.
 # from helloworld.wsgi import HelloWorldApplication
 # application = HelloWorldApplication(application)